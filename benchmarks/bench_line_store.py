@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Compare LineStore with the old deque of decoded str lines: memory held and time per push/frame.
+
+Usage: python benchmarks/bench_line_store.py [--tiles 16] [--lines 100000] [--flood-mb 8]
+
+"scrollback" keeps --lines lines per tile for --tiles tiles and reports the bytes allocated
+(tracemalloc). "flood" pushes --flood-mb of log lines into a 30-line ring buffer, like a tile
+catching up with a burst, then builds one frame.
+"""
+
+import argparse, sys, time, tracemalloc
+from collections import deque
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tailgrid.__main__ import LineStore, _split_lines
+
+LINE = b"2024-01-15 12:00:00,000 INFO step=%09d loss=0.123456 lr=3.0e-04 tokens/s=123456\n"
+
+def chunk(start, n): return b''.join(LINE % i for i in range(start, start + n))
+
+def held(make, fill, tiles):
+    tracemalloc.start()
+    stores = [make() for _ in range(tiles)]
+    for s in stores: fill(s)
+    size = tracemalloc.get_traced_memory()[0]; tracemalloc.stop()
+    return size, stores
+
+def timed(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        t = time.perf_counter(); fn(); best = min(best, time.perf_counter() - t)
+    return best
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--tiles', type=int, default=16)
+    ap.add_argument('--lines', type=int, default=100000)
+    ap.add_argument('--flood-mb', type=int, default=8)
+    args = ap.parse_args()
+    data, raw = chunk(0, args.lines), len(LINE % 0) * args.lines * args.tiles
+    old, _ = held(lambda: deque(maxlen=args.lines), lambda d: d.extend(_split_lines(data)), args.tiles)
+    new, _ = held(lambda: LineStore(args.lines), lambda s: s.extend(data), args.tiles)
+    print(f"scrollback: {args.tiles} tiles x {args.lines} lines ({raw / 2**20:.0f} MB of text)")
+    print(f"  str lines: {old / 2**20:8.1f} MB")
+    print(f"  LineStore: {new / 2**20:8.1f} MB  ({old / max(new, 1):.1f}x less)")
+    flood = chunk(0, (args.flood_mb << 20) // len(LINE % 0))
+    def old_flood(): d = deque(maxlen=30); d.extend(_split_lines(flood)); return list(d)
+    def new_flood(): s = LineStore(30); s.extend(flood); return s.tail(30)
+    assert old_flood() == new_flood()
+    t_old, t_new = timed(old_flood), timed(new_flood)
+    print(f"flood: {args.flood_mb} MB into a 30-line tile, then one frame")
+    print(f"  str lines: {t_old * 1e3:8.2f} ms")
+    print(f"  LineStore: {t_new * 1e3:8.2f} ms  ({t_old / max(t_new, 1e-9):.0f}x faster)")
+    store, frame = LineStore(30), deque(_split_lines(chunk(0, 30)), maxlen=30)
+    store.extend(chunk(0, 30))
+    n = 20000
+    t_old = timed(lambda: [list(frame) for _ in range(n)]) / n
+    t_new = timed(lambda: [store.tail(30) for _ in range(n)]) / n
+    print(f"frame of 30 lines: copy {t_old * 1e6:.1f} us, decode from LineStore {t_new * 1e6:.1f} us")
+
+if __name__ == "__main__": main()
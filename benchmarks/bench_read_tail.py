@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Benchmark read_last_n_lines against the old readlines() slice on growing files.
+
+Usage: python benchmarks/bench_read_tail.py [--max-mb 1024] [--lines 30] [--dir /tmp]
+
+The seek-from-end reader should stay flat as the file grows; the readlines() baseline
+is skipped above --baseline-max-mb because it scales linearly with file size.
+"""
+
+import argparse, os, sys, tempfile, time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tailgrid.__main__ import read_last_n_lines
+
+LINE = b"2024-01-15 12:00:00,000 INFO step=%09d loss=0.123456 lr=3.0e-04 tokens/s=123456\n"
+
+def readlines_tail(filepath, n):
+    with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+        return [line.rstrip('\n\r') for line in f.readlines()][-n:]
+
+def grow(path, size):
+    """Append synthetic log lines until the file reaches `size` bytes."""
+    with open(path, 'ab') as f:
+        i = f.tell() // len(LINE % 0)
+        block = 1 << 20
+        while f.tell() < size:
+            f.write(b''.join(LINE % (i + k) for k in range(block // len(LINE % 0))))
+            i += block // len(LINE % 0)
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter(); fn(); times.append(time.perf_counter() - t)
+    return min(times)
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--max-mb', type=int, default=1024)
+    ap.add_argument('--baseline-max-mb', type=int, default=256)
+    ap.add_argument('--lines', type=int, default=30)
+    ap.add_argument('--repeat', type=int, default=5)
+    ap.add_argument('--dir', default=None)
+    args = ap.parse_args()
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        path, mb = os.path.join(tmp, 'bench.log'), 1
+        print(f"{'size':>8}  {'seek tail':>12}  {'readlines':>12}")
+        while mb <= args.max_mb:
+            grow(path, mb << 20)
+            new = best_of(lambda: read_last_n_lines(path, args.lines), args.repeat)
+            if mb <= args.baseline_max_mb:
+                assert read_last_n_lines(path, args.lines) == readlines_tail(path, args.lines)
+                old = f"{best_of(lambda: readlines_tail(path, args.lines), 1) * 1e3:10.2f}ms"
+            else: old = f"{'skipped':>12}"
+            print(f"{mb:>6}MB  {new * 1e3:10.3f}ms  {old}")
+            mb *= 4
+
+if __name__ == "__main__": main()
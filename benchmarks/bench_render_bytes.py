@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Count bytes written to the terminal per frame by TileRenderer, headless on a pseudo-terminal.
+
+Usage: python benchmarks/bench_render_bytes.py [--tiles 9] [--frames 200] [--size 50x200]
+
+Each frame appends a line to one tile's file and renders. "full" clears the screen and repaints
+every tile each frame (the old behaviour); "damage" is the default per-tile dirty tracking.
+"""
+
+import argparse, curses, fcntl, os, pty, select, struct, sys, tempfile, termios, time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tailgrid.__main__ import TailTile, TileRenderer
+
+def child(args, paths, mode, marker, ack):
+    def run(stdscr):
+        curses.curs_set(0)
+        side = int(len(paths) ** 0.5 + 0.999)
+        tiles = [TailTile(p, 10) for p in paths]
+        renderer = TileRenderer(stdscr, tiles, (side, side))
+        for t in tiles: t.update()
+        def frame_done(): os.write(marker, b'.'); os.read(ack, 1)  # wait until the parent has counted the frame
+        renderer.render(); frame_done()
+        for frame in range(args.frames):
+            i = frame % len(paths)
+            with open(paths[i], 'a') as f: f.write(f"frame {frame} tile {i} " + "x" * 40 + "\n")
+            tiles[i].update()
+            if mode == 'full': stdscr.clear(); stdscr.noutrefresh(); renderer.invalidate()
+            renderer.render(); frame_done()
+    curses.wrapper(run)
+
+def measure(args, paths, mode):
+    rows, cols = map(int, args.size.split('x'))
+    (marker_r, marker_w), (ack_r, ack_w) = os.pipe(), os.pipe()
+    pid, fd = pty.fork()
+    if pid == 0:
+        os.close(marker_r); os.close(ack_w); os.environ['TERM'] = args.term
+        fcntl.ioctl(0, termios.TIOCSWINSZ, struct.pack('HHHH', rows, cols, 0, 0))
+        try: child(args, paths, mode, marker_w, ack_r)
+        finally: os._exit(0)
+    os.close(marker_w); os.close(ack_r)
+    frames, pending = [], 0
+    while True:
+        ready = select.select([fd, marker_r], [], [], 5)[0]
+        if not ready: break
+        if fd in ready:
+            try: data = os.read(fd, 1 << 16)
+            except OSError: data = b''
+            pending += len(data)
+        if marker_r in ready:
+            if not os.read(marker_r, 1): break
+            # the child's tty writes completed before it signalled, so drain what is buffered
+            while select.select([fd], [], [], 0.01)[0]:
+                try: chunk = os.read(fd, 1 << 16)
+                except OSError: break
+                if not chunk: break
+                pending += len(chunk)
+            frames.append(pending); pending = 0; os.write(ack_w, b'.')
+    os.waitpid(pid, 0); os.close(ack_w); os.close(marker_r)
+    return frames[1:]  # skip the initial full paint
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--tiles', type=int, default=9)
+    ap.add_argument('--frames', type=int, default=200)
+    ap.add_argument('--size', default='50x200')
+    ap.add_argument('--term', default='xterm-256color')
+    args = ap.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for mode in ('full', 'damage'):
+            paths = []
+            for i in range(args.tiles):
+                p = os.path.join(tmp, f"{mode}{i}.log"); paths.append(p)
+                Path(p).write_text("".join(f"seed {i} line {k}\n" for k in range(20)))
+            t = time.perf_counter(); frames = measure(args, paths, mode)
+            results[mode] = (sum(frames) / max(len(frames), 1), time.perf_counter() - t)
+        for mode, (avg, secs) in results.items(): print(f"{mode:>7}: {avg:10.0f} bytes/frame  ({secs:.2f}s)")
+        print(f"  ratio: {results['full'][0] / max(results['damage'][0], 1):.1f}x fewer bytes with damage tracking")
+
+if __name__ == "__main__": main()
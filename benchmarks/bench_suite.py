@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""End-to-end benchmark: synthetic writers append to big logs while TailTile and TileRenderer follow them.
+
+Usage: python benchmarks/bench_suite.py [--tiles 4] [--size-mb 64] [--rate 1000] [--duration 10]
+                                        [--rotate-every 4] [--truncate-every 7] [--out result.json] [--compare old.json]
+
+Each tile's file is first filled with --size-mb of history (use --size-mb 4096 for multi-GB files).
+One writer process per file then appends --rate lines/s, each stamped with the monotonic clock,
+renaming the file away every --rotate-every seconds and truncating it every --truncate-every.
+A viewer process follows the files like `tailgrid` does (inotify or polling, at most --max-fps
+frames/s) and draws them on a pseudo-terminal. The result is one JSON object: write-to-display
+latency of the newest visible line, render time, viewer CPU averaged over the tiles, bytes read
+per poll, peak RSS, plus read_last_n_lines and first-update times on the full files. --compare
+prints the change against an earlier result, to check a commit for regressions. Commits from
+before the watcher existed are followed by polling every 0.1 s, the interval they polled at.
+"""
+
+import argparse, curses, fcntl, json, os, platform, pty, resource, select, statistics, struct, subprocess, sys, tempfile, termios, time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tailgrid.__main__ import TailTile, TileRenderer, auto_layout, read_last_n_lines
+try: from tailgrid.__main__ import POLL_INTERVAL, make_watcher
+except ImportError: POLL_INTERVAL, make_watcher = 0.1, lambda: None  # older trees poll on a 100 ms getch timeout
+
+PAYLOAD = "INFO step=%09d loss=0.123456 lr=3.0e-04 tokens/s=123456"
+
+def fill(path, size):
+    """History lines stamped 0, so they never count as fresh writes."""
+    block = "".join(f"0 history {PAYLOAD % i}\n" for i in range(10000)).encode()
+    with open(path, 'wb') as f:
+        while f.tell() < size: f.write(block[:size - f.tell()])
+
+def writer(args):
+    """--writer mode: append --rate lines/s to args.writer, rotating and truncating on schedule."""
+    path, n, start = args.writer, 0, time.monotonic()
+    f, next_rotate, next_truncate = open(path, 'a'), start + args.rotate_every, start + args.truncate_every
+    while (now := time.monotonic()) < start + args.duration:
+        due = int((now - start) * args.rate) - n
+        if due > 0:
+            stamp = time.monotonic_ns()
+            f.write("".join(f"{stamp} w {PAYLOAD % (n + k)}\n" for k in range(due))); f.flush(); n += due
+        if args.rotate_every and now >= next_rotate:
+            f.close(); os.replace(path, path + '.1'); f = open(path, 'a'); next_rotate += args.rotate_every
+        if args.truncate_every and now >= next_truncate: f.truncate(0); f.seek(0); next_truncate += args.truncate_every
+        time.sleep(0.005)
+    f.close(); print(n)
+
+def stamp(line):
+    head = line.split(' ', 1)[0]
+    return int(head) if head.isdigit() and head != '0' else None
+
+def percentiles(values):
+    if len(values) < 2: return {'p50': None, 'p90': None, 'p99': None, 'max': max(values, default=None), 'samples': len(values)}
+    q = statistics.quantiles(values, n=100, method='inclusive')
+    return {'p50': round(q[49], 3), 'p90': round(q[89], 3), 'p99': round(q[98], 3), 'max': round(max(values), 3), 'samples': len(values)}
+
+def rchar():
+    try: return int(next(line.split()[1] for line in Path('/proc/self/io').read_text().splitlines() if line.startswith('rchar')))
+    except (OSError, StopIteration): return None
+
+def viewer(args, paths, start_fd, result_fd):
+    """Follow the files like run_viewer, single-threaded so all the work lands in this process's counters."""
+    def run(stdscr):
+        curses.curs_set(0)
+        tiles = [TailTile(p, args.lines) for p in paths]
+        renderer, watcher = TileRenderer(stdscr, tiles, auto_layout(len(paths)) or (2, 1)), make_watcher()
+        polled = [i for i, t in enumerate(tiles) if watcher is None or not watcher.add(t.filepath, i)]
+        t = time.perf_counter()
+        for tile in tiles: tile.update()
+        open_ms = (time.perf_counter() - t) * 1e3
+        renderer.render(); os.write(result_fd, b'.'); os.read(start_fd, 1)  # writers start now
+        latencies, renders, newest, polls, frames = [], [], [None] * len(tiles), 0, 0
+        interval, last_frame, pending = 1.0 / args.max_fps, 0.0, False
+        io0, cpu0, t0 = rchar(), sum(os.times()[:2]), time.monotonic()
+        while (now := time.monotonic()) < t0 + args.duration:
+            timeouts = [POLL_INTERVAL] if polled else [0.5]
+            if pending: timeouts.append(last_frame + interval - now)
+            ready = select.select([watcher.fd] if watcher else [], [], [], max(0, min(timeouts)))[0]
+            dirty = set(polled) | (watcher.read() if ready else set())
+            for i in dirty: polls += 1; pending |= tiles[i].update()
+            if not pending or time.monotonic() - last_frame < interval: continue
+            t = time.perf_counter(); renderer.render(); renders.append((time.perf_counter() - t) * 1e3)
+            shown, last_frame, pending, frames = time.monotonic_ns(), time.monotonic(), False, frames + 1
+            for i, tile in enumerate(tiles):
+                content = tile.get_content()
+                if content and (ts := stamp(content[-1])) and ts != newest[i]: newest[i] = ts; latencies.append((shown - ts) / 1e6)
+        elapsed, io1 = time.monotonic() - t0, rchar()
+        return {'open_ms': round(open_ms, 3), 'latency_ms': percentiles(latencies), 'render_ms': percentiles(renders),
+                'frames': frames, 'polls': polls, 'inotify': watcher is not None,
+                'cpu_pct_avg_per_tile': round((sum(os.times()[:2]) - cpu0) / elapsed / len(tiles) * 100, 2),
+                'bytes_read_per_poll': round((io1 - io0) / max(polls, 1)) if io0 is not None else None,
+                'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1 << 20 if sys.platform == 'darwin' else 1 << 10), 1)}
+    os.write(result_fd, json.dumps(curses.wrapper(run)).encode())
+
+def follow(args, paths):
+    rows, cols = map(int, args.size.split('x'))
+    (start_r, start_w), (result_r, result_w) = os.pipe(), os.pipe()
+    pid, fd = pty.fork()
+    if pid == 0:
+        os.close(start_w); os.close(result_r); os.environ['TERM'] = args.term
+        fcntl.ioctl(0, termios.TIOCSWINSZ, struct.pack('HHHH', rows, cols, 0, 0))
+        try: viewer(args, paths, start_r, result_w)
+        finally: os._exit(0)
+    os.close(start_r); os.close(result_w)
+    writers, out, tty_bytes, started = [], b'', 0, False
+    while True:  # drain the terminal so the viewer never blocks on it
+        ready = select.select([fd, result_r], [], [], 30)[0]
+        if not ready: break
+        if fd in ready:
+            try: data = os.read(fd, 1 << 16)
+            except OSError: data = b''
+            if started: tty_bytes += len(data)  # the initial paint is not counted
+        if result_r in ready:
+            chunk = os.read(result_r, 1 << 16)
+            if not chunk: break
+            if not started:  # the viewer has opened every file: start the writers
+                started, chunk = True, chunk[1:]
+                opts = ['--rate', str(args.rate), '--duration', str(args.duration), '--rotate-every', str(args.rotate_every), '--truncate-every', str(args.truncate_every)]
+                writers = [subprocess.Popen([sys.executable, __file__, '--writer', p, *opts], stdout=subprocess.PIPE, text=True) for p in paths]
+                os.write(start_w, b'.')
+            out += chunk
+    os.waitpid(pid, 0); os.close(start_w); os.close(result_r)
+    result = json.loads(out)
+    result['lines_written'] = sum(int(w.communicate()[0] or 0) for w in writers)
+    result['tty_bytes_per_frame'] = round(tty_bytes / max(result['frames'], 1))
+    return result
+
+def best_ms(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        t = time.perf_counter(); fn(); best = min(best, time.perf_counter() - t)
+    return round(best * 1e3, 3)
+
+def commit():
+    try: return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=Path(__file__).parent, capture_output=True, text=True).stdout.strip() or None
+    except OSError: return None
+
+def compare(old, new, prefix=''):
+    """Print each numeric metric that both results have, with its change."""
+    for key, value in new.items():
+        if isinstance(value, dict) and isinstance(old.get(key), dict): compare(old[key], value, f"{prefix}{key}.")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and isinstance(old.get(key), (int, float)):
+            change = f"{(value - old[key]) / old[key]:+.0%}" if old[key] else ""
+            print(f"  {prefix + key:<28} {old[key]:>12} -> {value:<12} {change}", file=sys.stderr)
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--tiles', type=int, default=4)
+    ap.add_argument('--size-mb', type=int, default=64)
+    ap.add_argument('--rate', type=float, default=1000, help="lines/s per writer")
+    ap.add_argument('--duration', type=float, default=10)
+    ap.add_argument('--rotate-every', type=float, default=4, help="seconds, 0 to never rotate")
+    ap.add_argument('--truncate-every', type=float, default=7, help="seconds, 0 to never truncate")
+    ap.add_argument('--lines', type=int, default=20)
+    ap.add_argument('--max-fps', type=float, default=30)
+    ap.add_argument('--size', default='50x200')
+    ap.add_argument('--term', default='xterm-256color')
+    ap.add_argument('--dir', default=None)
+    ap.add_argument('--out', default=None)
+    ap.add_argument('--compare', default=None)
+    ap.add_argument('--writer', default=None, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.writer: return writer(args)
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        paths = [os.path.join(tmp, f"tile{i}.log") for i in range(args.tiles)]
+        for p in paths: fill(p, args.size_mb << 20)
+        results = {'read_tail_ms': best_ms(lambda: read_last_n_lines(paths[0], args.lines)),
+                   'first_update_ms': best_ms(lambda: TailTile(paths[0], args.lines).update())}
+        results.update(follow(args, paths))
+    report = {'benchmark': 'suite', 'commit': commit(), 'python': platform.python_version(), 'platform': sys.platform,
+              'args': {k: v for k, v in vars(args).items() if k not in ('writer', 'out', 'compare', 'dir')}, 'results': results}
+    text = json.dumps(report, indent=2)
+    if args.out: Path(args.out).write_text(text + "\n")
+    print(text)
+    if args.compare: compare(json.loads(Path(args.compare).read_text())['results'], results)
+
+if __name__ == "__main__": main()
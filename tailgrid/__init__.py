@@ -7,16 +7,23 @@ def __getattr__(name):
     import importlib
     _main = importlib.import_module("tailgrid.__main__")
     _exports = {
+        "CommandTile": _main.CommandTile,
         "LAYOUTS": _main.LAYOUTS,
+        "LineIndex": _main.LineIndex,
         "MAX_SESSIONS": _main.MAX_SESSIONS,
+        "MergeTile": _main.MergeTile,
+        "TailServer": _main.TailServer,
         "TailTile": _main.TailTile,
+        "TileReader": _main.TileReader,
         "TileRenderer": _main.TileRenderer,
         "auto_layout": _main.auto_layout,
         "clamp": _main.clamp,
         "file_picker": _main.file_picker,
         "load_session": _main.load_session,
         "load_sessions": _main.load_sessions,
+        "layout_name": _main.layout_name,
         "main": _main.main,
+        "parse_grid": _main.parse_grid,
         "read_last_n_lines": _main.read_last_n_lines,
         "run_viewer": _main.run_viewer,
         "save_session": _main.save_session,
@@ -1,12 +1,13 @@
 #!/usr/bin/env python3
 """tailgrid - Multi-tile tail viewer. Controls: Enter scroll | arrows nav | r refresh | q quit"""
 
-import curses, glob, json, os, readline, select, sys, termios, time, tty
+import array, base64, bisect, bz2, ctypes, ctypes.util, curses, functools, glob, hashlib, heapq, io, json, lzma, mmap, os, queue, re, readline, select, selectors, signal, socket, stat, struct, subprocess, sys, termios, threading, time, tty, unicodedata, zlib
+from collections import deque, namedtuple
 from pathlib import Path
 
 LAYOUTS = {'1': (1, 1), '2': (2, 1), '3': (1, 2), '4': (2, 2), '5': (3, 3), '9': (3, 3)}
 MAX_SESSIONS, CONFIG_DIR = 10, Path.home() / ".config" / "tailgrid"
-SESSIONS_FILE, CONFIG_FILE = CONFIG_DIR / "sessions.json", CONFIG_DIR / "config.json"
+SESSIONS_FILE, CONFIG_FILE, SERVE_SOCKET = CONFIG_DIR / "sessions.json", CONFIG_DIR / "config.json", CONFIG_DIR / "serve.sock"
 DEFAULT_EXTENSIONS = ['.txt', '.log', '.out', '.err']
 
 DEFAULT_CLAUDE_PROMPT = """Return absolute paths to FILES (max 9) for the most relevant log files to monitor.
@@ -18,7 +19,12 @@ Format (one per line):
 /path/to/file.log | Project X - training logs for GPT experiment, shows loss curves
 /path/to/debug.log | Tailgrid dev - debug output from current Claude Code session"""
 
-DEFAULT_CONFIG = {'extensions': DEFAULT_EXTENSIONS, 'show_full_path': False, 'claude_prompt': DEFAULT_CLAUDE_PROMPT}
+DEFAULT_TIMESTAMP = r'\d{4}-\d\d-\d\d[T ]\d\d:\d\d:\d\d(?:[.,]\d+)?'  # ISO 8601-ish; the merge view orders lines by it
+
+CLAUDE_CACHE_DIR, CLAUDE_CACHE_TTL, CLAUDE_TIMEOUT, CLAUDE_MAX_PATHS = CONFIG_DIR / "claude", 24 * 3600, 60, 9  # seconds
+
+DEFAULT_CONFIG = {'extensions': DEFAULT_EXTENSIONS, 'show_full_path': False, 'claude_prompt': DEFAULT_CLAUDE_PROMPT, 'claude_cache_ttl': CLAUDE_CACHE_TTL, 'io_timeout': 2.0, 'max_fps': 30, 'cmd_restart': None, 'scrollback_mb': 64,
+                  'merge_timestamp': DEFAULT_TIMESTAMP, 'highlight': {}}
 
 def load_config():
     try:
@@ -45,134 +51,1509 @@ def _setup_readline():
         return matches[state] if state < len(matches) else None
     readline.set_completer(completer); readline.set_completer_delims(' \t\n;'); readline.parse_and_bind('tab: complete')
 
+TAIL_BLOCK, FOLLOW_MAX_READ = 64 * 1024, 8 << 20  # backward scan step; larger appends re-read the tail instead
+INDEX_BLOCK, COUNT_BLOCK = 256 * 1024, 1 << 20  # LineIndex checkpoint interval; background line count read size
+SESSION_CHECK, SESSION_CHECKPOINTS, SESSION_SAVE_TIMEOUT = 4096, 512, 1.0  # bytes fingerprinted; checkpoints kept per tile; seconds to wait for readers on exit
+RATE_WINDOW = 1.0  # seconds of history behind the per-tile lines/s indicator
+SEARCH_BLOCK = 4 << 20  # bytes per regex scan step; a search checks for cancellation between steps
+COMPRESSED_MAGIC = ((b'\x1f\x8b', 'gzip'), (b'BZh', 'bz2'), (b'\xfd7zXZ\x00', 'xz'), (b'\x5d\x00\x00', 'lzma'))
+COMPRESSED_ERRORS = (EOFError, zlib.error, lzma.LZMAError)  # bz2 raises OSError for corrupt data
+CHECKPOINT_STEP, MAX_CHECKPOINTS, TAIL_CACHE = 4 << 20, 1024, 256 * 1024  # decompressed bytes; spacing doubles past the cap
+INDEX_CACHE_DIR = CONFIG_DIR / "index"
+LINE_WINDOW, MAX_LINE = 8 * 1024, 1 << 20  # bytes of a long line decoded per frame (panned by bytes); unterminated lines are cut past MAX_LINE
+BINARY_SAMPLE, HEX_WIDTH = 8 * 1024, 16  # a NUL in the last BINARY_SAMPLE bytes shows the file as a hexdump of HEX_WIDTH-byte rows
+MERGE_BATCH, MERGE_SCROLLBACK, MERGE_IDX = 1000, 200_000, -1  # lines read per source step backwards; most lines merged; reader slot
+CMD_READ, CMD_MAX_PENDING, CMD_SCROLLBACK = 64 * 1024, 1 << 20, 4 << 20  # pipe read size; unprocessed bytes before the pipe is paused; kept output
+CMD_REAP_GRACE, CMD_REAP_TICK = 1.0, 0.05  # seconds a command may outlive its closed output before SIGTERM (and again before SIGKILL); reap poll period
+
+def _split_lines(data) -> list[str]:
+    """Decode bytes (or a memoryview) and split on universal newlines, like text-mode readlines()."""
+    text = str(data, 'utf-8', 'replace')
+    if '\r' in text: text = text.replace('\r\n', '\n').replace('\r', '\n')
+    lines = text.split('\n')
+    if lines[-1] == '': lines.pop()
+    return lines
+
+def _read_tail(f, n: int, end: int, limit=None) -> bytes:
+    """Read backwards from byte `end` of binary file f until the bytes cover the last n lines, or `limit`
+    bytes (FOLLOW_MAX_READ by default, so a tile never reads a huge line whole; float('inf') for no cap)."""
+    pos, chunks, lf, cr, limit = end, [], 0, 0, FOLLOW_MAX_READ if limit is None else limit
+    # max(\n, \r) never overcounts line breaks, so we stop only once n full lines are in hand
+    while pos > 0 and max(lf, cr) <= n and end - pos < limit:
+        step = min(TAIL_BLOCK, pos); pos -= step; f.seek(pos)
+        chunk = f.read(step); chunks.append(chunk)
+        lf += chunk.count(b'\n'); cr += chunk.count(b'\r')
+    data = b''.join(reversed(chunks))
+    if pos > 0:  # drop the partial first line; line breaks are always UTF-8 boundaries
+        cut = min((i for i in (data.find(b'\n'), data.find(b'\r')) if i != -1), default=-1)  # -1: keep the end of a huge line
+        if data[cut:cut + 2] == b'\r\n': cut += 1
+        data = data[cut + 1:]
+    return data
+
+# An escape sequence: CSI (group 1 = parameters, group 2 = final byte; 'm' is SGR), OSC, a two-byte escape, or a lone ESC
+ANSI_ESCAPE = re.compile(r'\x1b(?:\[([0-?]*)[ -/]*([@-~])|\][^\x07\x1b]*(?:\x07|\x1b\\)?|[ -/]*[0-~]|)')
+
+def _pan(text, pan):
+    """text[pan:], counting only visible characters if text has escape sequences; SGR codes before the cut are kept."""
+    if not pan or '\x1b' not in text: return text[pan:]
+    keep, pos, seen = [], 0, 0
+    for m in ANSI_ESCAPE.finditer(text):
+        if seen + m.start() - pos >= pan: break
+        seen += m.start() - pos; pos = m.end()
+        if m[2] == 'm': keep.append(m[0])
+    return ''.join(keep) + text[pos + pan - seen:]
+
+def _clip(data, lo, hi, pan=0) -> str:
+    """Decode the line data[lo:hi], starting `pan` characters in. Lines over LINE_WINDOW bytes are
+    panned by bytes instead, and only LINE_WINDOW bytes of them are decoded."""
+    if hi - lo <= LINE_WINDOW: return _pan(str(data[lo:hi], 'utf-8', 'replace'), pan)
+    rest = hi - lo - pan - LINE_WINDOW
+    return str(data[lo + pan:min(hi, lo + pan + LINE_WINDOW)], 'utf-8', 'replace') + (f" …[+{rest} bytes]" if rest > 0 else "")
+
+def _lines(data, pan=0, lo=0, hi=None) -> list[str]:
+    """_split_lines over data[lo:hi] (bytes, bytearray or mmap) without copying it: slices come from a
+    memoryview released before returning, so a bytearray can still be resized and an mmap closed, and
+    each line is materialized by _clip, so a huge line costs no more than LINE_WINDOW."""
+    hi = len(data) if hi is None else hi
+    with memoryview(data) as mv:
+        if not pan and hi - lo <= LINE_WINDOW: return _split_lines(mv[lo:hi])
+        out = []
+        while lo < hi:
+            end = data.find(b'\n', lo, hi); end = hi if end < 0 else end
+            cr, step = data.find(b'\r', lo, end), 1
+            if cr >= 0: end, step = cr, 2 if cr + 1 < hi and data[cr + 1] == 0x0a else 1
+            out.append(_clip(mv, lo, end, pan)); lo = end + step
+    return out
+
+def _looks_binary(sample): return b'\0' in sample
+
+HEX_PRINTABLE = bytes(b if 32 <= b < 127 else 0x2e for b in range(256))
+
+def _hex_rows(data, offset) -> bytes:
+    """Hexdump of data read from byte `offset` (a multiple of HEX_WIDTH): one text line per row."""
+    rows = (data[i:i + HEX_WIDTH] for i in range(0, len(data), HEX_WIDTH))
+    return b''.join(b"%08x  %-47s  |%s|\n" % (offset + i * HEX_WIDTH, row.hex(' ').encode(), row.translate(HEX_PRINTABLE)) for i, row in enumerate(rows))
+
+def _grep(rx, data: bytes) -> list[bytes]:
+    """The lines of data (terminator included) that rx matches, found by scanning the bytes rather than splitting them."""
+    out, pos = [], 0
+    while pos < len(data) and (m := rx.search(data, pos)):
+        lo, hi = data.rfind(b'\n', 0, m.start()) + 1, data.find(b'\n', max(m.start(), m.end() - 1)) + 1 or len(data)
+        out.append(data[lo:hi]); pos = hi
+    return out
+
+def _read_matching(f, n: int, end: int, rx) -> bytes:
+    """Like _read_tail, but collects the last n lines rx matches, giving up after FOLLOW_MAX_READ bytes."""
+    pos, found, carry = end, [], b''
+    while pos > 0 and len(found) < n and end - pos < FOLLOW_MAX_READ:
+        step = min(TAIL_BLOCK, pos); pos -= step; f.seek(pos)
+        data = f.read(step) + carry
+        cut = data.find(b'\n') + 1 if pos else 0  # the first line may continue in the previous block
+        if pos and not cut: carry = data; continue
+        carry = data[:cut]; found[:0] = _grep(rx, data[cut:])
+    return b''.join(found[-n:])
+
 def read_last_n_lines(filepath: str, n: int) -> list[str]:
+    """Seek to the end and read backwards in TAIL_BLOCK steps until n lines are covered."""
+    if n <= 0: return []
     try:
-        with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-            return [line.rstrip('\n\r') for line in f.readlines()][-n:]
+        with open(filepath, 'rb') as f: data = _read_tail(f, n, f.seek(0, os.SEEK_END), float('inf'))  # always n whole lines
     except OSError: return []
+    return _split_lines(data)[-n:]
+
+LINE_BREAK = re.compile(rb'\r\n|\r|\n')
+
+class LineStore:
+    """Complete lines kept as raw bytes in one bytearray, with an array('Q') of line end offsets.
+
+    Nothing is decoded until tail() asks for the lines on screen. Old lines are dropped once there
+    are more than `maxlen`, or once the bytes plus 8 per offset exceed `budget`; dropping only moves
+    `_head` forward, and the dead prefix is cut off once it is half of the store."""
+    __slots__ = ('maxlen', 'budget', '_buf', '_ends', '_head')
+    def __init__(self, maxlen=None, budget=None):
+        self.maxlen, self.budget = maxlen, budget
+        self._buf, self._ends, self._head = bytearray(), array.array('Q'), 0  # live lines are _ends[_head:]
+    def __len__(self): return len(self._ends) - self._head
+    def _start(self, i): return self._ends[i - 1] if i else 0
+    def nbytes(self): return len(self._buf) - self._start(self._head) + 8 * len(self)
+    def clear(self): self._buf, self._ends, self._head = bytearray(), array.array('Q'), 0
+    def resize(self, maxlen): self.maxlen = maxlen; self._trim()
+    def extend(self, data):
+        """Append bytes that end on a line break; only the lines that will be kept get indexed."""
+        if self.maxlen is not None and data.count(b'\n') > self.maxlen: self.clear(); data = _read_tail(io.BytesIO(data), self.maxlen, len(data))
+        if self.budget is not None and len(data) > self.budget:  # the older lines could not be kept either
+            self.clear(); data = data[m.end():] if (m := LINE_BREAK.search(data, len(data) - self.budget)) else b''
+        if not data: return
+        base = len(self._buf); self._buf += data
+        self._ends.extend(base + m.end() for m in LINE_BREAK.finditer(data))
+        self._trim()
+    def _trim(self):
+        head = max(self._head, len(self._ends) - self.maxlen) if self.maxlen is not None else self._head
+        if self.budget is not None and head < len(self._ends) and self.nbytes() > self.budget:
+            excess = self.nbytes() - self.budget  # drop whole lines until that many bytes are freed
+            head = max(head, bisect.bisect_left(self._ends, self._start(self._head) + excess, self._head) + 1)
+        self._head = min(head, len(self._ends))
+        if self._head and self._head * 2 >= len(self._ends):
+            cut = self._start(self._head); del self._buf[:cut]
+            self._ends, self._head = array.array('Q', (e - cut for e in self._ends[self._head:])), 0
+    def tail(self, n, pan=0):
+        """The last n lines, decoded straight from a memoryview of the buffer."""
+        if n <= 0 or not len(self): return []
+        return _lines(self._buf, pan, self._start(max(self._head, len(self._ends) - n)), self._ends[-1])
+    def data(self): return bytes(self._buf[self._start(self._head):])
 
 def clamp(val, lo, hi): return max(lo, min(val, hi))
 
-def save_session(paths, layout, lines):
+def save_session(paths, layout, lines, tiles=None):
+    """Put the session first in sessions.json. tiles maps a path to its warm-restore state (TailTile.session_state);
+    without it the states saved for the same paths are kept."""
+    tmp = SESSIONS_FILE.with_suffix(f".{os.getpid()}.tmp")
     try:
         CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-        sessions = [s for s in load_sessions() if s["paths"] != paths]
-        sessions.insert(0, {"paths": paths, "layout": list(layout), "lines": lines})
-        SESSIONS_FILE.write_text(json.dumps(sessions[:MAX_SESSIONS], indent=2))
+        saved = [s for s in load_sessions() if isinstance(s, dict)]
+        sessions, old = [s for s in saved if s.get("paths") != paths], next((s for s in saved if s.get("paths") == paths), {})
+        sessions.insert(0, {"paths": paths, "layout": list(layout), "lines": lines, "tiles": old.get("tiles", {}) if tiles is None else tiles})
+        tmp.write_text(json.dumps(sessions[:MAX_SESSIONS], indent=2))
+        os.replace(tmp, SESSIONS_FILE)  # two instances saving at once can't leave half a file
     except OSError: pass
 
 def load_sessions():
-    try: return json.loads(SESSIONS_FILE.read_text()) if SESSIONS_FILE.exists() else []
+    try: sessions = json.loads(SESSIONS_FILE.read_text()) if SESSIONS_FILE.exists() else []
     except (OSError, json.JSONDecodeError): return []
+    return sessions if isinstance(sessions, list) else []  # a hand-edited file holding some other JSON value
+
+def session_states(paths=None):
+    """path -> the newest warm-restore state any saved session has for it; the session saved with exactly
+    `paths` (the one being resumed) comes first."""
+    states = {}
+    for s in sorted(load_sessions(), key=lambda s: not isinstance(s, dict) or s.get("paths") != paths):
+        tiles = s.get("tiles") if isinstance(s, dict) else None
+        for path, state in (tiles.items() if isinstance(tiles, dict) else ()):
+            if isinstance(state, dict): states.setdefault(path, state)
+    return states
+
+def _fingerprint(f, end):
+    """crc32 of the SESSION_CHECK bytes before end: tells a file that was only appended to from one rewritten in place."""
+    f.seek(max(0, end - SESSION_CHECK)); return zlib.crc32(f.read(min(end, SESSION_CHECK)))
 
 def load_session(idx=0):
     s = load_sessions()
     return (s[idx]["paths"], tuple(s[idx]["layout"]), s[idx]["lines"]) if idx < len(s) else None
 
+PICKER_BATCH, PICKER_TICK_MS, PICK_ALL_MAX = 2048, 100, 36  # entries per scan hand-off; UI wake-up while scanning; 'a' cap (four 3x3 pages)
+PICKER_ORDERS = {'name': lambda e: e.name, 'mtime': lambda e: (-e.mtime, e.name), 'size': lambda e: (-e.size, e.name)}
+PickerEntry = namedtuple('PickerEntry', 'name mtime size')  # stat'ed by the scan thread, so no sort order touches the disk
+
+def _fuzzy(query):
+    """Matches names containing query's characters in order, ignoring case ('trlog' finds 'train.log')."""
+    return re.compile(''.join(f"[^{c}]*{c}" for c in map(re.escape, query)), re.IGNORECASE | re.DOTALL)  # no backtracking
+
+class DirListing:
+    """The file picker's model. os.scandir streams the files on a thread and refresh() takes what it
+    has found so far, so the list shows up at once even for 200k entries.
+
+    `matches` holds indexes into `entries`, filtered by a fuzzy query and sorted by `order`. A longer
+    query only re-checks the current matches, and the lists of shorter queries are kept, so backspace
+    costs nothing. The scan thread stats each file as it lists it, so sort keys (computed once per order)
+    never wait on a slow mount."""
+    def __init__(self, directory):
+        self.directory, self.entries, self.names, self.matches, self.query, self.order, self.done = directory, [], [], [], '', 'name', False
+        self._pending, self._finished, self._lock = [], False, threading.Lock()
+        self._stack, self._keys = [], {}  # (shorter query, its matches), newest last; order -> sort key per entry
+        threading.Thread(target=self._scan, daemon=True).start()
+    def _scan(self):
+        batch = []
+        try:
+            with os.scandir(self.directory) as entries:
+                for e in entries:
+                    try:
+                        if e.is_file(): st = e.stat(); batch.append(PickerEntry(e.name, st.st_mtime, st.st_size))  # d_type answers is_file
+                    except OSError: pass
+                    if len(batch) >= PICKER_BATCH:
+                        with self._lock: self._pending += batch
+                        batch = []
+        except OSError: pass
+        with self._lock: self._pending += batch; self._finished = True
+    def refresh(self):
+        """Adopt the entries scanned since the last call; True if anything changed."""
+        with self._lock: new, self._pending, finished = self._pending, [], self._finished
+        changed, self.done = bool(new) or finished != self.done, finished
+        if new:
+            start, rx = len(self.entries), _fuzzy(self.query)
+            self.entries += new; self.names += (e.name for e in new); self._stack = []  # the shorter queries' lists lack the new entries
+            for order, keys in self._keys.items(): keys += map(PICKER_ORDERS[order], new)
+            self.matches += [i for i in range(start, len(self.names)) if rx.match(self.names[i])]
+            self._sort()
+        return changed
+    def _sort(self):
+        if self.order not in self._keys: self._keys[self.order] = list(map(PICKER_ORDERS[self.order], self.entries))
+        self.matches.sort(key=self._keys[self.order].__getitem__)  # runs already in order make this near-linear
+    def set_order(self, order):
+        if order != self.order: self.order, self._stack = order, []; self._sort()
+    def set_query(self, query):
+        """Narrow or widen the matches to names fuzzy-matching query."""
+        if query == self.query: return
+        if query.startswith(self.query): self._stack.append((self.query, self.matches))
+        while self._stack and not query.startswith(self._stack[-1][0]): self._stack.pop()
+        if self._stack and self._stack[-1][0] == query: self.matches = self._stack.pop()[1]  # back to a query typed before
+        else:
+            match, names, base = _fuzzy(query).match, self.names, self._stack[-1][1] if self._stack else range(len(self.names))
+            self.matches = [i for i in base if match(names[i])]
+            if not self._stack: self._sort()
+        self.query = query
+    def path(self, i): return os.path.join(self.directory, self.names[i])
+
 def file_picker(directory):
     directory = os.path.expanduser(directory)
     if not os.path.isdir(directory): print(f"  Not a directory: {directory}"); return None
-    files = sorted([f for f in os.listdir(directory) if os.path.isfile(os.path.join(directory, f))])
-    if not files: print(f"  No files found in: {directory}"); return None
-    selected, cursor, scroll = set(), 0, 0
+    listing = DirListing(directory)
     def picker(stdscr):
-        nonlocal cursor, scroll, selected
         curses.curs_set(0); curses.init_pair(1, curses.COLOR_BLACK, curses.COLOR_WHITE); curses.init_pair(2, curses.COLOR_GREEN, curses.COLOR_BLACK)
+        stdscr.timeout(PICKER_TICK_MS)  # wake up to show entries the scan is still finding
+        selected, cursor, scroll, typing = set(), 0, 0, False  # selected: indexes into listing.entries
         while True:
-            stdscr.clear(); h, w = stdscr.getmaxyx(); max_disp = h - 4
-            stdscr.addstr(0, 0, f" Select files from: {directory} "[:w-1], curses.A_BOLD)
-            stdscr.addstr(1, 0, " " + "─" * (w - 2), curses.A_DIM)
+            listing.refresh()
+            if listing.done and not listing.entries: return None
+            h, w = stdscr.getmaxyx(); max_disp, matches = max(1, h - 4), listing.matches
+            cursor = clamp(cursor, 0, max(0, len(matches) - 1))
             if cursor < scroll: scroll = cursor
             elif cursor >= scroll + max_disp: scroll = cursor - max_disp + 1
-            for i, fname in enumerate(files[scroll:scroll + max_disp]):
-                idx, y = scroll + i, i + 2
-                if y >= h - 2: break
-                line = f" [{'x' if idx in selected else ' '}] {fname}"
-                attr = curses.color_pair(1) if idx == cursor else (curses.color_pair(2) | curses.A_BOLD if idx in selected else 0)
-                stdscr.addstr(y, 0, line[:w-1].ljust(w-1) if idx == cursor else line[:w-1], attr)
-            try: stdscr.addstr(h-1, 0, f" {len(selected)}/9 selected │ ↑↓/jk nav │ SPACE sel │ a all │ ENTER ok │ q quit "[:w-1].ljust(w-1), curses.A_REVERSE)
+            stdscr.erase()  # not clear(): only the cells that changed go to the terminal
+            query = f" /{listing.query}{'█' if typing else ''}" if typing or listing.query else ""
+            try:
+                stdscr.addstr(0, 0, f" Select files from: {directory}{query} "[:w-1], curses.A_BOLD)
+                stdscr.addstr(1, 0, " " + "─" * (w - 2), curses.A_DIM)
+                for row, idx in enumerate(matches[scroll:scroll + max_disp]):  # only the visible window is drawn
+                    if row + 2 >= h - 2: break
+                    line, here = f" [{'x' if idx in selected else ' '}] {listing.names[idx]}", scroll + row == cursor
+                    attr = curses.color_pair(1) if here else (curses.color_pair(2) | curses.A_BOLD if idx in selected else 0)
+                    stdscr.addstr(row + 2, 0, line[:w-1].ljust(w-1) if here else line[:w-1], attr)
+                count = f"{len(matches)}/{len(listing.entries)}{'' if listing.done else '…'}"
+                stdscr.addstr(h-1, 0, f" {len(selected)} selected │ {count} │ ↑↓/jk nav │ SPACE sel │ a all │ / filter │ s sort: {listing.order} │ ENTER ok │ q quit "[:w-1].ljust(w-1), curses.A_REVERSE)
             except curses.error: pass
             stdscr.refresh(); key = stdscr.getch()
+            if key == -1: continue
+            if typing:  # typing a filter: Enter or Esc ends it, the filter stays until it is erased
+                if key in (27, ord('\n'), curses.KEY_ENTER): typing = False
+                elif key in (curses.KEY_BACKSPACE, 127, 8): listing.set_query(listing.query[:-1]); cursor = 0
+                elif 32 <= key < 127: listing.set_query(listing.query + chr(key)); cursor = 0
+                continue
             if key == ord('q'): return None
-            elif key in (ord('\n'), curses.KEY_ENTER): return sorted([os.path.join(directory, files[i]) for i in selected]) if selected else None
+            elif key in (ord('\n'), curses.KEY_ENTER): return sorted(listing.path(i) for i in selected) if selected else None
             elif key in (curses.KEY_UP, ord('k')): cursor = max(0, cursor - 1)
-            elif key in (curses.KEY_DOWN, ord('j')): cursor = min(len(files) - 1, cursor + 1)
-            elif key == ord(' '): selected.symmetric_difference_update({cursor}); cursor = min(len(files) - 1, cursor + 1)
-            elif key == ord('a'): selected = set() if len(selected) == len(files) else set(range(len(files)))
-    return curses.wrapper(picker)
+            elif key in (curses.KEY_DOWN, ord('j')): cursor += 1
+            elif key == curses.KEY_PPAGE: cursor = max(0, cursor - max_disp)
+            elif key == curses.KEY_NPAGE: cursor += max_disp
+            elif key == ord(' ') and matches: selected.symmetric_difference_update({matches[cursor]}); cursor += 1
+            elif key == ord('a'):  # the first PICK_ALL_MAX matches, or none if they are all selected already
+                first = set(matches[:PICK_ALL_MAX]); selected = set() if first <= selected else first
+            elif key == ord('/'): typing = True
+            elif key == ord('s'): orders = list(PICKER_ORDERS); listing.set_order(orders[(orders.index(listing.order) + 1) % len(orders)]); cursor = 0
+    paths = curses.wrapper(picker)
+    if listing.done and not listing.entries: print(f"  No files found in: {directory}")
+    return paths
+
+def auto_layout(n): return (1, 1) if n <= 1 else None if n == 2 else (2, 2) if n <= 4 else (3, 3)  # 3x3 pages beyond 9
+
+def parse_grid(spec):
+    """'4x6' -> (4, 6) rows x cols for --grid, or None if malformed."""
+    rows, _, cols = spec.lower().partition('x')
+    return (int(rows), int(cols)) if rows.isdigit() and cols.isdigit() and int(rows) > 0 and int(cols) > 0 else None
+
+def layout_name(layout, n):
+    name = {(1, 1): 'Single', (2, 1): 'Vertical', (1, 2): 'Horizontal'}.get(tuple(layout), f"{layout[0]}x{layout[1]} Grid")
+    pages = -(-n // (layout[0] * layout[1]))
+    return f"{name}, {pages} pages" if pages > 1 else name
+
+class LineIndex:
+    """Random access to the lines of a file through an mmap and a sparse newline index.
+
+    The index is built lazily backwards from the end: one (offset, newlines from offset to EOF)
+    checkpoint per INDEX_BLOCK bytes, so memory is bounded by size / INDEX_BLOCK and any line
+    is at most one block scan away. Lines are numbered from the end: line 1 is the last line."""
+    def __init__(self, filepath, saved=None):
+        self.filepath, self.size, self._mm, self._shift = filepath, 0, None, 0
+        self.known_newlines = None  # newlines in [0, size) when supplied by the tile's line count
+        self._f = open(filepath, 'rb'); st = os.fstat(self._f.fileno()); self.ident = (st.st_dev, st.st_ino)
+        self._offs, self._cnts = [], []  # offsets descending; _cnts[i] + _shift = newlines in [_offs[i], size)
+        if saved: self._restore(saved, st.st_size)
+        self.grow()
+    def _restore(self, saved, size):
+        """Adopt checkpoints() from an earlier session if this is the file they came from, only appended to since."""
+        try:
+            offs, cnts, old = [int(o) for o in saved['offs']], [int(c) for c in saved['cnts']], int(saved['size'])
+            if saved['ident'] != list(self.ident) or not 0 < old <= size or not offs or len(offs) != len(cnts): return
+            if not (old >= offs[0] and offs[-1] >= 0 <= cnts[0]) or any(a <= b for a, b in zip(offs, offs[1:])) or any(a > b for a, b in zip(cnts, cnts[1:])): return
+            if _fingerprint(self._f, old) != saved['check']: return
+        except (KeyError, TypeError, ValueError, OSError): return
+        self.size, self._mm, self._offs, self._cnts = old, mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ), offs, cnts
+    def checkpoints(self):
+        """The index as a session saves it: at most SESSION_CHECKPOINTS checkpoints, both ends kept (gaps are refined on use)."""
+        if not self._offs: return None
+        keep = list(range(0, len(self._offs), -(-len(self._offs) // SESSION_CHECKPOINTS)))
+        if keep[-1] != len(self._offs) - 1: keep.append(len(self._offs) - 1)
+        return {'ident': list(self.ident), 'size': self.size, 'check': _fingerprint(self._f, self.size),
+                'offs': [self._offs[i] for i in keep], 'cnts': [self._cnts[i] + self._shift for i in keep]}
+    @property
+    def complete(self): return not self._offs or self._offs[-1] == 0
+    def close(self):
+        if self._mm is not None: self._mm.close()
+        self._f.close(); self._mm = None
+    def grow(self):
+        """Remap after the file grew and index the appended bytes; returns how many lines were added,
+        or None if the file shrank and the index must be rebuilt."""
+        size = os.fstat(self._f.fileno()).st_size
+        if size < self.size: return None
+        if size == self.size: return 0
+        old, self.size = self.size, size
+        if self._mm is not None: self._mm.close()
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        if not self._offs: self._offs, self._cnts = [size], [0]; return 0
+        blocks = [(lo, self._mm[lo:min(lo + INDEX_BLOCK, size)].count(b'\n')) for lo in range(old, size, INDEX_BLOCK)]
+        added = remaining = sum(c for _, c in blocks); self._shift += added
+        if self.known_newlines is not None: self.known_newlines += added
+        for lo, c in blocks:  # checkpoint each appended block; inserting in ascending order leaves EOF first
+            if lo != old: self._offs.insert(0, lo); self._cnts.insert(0, remaining - self._shift)
+            remaining -= c
+        # a line that was unterminated before the append is extended, not added
+        return added - self._tail_nl() + (self._mm[old - 1] == 0x0a)
+    def _tail_nl(self): return 1 if self.size and self._mm[self.size - 1] == 0x0a else 0
+    def _extend(self, need, pos=float('inf')):
+        """Index further back until `need` newlines from EOF (or byte pos) are covered or the start is reached."""
+        while not self.complete and (self._cnts[-1] + self._shift < need or self._offs[-1] > pos):
+            hi = self._offs[-1]; lo = max(0, hi - INDEX_BLOCK)
+            self._offs.append(lo); self._cnts.append(self._cnts[-1] + self._mm[lo:hi].count(b'\n'))
+    def _refine(self, i):
+        """Split the gap above checkpoint i that a restored, thinned index left into INDEX_BLOCK blocks."""
+        lo, hi = self._offs[i], self._offs[i - 1] if i else self.size
+        offs, cnts, c = [], [], self._cnts[i - 1] if i else -self._shift
+        for start in reversed(range(lo + INDEX_BLOCK, hi, INDEX_BLOCK)):
+            c += self._mm[start:hi].count(b'\n'); offs.append(start); cnts.append(c); hi = start
+        self._offs[i:i], self._cnts[i:i] = offs, cnts
+    def _newline_back(self, need):
+        """Offset of the newline with exactly `need` newlines in [offset, EOF), or -1 if there are fewer."""
+        self._extend(need)
+        i = bisect.bisect_left(self._cnts, need - self._shift)
+        if i == len(self._cnts): return -1
+        if (self._offs[i - 1] if i else self.size) - self._offs[i] > INDEX_BLOCK: self._refine(i); i = bisect.bisect_left(self._cnts, need - self._shift)
+        hi, have = (self._offs[i - 1], self._cnts[i - 1] + self._shift) if i else (self.size, 0)
+        pos = hi
+        for _ in range(need - have): pos = self._mm.rfind(b'\n', self._offs[i], pos)
+        return pos
+    def line_start(self, n):
+        """Byte offset where line n (1 = last) starts, or None if the file has fewer lines."""
+        if not self.size or n < 1: return None
+        q = self._newline_back(n + self._tail_nl())
+        if q >= 0: return q + 1
+        return 0 if self._newline_back(n - 1 + self._tail_nl()) >= 0 or n == 1 else None
+    def line_of(self, pos):
+        """Line number (1 = last) of the line holding byte pos."""
+        self._extend(0, pos)
+        i = bisect.bisect_left(self._offs, -pos, key=lambda o: -o)  # first checkpoint at or before pos
+        return self._cnts[i] + self._shift - self._mm[self._offs[i]:pos].count(b'\n') - self._tail_nl() + 1
+    def scan(self, rx, start, end, backward, alive, progress):
+        """(line start, line end) of the match nearest to byte start - before it if backward, else before end -
+        or None. Scans a private mmap in SEARCH_BLOCK steps of whole lines, so it is safe off the owning thread."""
+        with open(self.filepath, 'rb') as f:
+            st = os.fstat(f.fileno())
+            if (st.st_dev, st.st_ino) != self.ident or st.st_size < end or not end: return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm: return self._scan(mm, rx, start, end, backward, alive, progress)
+    def _bounds(self, mm, pos, end):
+        """(start, end) of the line holding byte pos: what a search hit selects."""
+        return mm.rfind(b'\n', 0, pos) + 1, mm.find(b'\n', pos, end) + 1 or end
+    def _scan(self, mm, rx, start, end, backward, alive, progress):
+        pos = start
+        while alive() and (pos > 0 if backward else pos < end):
+            if backward:
+                lo = max(0, pos - SEARCH_BLOCK); lo = mm.rfind(b'\n', 0, lo) + 1 if lo else 0
+                hit = None
+                for hit in rx.finditer(mm, lo, pos): pass  # the last match is the nearest one
+                pos = lo
+            else:
+                hi = mm.find(b'\n', min(end, pos + SEARCH_BLOCK), end) + 1 or end
+                hit, pos = rx.search(mm, pos, hi), hi
+            if hit: return self._bounds(mm, hit.start(), end)
+            progress(abs(start - pos) / abs(start - (0 if backward else end)))
+        return None
+    def total_known(self):
+        """Line count if the index already reaches the start of the file, else None."""
+        if not self.size: return 0
+        if self.complete: return self._cnts[-1] + self._shift - self._tail_nl() + 1
+        return self.known_newlines - self._tail_nl() + 1 if self.known_newlines is not None else None
+    def total(self):
+        self._extend(float('inf')); return self.total_known()
+    def window(self, skip, n, pan=0):
+        """The n lines that end `skip` lines above the last one, oldest first, panned as _clip does."""
+        if n <= 0 or self.line_start(skip + 1) is None: return []
+        end = self.line_start(skip) if skip else self.size  # keeps the last terminator, so a blank last line survives _split_lines
+        return _lines(self._mm, pan, self.line_start(skip + n) or 0, end)
+
+class HexIndex(LineIndex):
+    """LineIndex for a binary file where each line is one HEX_WIDTH-byte hexdump row."""
+    complete = True
+    def _rows(self): return -(-self.size // HEX_WIDTH)
+    def grow(self):
+        rows = self._rows(); added = super().grow()
+        return None if added is None else self._rows() - rows
+    def line_start(self, n): return (self._rows() - n) * HEX_WIDTH if 1 <= n <= self._rows() else None
+    def line_of(self, pos): return self._rows() - pos // HEX_WIDTH
+    def total_known(self): return self._rows()
+    total = total_known
+    def window(self, skip, n, pan=0):
+        lo, hi = max(0, self._rows() - skip - n) * HEX_WIDTH, max(0, self._rows() - skip) * HEX_WIDTH
+        return [line[pan:] for line in _split_lines(_hex_rows(self._mm[lo:hi], lo))] if n > 0 and hi > lo else []
+    def _bounds(self, mm, pos, end): return pos - pos % HEX_WIDTH, min(end, pos - pos % HEX_WIDTH + HEX_WIDTH)
+
+class BufferIndex(LineIndex):
+    """LineIndex over bytes in memory: a command tile's scrollback, fixed when scroll mode starts."""
+    def __init__(self, data):
+        self.filepath, self.ident, self.known_newlines, self._shift = None, None, None, 0
+        self._mm, self.size = data, len(data)
+        self._offs, self._cnts = ([self.size], [0]) if data else ([], [])
+    def close(self): pass
+    def grow(self): return 0
+    def scan(self, rx, start, end, backward, alive, progress):
+        return self._scan(self._mm, rx, start, end, backward, alive, progress) if end else None
+
+def _compression(filepath):
+    """'gzip', 'bz2', 'xz' or 'lzma' from the file's magic bytes, or None for plain text."""
+    try:
+        with open(filepath, 'rb') as f: head = f.read(6)
+    except OSError: return None
+    return next((kind for magic, kind in COMPRESSED_MAGIC if head.startswith(magic)), None)
+
+def _decompressor(kind):
+    if kind == 'gzip': return zlib.decompressobj(zlib.MAX_WBITS | 16)
+    return bz2.BZ2Decompressor() if kind == 'bz2' else lzma.LZMADecompressor()
 
-def auto_layout(n): return (1, 1) if n <= 1 else None if n == 2 else (2, 2) if n <= 4 else (3, 3)
+class CompressedIndex:
+    """LineIndex's interface over a gzip/bz2/xz file, which can only be read front to back.
+
+    A single decompression pass counts lines and lays down (offset, newlines before it, compressed
+    offset, decompressor copy) checkpoints, at most MAX_CHECKPOINTS of them, so a window is at most one
+    checkpoint span of inflating away. Only zlib state can be copied, so bz2 and xz resume from the start.
+    The line count and last TAIL_CACHE bytes are cached on disk by inode, size and mtime: reopening a
+    rotated log shows its tail without decompressing it again, and checkpoints are built on first scroll."""
+    complete, known_newlines = True, None
+    def __init__(self, filepath, kind):
+        self.filepath, self.kind, self._ckpts, self._blocks, self._lock = filepath, kind, None, {}, threading.Lock()
+        st = os.stat(filepath); self.ident, self._key = (st.st_dev, st.st_ino), [st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns]
+        self._cache = INDEX_CACHE_DIR / (hashlib.sha1(os.fsencode(os.path.realpath(filepath))).hexdigest() + ".json")
+        try:
+            cached = json.loads(self._cache.read_text())
+            if cached['key'] != self._key: raise ValueError
+            self.size, self.newlines, self.tail = cached['size'], cached['newlines'], base64.b64decode(cached['tail'])
+        except (OSError, ValueError, KeyError, TypeError): self._ensure()
+        self._tail_first = self.newlines - self.tail.count(b'\n')  # number of the first newline inside tail
+    def close(self): self._blocks.clear()
+    def grow(self):
+        """Compressed logs are not appended to: 0 while unchanged, None once the file was replaced."""
+        try: st = os.stat(self.filepath)
+        except OSError: return None
+        return 0 if [st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns] == self._key else None
+    def _inflate(self, ckpt, record=False):
+        """Yield (offset, bytes) decompressed from checkpoint ckpt to the end; record lays checkpoints down."""
+        off, nl, pos, state = ckpt
+        d, step = state.copy() if state else _decompressor(self.kind), CHECKPOINT_STEP
+        with open(self.filepath, 'rb') as f:
+            f.seek(pos)
+            while chunk := f.read(INDEX_BLOCK):
+                pos += len(chunk)
+                while chunk:
+                    if d.eof: d = _decompressor(self.kind)  # concatenated members / streams
+                    try: data = d.decompress(chunk)
+                    except (OSError, *COMPRESSED_ERRORS):
+                        if not off: raise
+                        chunk = None; break  # trailing garbage or padding after the last member
+                    chunk = d.unused_data if d.eof else b''
+                    if data: yield off, data; off += len(data); nl += data.count(b'\n') if record else 0
+                if chunk is None: break
+                if record and off - self._ckpts[-1][0] >= step:
+                    self._ckpts.append((off, nl, pos, d.copy() if self.kind == 'gzip' else None))
+                    if len(self._ckpts) > MAX_CHECKPOINTS: self._ckpts[1:], step = self._ckpts[2::2], step * 2
+        if record: self.size, self.newlines = off, nl
+    def _ensure(self):
+        """Run the indexing pass once; also refreshes the on-disk cache."""
+        with self._lock:
+            if self._ckpts is not None: return
+            self._ckpts, tail, kept = [(0, 0, 0, None)], deque(), 0
+            for _, data in self._inflate(self._ckpts[0], record=True):
+                tail.append(data); kept += len(data)
+                while kept - len(tail[0]) >= TAIL_CACHE: kept -= len(tail.popleft())
+            self.tail = b''.join(tail)[-TAIL_CACHE:]
+            try:
+                INDEX_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                self._cache.write_text(json.dumps({'key': self._key, 'size': self.size, 'newlines': self.newlines,
+                                                   'tail': base64.b64encode(self.tail).decode()}))
+            except OSError: pass
+    def _resume(self, pos):
+        """The checkpoint to decompress from to reach offset pos."""
+        i = bisect.bisect_right(self._ckpts, pos, key=lambda c: c[0]) - 1
+        while i and self._ckpts[i][3] is None: i -= 1
+        return self._ckpts[i]
+    def _block(self, i, newlines=False):
+        """Bytes between checkpoints i and i+1 (or their newline offsets); the last two blocks stay decoded."""
+        if i not in self._blocks:
+            lo, hi = self._ckpts[i][0], self._ckpts[i + 1][0] if i + 1 < len(self._ckpts) else self.size
+            out = []
+            for off, data in self._inflate(self._resume(lo)):
+                if off + len(data) > lo: out.append(data[max(0, lo - off):hi - off])
+                if off + len(data) >= hi: break
+            self._blocks[i] = [b''.join(out), None]
+            if len(self._blocks) > 2: del self._blocks[next(iter(self._blocks))]
+        block = self._blocks[i] = self._blocks.pop(i)
+        if newlines and block[1] is None: block[1] = array.array('Q', (m.start() for m in re.finditer(b'\n', block[0])))
+        return block[1] if newlines else block[0]
+    def _at(self, pos):
+        """(buffer, its offset) holding byte pos: the cached tail, else a checkpoint block."""
+        if pos >= self.size - len(self.tail): return self.tail, self.size - len(self.tail)
+        self._ensure(); i = bisect.bisect_right(self._ckpts, pos, key=lambda c: c[0]) - 1
+        return self._block(i), self._ckpts[i][0]
+    def _read(self, lo, hi):
+        out = []
+        while lo < hi:
+            buf, base = self._at(lo); piece = buf[lo - base:hi - base]; out.append(piece); lo += len(piece)
+        return b''.join(out)
+    def _line_pos(self, k):
+        """Offset where line k (0 = first) starts."""
+        if k <= 0: return 0
+        j = k - 1  # the newline ending line k - 1
+        if j < self._tail_first:  # offsets of every newline in the block make scrolling inside it cheap
+            self._ensure(); i = bisect.bisect_right(self._ckpts, j, key=lambda c: c[1]) - 1
+            return self._ckpts[i][0] + self._block(i, newlines=True)[j - self._ckpts[i][1]] + 1
+        pos = -1
+        for _ in range(j - self._tail_first + 1): pos = self.tail.find(b'\n', pos + 1)
+        return self.size - len(self.tail) + pos + 1
+    def _tail_nl(self): return 1 if self.tail.endswith(b'\n') else 0
+    def total_known(self): return self.newlines - self._tail_nl() + 1 if self.size else 0
+    total = total_known
+    def line_start(self, n):
+        total = self.total_known()
+        return self._line_pos(total - n) if 1 <= n <= total else None
+    def line_of(self, pos):
+        buf, base = self._at(pos)
+        before = self._tail_first if buf is self.tail else self._ckpts[bisect.bisect_right(self._ckpts, pos, key=lambda c: c[0]) - 1][1]
+        return self.total_known() - before - buf[:pos - base].count(b'\n')
+    def window(self, skip, n, pan=0):
+        total = self.total_known()
+        if n <= 0 or skip >= total: return []
+        end = self._line_pos(total - skip) if skip else self.size  # with its terminator, as LineIndex.window
+        return _lines(self._read(self._line_pos(max(0, total - skip - n)), end), pan)
+    def scan(self, rx, start, end, backward, alive, progress):
+        """LineIndex.scan by decompressing forward; backward keeps the last match before start."""
+        self._ensure()
+        lo, hi = (0, start) if backward else (start, end)
+        found, carry = None, b''
+        if lo >= hi: return None
+        for off, data in self._inflate(self._resume(lo)):
+            if not alive(): return None
+            if off + len(data) <= lo: continue
+            if off < lo: data, off = data[lo - off:], lo
+            last = off + len(data) >= hi
+            buf, base = carry + data[:hi - off], off - len(carry)
+            cut, hit = len(buf) if last else buf.rfind(b'\n') + 1, None
+            if backward:
+                for hit in rx.finditer(buf, 0, cut): pass
+            else: hit = rx.search(buf, 0, cut)
+            if hit:
+                found = base + buf.rfind(b'\n', 0, hit.start()) + 1, base + (buf.find(b'\n', hit.start(), cut) + 1 or cut)
+                if not backward: return found
+            carry = buf[cut:]; progress((off + len(data) - lo) / (hi - lo))
+            if last: break
+        return found
+
+def _rotated(filepath):
+    """Rotated predecessors of a log, newest first: app.log.1, app.log.2.gz, app.log-20240101, ..."""
+    found = []
+    for path in glob.glob(glob.escape(filepath) + '[.-]*'):
+        try: found.append((os.stat(path).st_mtime, path))
+        except OSError: pass
+    return [path for _, path in sorted(found, reverse=True) if os.path.isfile(path)]
+
+def _open_index(filepath):
+    kind = _compression(filepath)
+    return CompressedIndex(filepath, kind) if kind else LineIndex(filepath)
+
+class ChainIndex:
+    """A live log and its rotated predecessors scrolled as one stream.
+
+    Parts are newest first and opened only once scrolling or a search reaches them. Older parts get
+    negative offsets counting back from the start of the live file, so the live part keeps its own."""
+    known_newlines = None
+    def __init__(self, filepath):
+        self.filepath, self._paths, self._parts = filepath, _rotated(filepath), [_open_index(filepath)]
+        self.ident = self._parts[0].ident
+    @property
+    def size(self): return self._parts[0].size
+    def _part(self, i):
+        """Part i (0 = the live file), or None past the oldest."""
+        while len(self._parts) <= i and len(self._parts) <= len(self._paths):
+            try: self._parts.append(_open_index(self._paths[len(self._parts) - 1]))
+            except (OSError, ValueError, *COMPRESSED_ERRORS): del self._paths[len(self._parts) - 1]
+        return self._parts[i] if i < len(self._parts) else None
+    @property
+    def complete(self): return len(self._parts) > len(self._paths) and all(p.complete for p in self._parts)
+    def close(self):
+        for part in self._parts: part.close()
+    def grow(self): return self._parts[0].grow()
+    def _base(self, i): return -sum(part.size for part in self._parts[1:i + 1])
+    def line_start(self, n):
+        i = 0 if n >= 1 else None
+        while i is not None and (part := self._part(i)) is not None:
+            if (q := part.line_start(n)) is not None: return self._base(i) + q
+            n -= part.total(); i += 1
+        return None
+    def total_known(self):
+        totals = [part.total_known() for part in self._parts]
+        return sum(totals) if len(self._parts) > len(self._paths) and None not in totals else None
+    def total(self):
+        i = 0
+        while self._part(i) is not None: i += 1
+        return sum(part.total() for part in self._parts)
+    def window(self, skip, n, pan=0):
+        out, i = [], 0
+        while n > 0 and (part := self._part(i)) is not None:
+            if part.line_start(skip + n) is not None: return part.window(skip, n, pan) + out
+            total = part.total(); got = part.window(skip, n, pan) if skip < total else []
+            out, n, skip, i = got + out, n - len(got), max(0, skip - total), i + 1
+        return out
+    def line_of(self, pos):
+        i = 0
+        while pos < 0 and self._part(i + 1) is not None: i += 1; pos += self._parts[i].size
+        return self._parts[i].line_of(pos) + sum(part.total() for part in self._parts[:i])
+    def scan(self, rx, start, end, backward, alive, progress):
+        i, pos = 0, start
+        while pos < 0 and self._part(i + 1) is not None: i += 1; pos += self._parts[i].size
+        while alive():
+            part = self._parts[i]
+            if hit := part.scan(rx, pos, end if i == 0 else part.size, backward, alive, progress):
+                return self._base(i) + hit[0], self._base(i) + hit[1]
+            if not backward and i == 0 or backward and self._part(i + 1) is None: return None
+            i += 1 if backward else -1; pos = self._parts[i].size if backward else 0
+        return None
 
 class TailTile:
+    """Follows a file by byte offset: each update reads only the bytes appended since the last one."""
+    merged = False  # True for the MergeTile timeline, whose lines carry a '[n] ' tile tag
     def __init__(self, filepath, lines=10):
-        self.filepath, self.lines, self._content, self._last_stat = filepath, lines, [], (0.0, 0)
-        self.frozen, self.scroll_offset, self._frozen_content = False, 0, []
+        self.chain = filepath.startswith('chain:')  # scroll mode also reads the rotated predecessors
+        self.filepath, self.lines, self._content = filepath.removeprefix('chain:'), lines, LineStore(max(lines, 0))
+        self._offset, self._ident, self._partial = 0, None, b''  # next byte to read, (dev, inode), unterminated tail
+        self.frozen, self.scroll_offset, self._index = False, 0, None  # scroll mode reads through a LineIndex
+        self._cindex = None  # CompressedIndex while the file is gzip/bz2/xz: the tail comes from its pass
+        self.binary, self._cut = False, False  # binary: shown as hexdump rows; _cut: dropping a runaway line's rest
+        # Newlines in [0, _offset): counted once in the background, then kept current from appended bytes
+        self._nl, self._nl_pending, self._count_gen, self._counted, self._count_thread = None, 0, 0, None, None
+        self._count_base = (0, 0)  # (offset, newlines before it) the count starts from: a restored session's count
+        self._warm, self._checkpoints = None, None  # state saved by an earlier session; the last LineIndex's checkpoints
+        self.snap, self.on_done = None, None  # last published TileSnapshot; called from count and search threads when done
+        self.appended = 0  # lines appended since the tile was opened, for the lines/s indicator
+        # Off-page tiles only follow the offset and count new lines; the tail is re-read once they are shown
+        self.visible, self.unseen, self._stale = True, 0, False
         self.h_scroll, self.wrap = 0, False  # Horizontal scroll offset and wrap toggle
+        self.filter, self._filter_rx = None, None  # live filter: only matching lines enter the ring buffer
+        # Scroll-mode search runs on its own thread; _found carries (generation, (line start, line end) or None) back
+        self._search, self._search_rx, self._search_gen, self._searching, self._progress = None, None, 0, False, 0.0
+        self._found, self._match, self._missed = None, None, False
+    def reset(self): self._ident = None  # next update re-reads the tail from scratch
+    def resize(self, lines):
+        if lines == self.lines: return
+        if 0 <= lines < self.lines: self._content.resize(lines)  # shrinking needs no I/O
+        else: self.reset()
+        self.lines = lines
+        if self._ident is None and not self.frozen: self.update()
+    def warm(self, state, view=False):
+        """Start from a session_state() saved earlier; the first update checks it against the file. Only with
+        view (a resumed session) does the tile also come back in scroll mode at the saved line."""
+        self._warm, self.frozen = state, view and bool(state.get('frozen'))
+    def _resume(self):
+        """First update of a warmed tile: reuse the saved line count, checkpoints and scroll position if the
+        file is the one the session saw, only appended to since. Otherwise it starts cold (in scroll mode at the end)."""
+        warm, frozen, pos = self._warm, self.frozen, None
+        self._warm, self.frozen = None, False
+        changed = self.update()
+        try:
+            if warm['ident'] != list(self._ident or ()) or not 0 < warm['offset'] <= self._offset or self._cindex or self.binary: raise ValueError
+            with open(self.filepath, 'rb') as f:
+                if _fingerprint(f, warm['offset']) != warm['check']: raise ValueError
+            if warm['newlines'] is not None and self._nl is None: self._count_base = (warm['offset'], int(warm['newlines']))
+            self._checkpoints, pos = warm.get('index'), warm.get('scroll_pos') if frozen else None
+        except (OSError, ValueError, KeyError, TypeError): pass
+        if frozen:
+            self.freeze()
+            try:
+                if pos is not None and self._index and 0 <= pos < self._index.size: self.scroll_offset = max(0, self._index.line_of(pos) - 1); self.scroll(0)
+            except (OSError, ValueError, *COMPRESSED_ERRORS): pass
+        return changed or frozen
+    def session_state(self):
+        """What warm() needs to reopen this tile without counting or indexing the file again (reader thread)."""
+        index = self._index if self.frozen else None
+        ident = self._ident or (index and index.ident)  # resized in scroll mode: the tail is re-read on unfreeze
+        if ident is None or self._warm is not None: return self._warm
+        if self._cindex or self.binary: return None
+        if type(index) is LineIndex and index.ident == ident: self._checkpoints = index.checkpoints()
+        offset, newlines = self._offset, self._nl if self.total_lines() is not None else None
+        if newlines is None and self._count_base[0]: offset, newlines = self._count_base  # the restored count, not yet brought up to date
+        try:
+            with open(self.filepath, 'rb') as f: check = _fingerprint(f, offset)
+            pos = index.line_start(self.scroll_offset + 1) if index else None
+        except (OSError, ValueError, *COMPRESSED_ERRORS): return None
+        checkpoints = self._checkpoints if self._checkpoints and self._checkpoints.get('ident') == list(ident) else None
+        return {'ident': list(ident), 'offset': offset, 'check': check, 'newlines': newlines, 'index': checkpoints, 'frozen': self.frozen, 'scroll_pos': pos}
     def update(self):
-        if self.frozen: return False
-        try: stat = os.stat(self.filepath); current = (stat.st_mtime, stat.st_size)
+        if self._warm is not None: return self._resume()
+        if self.frozen: return self._update_frozen()
+        try: st = os.stat(self.filepath)
         except OSError:
-            if self._content: self._content = []; return True
+            self._ident = None
+            if self._content or self._partial: self._content.clear(); self._partial = b''; return True
             return False
-        if current != self._last_stat: self._last_stat, self._content = current, read_last_n_lines(self.filepath, self.lines); return True
-        return False
-    def get_content(self):
-        if self.frozen:
-            end = len(self._frozen_content) - self.scroll_offset
-            start = max(0, end - self.lines)
-            return self._frozen_content[start:end]
-        return self._content.copy()
+        ident = (st.st_dev, st.st_ino)
+        if not self.visible: return self._track_hidden(ident, st.st_size)
+        # Inode change = logrotate replaced the file; shrinking = truncated. Either way start over at the new tail.
+        if ident != self._ident or st.st_size < self._offset: return self._reopen(ident, st.st_size)
+        if st.st_size == self._offset: return False
+        if st.st_size - self._offset > FOLLOW_MAX_READ or self._cindex or self.binary: return self._reopen(ident, st.st_size)
+        try:
+            with open(self.filepath, 'rb') as f: f.seek(self._offset); data = f.read(st.st_size - self._offset)
+        except OSError: return False
+        self._offset += len(data); self._push(data)
+        added = data.count(b'\n'); self.appended += added
+        if self._nl is None: self._nl_pending += added
+        else: self._nl += added
+        return True
+    def _track_hidden(self, ident, size):
+        """update() for an off-page tile: advance the offset and count appended lines without decoding them."""
+        if ident != self._ident or size < self._offset:
+            self._ident, self._offset, self._stale = ident, size, True; self._invalidate_count()
+            return False
+        if size == self._offset: return False
+        if self._cindex: self._offset, self._stale = size, True; return False
+        added = 0
+        try:
+            with open(self.filepath, 'rb') as f:
+                f.seek(self._offset)
+                while self._offset < size and (chunk := f.read(min(COUNT_BLOCK, size - self._offset))):
+                    added += chunk.count(b'\n'); self._offset += len(chunk)
+        except OSError: pass
+        self._stale, self.unseen, self.appended = True, self.unseen + added, self.appended + added
+        if self._nl is None: self._nl_pending += added
+        else: self._nl += added
+        return True
+    def set_visible(self, visible):
+        self.visible = visible
+        if visible:
+            self.unseen = 0
+            if self._stale and not self.frozen: self._stale = False; self._reopen(self._ident, self._offset, recount=False)
+    def _invalidate_count(self):
+        self._nl, self._nl_pending, self._count_gen, self._count_thread, self._count_base = None, 0, self._count_gen + 1, None, (0, 0)
+    def _reopen(self, ident, size, recount=True):
+        kind = _compression(self.filepath)
+        try:
+            if kind and (self._cindex is None or self._cindex.grow() != 0): self._cindex = CompressedIndex(self.filepath, kind)
+            with io.BytesIO(self._cindex.tail) if kind else open(self.filepath, 'rb') as f:
+                end = len(self._cindex.tail) if kind else size
+                f.seek(max(0, end - BINARY_SAMPLE)); self.binary = not kind and _looks_binary(f.read(BINARY_SAMPLE))
+                if self.binary:  # only the rows on screen are read, so following a growing binary stays cheap
+                    start = max(0, -(-end // HEX_WIDTH) - self.lines) * HEX_WIDTH; f.seek(start); data = _hex_rows(f.read(end - start), start)
+                elif self._filter_rx: data = _read_matching(f, self.lines, end, self._filter_rx)
+                else: data = _read_tail(f, self.lines, end)
+        except (OSError, *COMPRESSED_ERRORS): return False
+        if not kind: self._cindex = None
+        self._ident, self._offset, self._partial, self._cut = ident, size, b'', False
+        if recount or kind: self._invalidate_count()
+        if kind: self._nl = self._cindex.newlines  # counted by the decompression pass
+        self._content = LineStore(max(self.lines, 0)); self._push(data)
+        return True
+    def _push(self, data):
+        """Append raw bytes: complete lines go into the ring buffer, an unterminated tail is held back.
+        Returns the complete lines."""
+        if self._cut:  # resume at the line break that ends the runaway line
+            if not (m := LINE_BREAK.search(data)): return b''
+            data, self._cut = data[m.start():], False
+        data = self._partial + data
+        nl = max(data.rfind(b'\n'), data.rfind(b'\r', 0, len(data) - 1)) + 1  # a final \r may still become \r\n
+        self._partial = data[nl:]
+        if len(self._partial) > MAX_LINE: self._partial, self._cut = self._partial[:MAX_LINE], True  # keep its head
+        if nl and self._filter_rx: self._content.extend(b''.join(_grep(self._filter_rx, data[:nl])))
+        elif nl: self._content.extend(data[:nl])
+        return data[:nl]
+    def _update_frozen(self):
+        """Extend the index while frozen, shifting the offset so the visible lines stay put."""
+        if self._index is None: return False
+        size = self._index.size
+        try: added = self._index.grow()
+        except (OSError, ValueError, *COMPRESSED_ERRORS): added = None
+        if added is None: self.freeze(); return True  # truncated under us: re-freeze at the new end
+        self.scroll_offset += added
+        return self._take_found() or self._index.size != size
+    def get_content(self): return self._view(self.h_scroll)
+    def _view(self, pan):
+        if self.frozen: return self._index.window(self.scroll_offset, self.lines, pan)[-self.lines:] if self._index and self.lines > 0 else []
+        partial = self._partial if not self._filter_rx or self._filter_rx.search(self._partial) else b''
+        return (self._content.tail(self.lines, pan) + _lines(partial, pan))[-self.lines:] if self.lines > 0 else []
+    def pan(self, h_scroll): self.h_scroll = h_scroll  # characters, or bytes within a line longer than LINE_WINDOW
     def freeze(self):
+        if self._index: self._index.close()
+        self.cancel_find(); self._match = None
+        try: self._index = self._open_index()
+        except (OSError, ValueError, *COMPRESSED_ERRORS): self._index = None
+        if isinstance(self._index, LineIndex) and self.total_lines() is not None and (self._index.size, self._index.ident) == (self._offset, self._ident):
+            self._index.known_newlines = self._nl  # lets the status bar show a total before gg indexes everything
         self.frozen, self.scroll_offset = True, 0
-        self._frozen_content = read_last_n_lines(self.filepath, 1000)
-    def unfreeze(self): self.frozen, self.scroll_offset, self._last_stat = False, 0, (0, 0)
+    def _open_index(self):
+        if self.chain: return ChainIndex(self.filepath)
+        kind = _compression(self.filepath)
+        if not kind: return HexIndex(self.filepath) if self.binary else LineIndex(self.filepath, self._checkpoints)
+        if self._cindex is None or self._cindex.grow() != 0: self._cindex = CompressedIndex(self.filepath, kind)
+        return self._cindex
+    def unfreeze(self):
+        if type(self._index) is LineIndex: self._checkpoints = self._index.checkpoints()  # the next freeze (or session) starts from them
+        if self._index: self._index.close()
+        self.cancel_find(); self._match = None
+        self.frozen, self.scroll_offset, self._index = False, 0, None
+        if self._stale and self.visible: self.set_visible(True)
+        if self._ident is None: self.update()  # resized while frozen
     def scroll(self, delta):
-        if self.frozen:
-            max_offset = max(0, len(self._frozen_content) - self.lines)
-            self.scroll_offset = clamp(self.scroll_offset + delta, 0, max_offset)
+        if self.frozen and self._index:
+            offset = max(0, self.scroll_offset + delta)
+            # Only the lines up to the new top get indexed; running off the start means the count is now known
+            if self._index.line_start(offset + self.lines) is None: offset = max(0, self._index.total() - self.lines)
+            self.scroll_offset = offset
     def scroll_top(self):
-        if self.frozen: self.scroll_offset = max(0, len(self._frozen_content) - self.lines)
+        if self.frozen and self._index: self.scroll_offset = max(0, self._index.total() - self.lines)
     def scroll_bottom(self):
         if self.frozen: self.scroll_offset = 0
+    def set_filter(self, pattern):
+        """Show only lines matching pattern (None clears it); the tail is re-read once, then only appends are matched."""
+        self.filter, self._filter_rx = pattern or None, re.compile(pattern.encode(), re.MULTILINE) if pattern else None
+        if not self.visible: self._stale = True
+        elif self._ident is not None: self._reopen(self._ident, self._offset, recount=False)
+    def find(self, pattern, backward=True):
+        """Search the whole file for pattern in the background, starting from the bottom of the scroll view."""
+        if not self.frozen: self.freeze()
+        self._search, self._search_rx, self._match = pattern, re.compile(pattern.encode(), re.MULTILINE), None
+        if self._index: self._start_find(self._index.line_start(self.scroll_offset) if self.scroll_offset else self._index.size, backward)
+    def find_next(self, backward=True):
+        """n / N: the next match above (backward) or below the current one."""
+        if not (self.frozen and self._index and self._search_rx): return
+        if self._match is None: return self.find(self._search, backward)
+        self._start_find(self._match[0] if backward else self._match[1], backward)
+    def cancel_find(self): self._search_gen += 1; self._searching = False
+    def _start_find(self, start, backward):
+        self._search_gen += 1; self._searching, self._progress, self._missed, self._found = True, 0.0, False, None
+        args = (self._search_gen, self._index, self._search_rx, start, self._index.size, backward)
+        threading.Thread(target=self._find, args=args, daemon=True).start()
+    def _find(self, gen, index, rx, start, end, backward):
+        """Runs off the reader thread; index.scan checks `alive` between blocks so a newer search cancels this one."""
+        last = time.monotonic()
+        def progress(done):
+            nonlocal last
+            self._progress = done
+            if self.on_done and time.monotonic() - last > 0.1: last = time.monotonic(); self.on_done()
+        try: found = index.scan(rx, start, end, backward, lambda: gen == self._search_gen, progress)
+        except (OSError, ValueError, *COMPRESSED_ERRORS): found = None
+        if gen != self._search_gen: return  # cancelled or superseded
+        self._found = (gen, found)
+        if self.on_done: self.on_done()
+    def _take_found(self):
+        """Fold a finished search in (reader thread): scroll so the matching line sits mid-tile."""
+        if not self._found or self._found[0] != self._search_gen: return False
+        match, self._found, self._searching = self._found[1], None, False
+        self._missed = match is None
+        if match and self._index:
+            self._match, offset = match, max(0, self._index.line_of(match[0]) - (self.lines + 1) // 2)
+            if self._index.line_start(offset + self.lines) is None: offset = max(0, self._index.total() - self.lines)
+            self.scroll_offset = offset
+        return True
+    def search_state(self):
+        """(pattern, progress while running else None, True if the last search found nothing) or None."""
+        return (self._search, self._progress if self._searching else None, self._missed) if self._search else None
+    def frozen_total(self):
+        """Line count in scroll mode, or None until the index has reached the start of the file."""
+        return self._index.total_known() if self._index else 0
     def total_lines(self):
+        """Cached line count, or None while the first background count is still running."""
+        if self._nl is None:
+            if self._counted and self._counted[0] == self._count_gen: self._nl = self._counted[1] + self._nl_pending
+            elif self._count_thread is None and self._ident is not None:
+                self._count_thread = threading.Thread(target=self._count, args=(self._count_gen, self._offset, *self._count_base), daemon=True)
+                self._count_thread.start()
+        if self._nl is None: return None if self._ident is not None else 0
+        return self._nl + (1 if self._partial else 0)
+    def _count(self, gen, upto, start=0, n=0):
+        """Count newlines in [start, upto) on a thread, on top of the n known to lie before start."""
         try:
-            with open(self.filepath, 'r', encoding='utf-8', errors='replace') as f:
-                return sum(1 for _ in f)
-        except OSError: return 0
+            with open(self.filepath, 'rb') as f:
+                f.seek(start); upto -= start
+                while upto > 0 and (chunk := f.read(min(COUNT_BLOCK, upto))): n += chunk.count(b'\n'); upto -= len(chunk)
+        except OSError: pass
+        self._counted = (gen, n)  # folded in by the next total_lines() call; stale generations are ignored
+        if self.on_done: self.on_done()
+    def snapshot(self):
+        return TileSnapshot(tuple(self.get_content()), self.frozen, self.scroll_offset, self.total_lines(),
+                            self.frozen_total() if self.frozen else None, self.appended, self.unseen, self.search_state(), self.filter)
+
+TileSnapshot = namedtuple('TileSnapshot', 'lines frozen scroll_offset total frozen_total appended unseen search filter',
+                          defaults=(False, 0, 0, 0, 0, 0, None, None))
+
+class CommandTile(TailTile):
+    """Shows a command's output ('cmd:journalctl -f') where a file tile would show a file.
+
+    The viewer owns the pipe: it registers the non-blocking fd from spawn() in its selector and
+    passes what it reads to feed(). Lines go into the same ring buffer a file tile uses, and the
+    last `scrollback` bytes are kept so scroll mode and search can run over a BufferIndex."""
+    def __init__(self, spec, lines=10, scrollback=CMD_SCROLLBACK):
+        super().__init__(spec, lines)
+        self.command, self.proc, self._history, self._nl = spec.removeprefix('cmd:'), None, LineStore(budget=scrollback), 0
+        self._eof_at, self._signalled = None, None  # when reap() closed the pipe; the last signal it escalated to
+    def spawn(self):
+        """Start the command (UI thread); returns the non-blocking fd carrying its stdout and stderr."""
+        self._eof_at, self._signalled = None, None
+        self.proc = subprocess.Popen(self.command, shell=True, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                     stderr=subprocess.STDOUT, start_new_session=True)
+        fd = self.proc.stdout.fileno(); os.set_blocking(fd, False)
+        return fd
+    def read(self):
+        """One non-blocking read of the pipe: bytes, None if nothing is ready, b'' once the command closed it."""
+        try: return os.read(self.proc.stdout.fileno(), CMD_READ)
+        except BlockingIOError: return None
+        except OSError: return b''
+    def reap(self, now):
+        """Close the pipe after EOF, then never block: the exit status once the command is gone, else None
+        (ask again on a later tick). One that outlives its output by CMD_REAP_GRACE gets SIGTERM, then SIGKILL."""
+        if self._eof_at is None: self.proc.stdout.close(); self._eof_at = now
+        if (status := self.proc.poll()) is not None: return status
+        waited = now - self._eof_at
+        sig = signal.SIGKILL if waited >= 2 * CMD_REAP_GRACE else signal.SIGTERM if waited >= CMD_REAP_GRACE else None
+        if sig is not None and sig != self._signalled: self._signalled = sig; self.kill(sig)
+        return None
+    def kill(self, sig=signal.SIGTERM):
+        if self.proc and self.proc.poll() is None:
+            try: os.killpg(self.proc.pid, sig)
+            except OSError: pass
+    def feed(self, data):
+        """Take bytes read from the pipe (reader thread); old output beyond `scrollback` is dropped."""
+        self._history.extend(self._push(data))  # nothing is decoded here, so hidden tiles take the same path
+        added = data.count(b'\n'); self._nl += added; self.appended += added
+        if not self.visible: self.unseen += added
+        return True
+    def exited(self, status, restart=None):
+        """Note the exit in the output, so the tile says why it went quiet."""
+        note = f"[exited with status {status}" + (f", restarting in {restart:g}s]" if restart is not None else "]")
+        self.feed((b'\n' if self._partial else b'') + note.encode() + b'\n')
+    def _output(self): return self._history.data() + self._partial
+    def _refill(self):
+        """Rebuild the ring buffer from the kept output, as _reopen does from the file."""
+        data = self._output(); f = io.BytesIO(data)
+        data = _read_matching(f, self.lines, len(data), self._filter_rx) if self._filter_rx else _read_tail(f, self.lines, len(data))
+        self._content, self._partial = LineStore(max(self.lines, 0)), b''
+        self._push(data)
+    def reset(self): pass  # the output can't be read again; the ring buffer is all there is
+    def session_state(self): return None
+    def resize(self, lines):
+        if lines != self.lines: self.lines = lines; self._refill()
+    def update(self): return self._update_frozen() if self.frozen else False
+    def set_visible(self, visible):
+        self.visible = visible
+        if visible: self.unseen = 0
+    def set_filter(self, pattern): super().set_filter(pattern); self._refill()
+    def _open_index(self): return BufferIndex(self._output())
+
+def _ts_key(m):
+    """Sort key of a timestamp match: its first group if the regex has one, with ISO 'T' and ',' normalized."""
+    ts = m.group(1) if m.re.groups else m.group(0)
+    return (ts[:10] + ' ' + ts[11:] if ts[10:11] == 'T' else ts).replace(',', '.')
+
+class MergeIndex:
+    """Scroll-mode index of the merged view: the sources' indexes merged backwards by heapq.merge, on demand.
+
+    Merged lines are materialized newest first, up to MERGE_SCROLLBACK. Positions are minus line numbers
+    (line 1 = newest), so TailTile's scroll and search code runs on it unchanged."""
+    size, ident = 0, None
+    def __init__(self, parts, rx):
+        self._parts, self._lock, self._back, self._done = parts, threading.Lock(), [], False
+        self._merge = heapq.merge(*(self._backward(num, index, rx) for num, index in parts), key=lambda t: t[0], reverse=True)
+    @staticmethod
+    def _backward(num, index, rx):
+        """(timestamp, num, line) newest first; lines without a timestamp take the one of the line above them."""
+        skip, pending = 0, []  # pending: untimed lines at the top of the last batch, waiting for their header
+        while lines := index.window(skip, MERGE_BATCH):
+            skip += len(lines); lines += pending
+            first = next((i for i, line in enumerate(lines) if rx.search(line)), None)
+            if first is None: pending = lines; continue
+            pending, ts, stamped = lines[:first], '', []
+            for line in lines[first:]:
+                if m := rx.search(line): ts = _ts_key(m)
+                stamped.append((ts, num, line))
+            yield from reversed(stamped)
+        for line in reversed(pending): yield '', num, line
+    def _fill(self, n):
+        with self._lock:  # the search thread fills too
+            while len(self._back) < n and not self._done:
+                item = next(self._merge, None)
+                if item: self._back.append(f"[{item[1]}] {item[2]}")
+                self._done = item is None or len(self._back) >= MERGE_SCROLLBACK
+        return len(self._back)
+    def close(self):
+        for _, index in self._parts: index.close()
+    def grow(self): return 0
+    def line_start(self, n): return -n if 1 <= n <= self._fill(n) else None
+    def line_of(self, pos): return -pos
+    def total_known(self): return len(self._back) if self._done else None
+    def total(self): self._fill(MERGE_SCROLLBACK); return len(self._back)
+    def window(self, skip, n, pan=0):
+        self._fill(skip + n); return [_pan(line, pan) for line in reversed(self._back[skip:skip + n])]
+    def scan(self, rx, start, end, backward, alive, progress):
+        """The merged line matching rx nearest to line -start: older ones if backward, else that one and newer."""
+        n = -start + (1 if backward else 0)
+        while alive() and 1 <= n <= self._fill(n):
+            if rx.search(self._back[n - 1].encode()): return -n, -n + 1
+            n += 1 if backward else -1
+            if n % 10000 == 0: progress(n / max(len(self._back), 1) if backward else 1 - n / max(-start, 1))
+        return None
+
+class MergeTile(TailTile):
+    """Every file tile's lines in one stream ordered by timestamp, tagged '[n] ' with their tile number.
+
+    Live, each source is followed by offset and newly appended lines are k-way merged (heapq.merge) onto
+    the end, so history is never re-sorted. Scroll mode merges the sources' indexes backwards on demand."""
+    merged = True
+    def __init__(self, sources, lines=10, pattern=DEFAULT_TIMESTAMP):
+        super().__init__('merged timeline', lines)
+        self._rx, self._follow, self._nl = re.compile(pattern), {}, 0  # _follow: num -> [ident, offset, partial, last timestamp]
+        self._sources, self._sniffed = list(sources), None  # sniffed for compression on the reader thread, never the UI's
+    @property
+    def sources(self):
+        if self._sniffed is None: self._sniffed = [(num, path) for num, path in self._sources if not _compression(path)]  # gzip tails can't be followed
+        return self._sniffed
+    def _stamp(self, num, data, state):
+        out = []
+        for line in _lines(data):
+            if m := self._rx.search(line): state[3] = _ts_key(m)
+            out.append((state[3], num, line))
+        return out
+    def update(self):
+        if self.frozen: return self._update_frozen()
+        batches = []
+        for num, path in self.sources:
+            try:
+                with open(path, 'rb') as f:
+                    st, state = os.fstat(f.fileno()), self._follow.get(num)
+                    if state is None or state[0] != (st.st_dev, st.st_ino) or not 0 <= st.st_size - state[1] <= FOLLOW_MAX_READ:
+                        state = self._follow[num] = [(st.st_dev, st.st_ino), st.st_size, b'', '']
+                        data = _read_tail(f, self.lines, st.st_size)
+                    elif st.st_size == state[1]: continue
+                    else: f.seek(state[1]); data = f.read(st.st_size - state[1]); state[1] += len(data)
+            except OSError: continue
+            data = state[2] + data
+            nl = max(data.rfind(b'\n'), data.rfind(b'\r', 0, len(data) - 1)) + 1
+            state[2] = data[nl:]
+            if nl: batches.append(self._stamp(num, data[:nl], state))
+        if not batches: return False
+        merged = [f"[{num}] {line}\n" for _, num, line in heapq.merge(*batches, key=lambda t: t[0])]
+        self._push(''.join(merged).encode()); self._nl += len(merged); self.appended += len(merged)
+        return True
+    def reset(self): self._follow, self._content = {}, LineStore(max(self.lines, 0))  # next update re-reads every tail
+    def resize(self, lines):
+        if lines != self.lines: self.lines = lines; self.reset(); self.frozen or self.update()
+    def set_filter(self, pattern): super().set_filter(pattern); self.reset(); self.update()
+    def get_content(self):
+        """Lines panned after their tag, so the tile number (and its colour) stays in view."""
+        return [tag + sep + _pan(rest, self.h_scroll) for tag, sep, rest in (line.partition('] ') for line in self._view(0))]
+    def _open_index(self): return MergeIndex([(num, _open_index(path)) for num, path in self.sources], self._rx)
+
+class TileReader:
+    """Owns a TailTile on a daemon thread so file I/O never blocks the UI thread.
+
+    Commands are queued to the thread and run in order; after each batch the reader publishes an
+    immutable TileSnapshot as (idx, snapshot) on `results` and pokes `wake_fd`. It exposes the
+    attributes TileRenderer reads, so it can stand in for the tile. A hung read (say a dead NFS
+    mount) only stalls this tile's thread, which `stalled()` reports after `timeout` seconds."""
+    def __init__(self, tile, idx, results, wake_fd, timeout=2.0, min_interval=0.0):
+        self.tile, self.idx, self.results, self.wake_fd, self.timeout = tile, idx, results, wake_fd, timeout
+        self.filepath, self.lines, self.frozen, self._h_scroll, self.wrap = tile.filepath, tile.lines, tile.frozen, 0, False
+        self.chain, self.merged, self.fed, self.taken = tile.chain, tile.merged, 0, 0  # fed is only written by the UI thread, taken by this one
+        self.snap, self.busy_since, self._cmds, self._update_queued = TileSnapshot(()), None, queue.SimpleQueue(), False
+        # Reads of a flooding file are spaced min_interval apart (one frame): drawing faster is wasted work
+        self.min_interval, self._last_update, self._published, self._samples = min_interval, 0.0, None, deque()
+        tile.on_done = self.update
+        self._thread = threading.Thread(target=self._run, daemon=True, name=f"tailgrid-reader-{idx}"); self._thread.start()
+    def _submit(self, name, *args): self._cmds.put((name, args))
+    def update(self):
+        if not self._update_queued: self._update_queued = True; self._submit('update')
+        return False  # the result arrives later as a snapshot
+    def reset(self): self._submit('reset'); self._update_queued = True; self._submit('update')
+    def resize(self, lines):
+        if lines != self.lines: self.lines = lines; self._submit('resize', lines)
+    def freeze(self): self.frozen = True; self._submit('freeze')
+    def unfreeze(self): self.frozen = False; self._submit('unfreeze')
+    def scroll(self, delta): self._submit('scroll', delta)
+    def scroll_top(self): self._submit('scroll_top')
+    def scroll_bottom(self): self._submit('scroll_bottom')
+    def set_visible(self, visible): self._submit('set_visible', visible)
+    def find(self, pattern, backward=True): self.frozen = True; self._submit('find', pattern, backward)
+    def find_next(self, backward=True): self._submit('find_next', backward)
+    def cancel_find(self): self._submit('cancel_find')
+    def set_filter(self, pattern): self._submit('set_filter', pattern)
+    def stop(self): self._submit('stop')  # ends the thread once queued commands are done (the merge view closing)
+    def save(self):
+        """Ask the thread for the tile's session_state(); returns the queue it arrives on."""
+        box = queue.SimpleQueue(); self._submit('save', box); return box
+    @property
+    def h_scroll(self): return self._h_scroll
+    @h_scroll.setter
+    def h_scroll(self, value):  # the tile pans as it materializes lines, so long lines are never decoded in full
+        if value != self._h_scroll: self._h_scroll = value; self._submit('pan', value)
+    def feed(self, data): self.fed += len(data); self._submit('feed', data)
+    def exited(self, status, restart=None): self._submit('exited', status, restart)
+    def apply(self, reset, data, total, binary): self._submit('apply', reset, data, total, binary)
+    @property
+    def pending(self): return self.fed - self.taken  # pipe bytes queued but not yet taken by a CommandTile
+    def retarget(self, filepath):
+        """Point this slot at another file (directory follow mode); view state starts over."""
+        self.filepath, self.frozen, self.h_scroll, self.wrap, self.snap = filepath, False, 0, False, TileSnapshot(())
+        self._samples.clear(); self._submit('retarget', filepath); self.reset()
+    def _retarget(self, filepath):
+        old, self.tile = self.tile, TailTile(filepath, self.tile.lines)
+        self.tile.on_done, self.tile.visible = self.update, old.visible
+        if old._index: old._index.close()
+    @property
+    def unseen(self): return self.snap.unseen
+    @property
+    def filter(self): return self.snap.filter
+    def search_state(self): return self.snap.search
+    def receive(self, snap, now=None):
+        """Adopt a snapshot from the results queue (UI thread) and sample its line counter for rate()."""
+        now = now or time.monotonic(); self.snap = snap; self._samples.append((now, snap.appended))
+        self._trim(now)
+    def _trim(self, now):  # keep one sample at or before the window start as the baseline
+        while len(self._samples) > 1 and self._samples[1][0] <= now - RATE_WINDOW: self._samples.popleft()
+    def rate(self, now=None):
+        """Lines appended per second over roughly the last RATE_WINDOW seconds; drops to 0 once idle."""
+        now = now or time.monotonic(); self._trim(now)
+        if len(self._samples) < 2: return 0.0
+        t0, n0 = self._samples[0]
+        return (self._samples[-1][1] - n0) / max(now - t0, RATE_WINDOW)
+    def stalled(self, now=None):
+        started = self.busy_since
+        return started is not None and (now or time.monotonic()) - started > self.timeout
+    @property
+    def scroll_offset(self): return self.snap.scroll_offset
+    def get_content(self): return self.snap.lines  # an immutable tuple: no copy per frame
+    def total_lines(self): return self.snap.total
+    def frozen_total(self): return self.snap.frozen_total
+    def _run(self):
+        while True:
+            batch = [self._cmds.get()]
+            wait = self._last_update + self.min_interval - time.monotonic()
+            if wait > 0 and batch[0][0] == 'update':  # any other command (a keypress) cuts the wait short
+                try: batch.append(self._cmds.get(timeout=wait))
+                except queue.Empty: pass
+            while True:
+                try: batch.append(self._cmds.get_nowait())
+                except queue.Empty: break
+            self.busy_since = time.monotonic()
+            try:
+                for name, args in batch:
+                    if name == 'update':
+                        if not self._update_queued: continue  # coalesced into an earlier update in this batch
+                        self._update_queued, self._last_update = False, time.monotonic()
+                    if name == 'feed': self.taken += len(args[0])
+                    if name == 'stop':
+                        self.tile.cancel_find()
+                        if self.tile._index: self.tile._index.close()
+                        return
+                    if name == 'retarget': self._retarget(*args)
+                    elif name == 'save': args[0].put(self.tile.session_state())
+                    else: getattr(self.tile, name)(*args)
+                snap = self.tile.snapshot()
+            except Exception: snap = self._published  # keep the last good frame; the next event retries
+            self.busy_since = None
+            if snap != self._published:
+                self._published = snap; self.results.put((self.idx, snap))
+                try: os.write(self.wake_fd, b'\0')
+                except (BlockingIOError, OSError): pass
+
+TAB_WIDTH, WRAP_CACHE = 8, 4096  # tab stops; (line, width) layouts memoized across frames
+
+def _char_width(ch):
+    """Terminal columns for one character: 2 for East Asian wide/fullwidth (and ^X controls), 0 for combining marks."""
+    if ch < ' ' or ch == '\x7f': return 2  # curses draws control characters as ^X
+    if unicodedata.combining(ch) or unicodedata.category(ch) in ('Mn', 'Me', 'Cf'): return 0
+    return 2 if unicodedata.east_asian_width(ch) in ('W', 'F') else 1
+
+def _width(text): return len(text) if text.isascii() and text.isprintable() else sum(map(_char_width, text.expandtabs(TAB_WIDTH)))
+
+@functools.lru_cache(maxsize=WRAP_CACHE)
+def _wrap(line, width):
+    """Segments of line at most `width` columns wide, tabs expanded to spaces; memoized per (line, width),
+    so a redraw only lays out lines it has not seen. The first segment is the line cut to fit."""
+    if line.isascii() and line.isprintable(): return tuple(line[i:i + width] for i in range(0, len(line), max(width, 1))) or ('',)
+    out, seg, col, pos = [], [], 0, 0  # pos: column within the whole line, for tab stops
+    for ch in line:
+        for c in ' ' * (TAB_WIDTH - pos % TAB_WIDTH) if ch == '\t' else ch:
+            cw = _char_width(c)
+            if col + cw > width and seg: out.append(''.join(seg)); seg, col = [], 0
+            seg.append(c); col += cw; pos += cw
+    out.append(''.join(seg))
+    return tuple(out)
+
+@functools.lru_cache(maxsize=WRAP_CACHE)
+def _wrap_runs(line, width, spans):
+    """_wrap(line, width) with each segment split into (text, style) runs, styles taken from spans
+    ((start, end, style), ...) over line; unstyled text has style None."""
+    segments = _wrap(line, width)
+    if not spans: return tuple(((seg, None),) for seg in segments)
+    styles = [None] * len(line)
+    for start, end, style in spans: styles[start:end] = [style] * (end - start)
+    if '\t' in line:  # the spaces a tab expands to share its style
+        expanded, pos = [], 0
+        for ch, style in zip(line, styles):
+            n = TAB_WIDTH - pos % TAB_WIDTH if ch == '\t' else 1
+            expanded += [style] * n; pos += n if ch == '\t' else _char_width(ch)
+        styles = expanded
+    out, i = [], 0
+    for seg in segments:
+        runs, start = [], 0
+        for j in range(1, len(seg) + 1):
+            if j == len(seg) or styles[i + j] != styles[i + start]: runs.append((seg[start:j], styles[i + start])); start = j
+        out.append(tuple(runs) or (('', None),)); i += len(seg)
+    return tuple(out)
+
+HIGHLIGHT_CACHE = 8192  # lines whose highlight spans are memoized; a redraw only scans lines it has not seen
+
+HIGHLIGHT_FLAGS = re.compile(r'\(\?([aiLmsux]+)\)')  # a leading global flag group, made scoped so rules can be joined
+HIGHLIGHT_BACKREF = re.compile(r'\\[1-9]|\(\?\(\d')  # numbered backreferences point at the wrong group once joined
+
+class Highlighter:
+    """The config's highlight rules ({regex: style}) compiled into one alternation of named groups, so each
+    line is scanned once however many rules there are; earlier rules win where matches start together.
+
+    A leading '(?i)' becomes a scoped '(?i:...)'; rules using numbered backreferences are skipped. Should
+    the alternation still not compile (say two rules name the same group), each rule is scanned on its own."""
+    def __init__(self, rules):
+        self.styles, parts = [], []
+        for pattern, style in (rules or {}).items():
+            flags = ''
+            while m := HIGHLIGHT_FLAGS.match(pattern): flags, pattern = flags + m[1], pattern[m.end():]
+            if flags: pattern = f"(?{flags}:{pattern})"
+            try:
+                if HIGHLIGHT_BACKREF.search(re.sub(r'\\\\', '', pattern)): continue
+                parts.append(re.compile(pattern))
+            except re.error: continue  # a bad rule is skipped rather than disabling the rest
+            self.styles.append(style)
+        try: self._rx, self._rxs = re.compile('|'.join(f"(?P<h{i}>{rx.pattern})" for i, rx in enumerate(parts))) if parts else None, None
+        except re.error: self._rx, self._rxs = None, parts
+        self.spans = functools.lru_cache(maxsize=HIGHLIGHT_CACHE)(self._spans)
+    def _spans(self, line):
+        """((start, end, rule index), ...) for the rule matches in line, memoized per line."""
+        if self._rxs:  # one scan per rule, overlaps resolved as the alternation would
+            spans, end = [], 0
+            for start, i, stop in sorted((m.start(), i, m.end()) for i, rx in enumerate(self._rxs) for m in rx.finditer(line) if m.end() > m.start()):
+                if start >= end: spans.append((start, stop, i)); end = stop
+            return tuple(spans)
+        if self._rx is None: return ()
+        return tuple((m.start(), m.end(), int(m.lastgroup[1:])) for m in self._rx.finditer(line) if m.end() > m.start())
+
+SGR_RESET = (None, None, 0)  # (foreground, background, attributes): colours are ANSI numbers 0-255, None = default
+SGR_ON = {1: curses.A_BOLD, 2: curses.A_DIM, 3: getattr(curses, 'A_ITALIC', 0), 4: curses.A_UNDERLINE, 5: curses.A_BLINK, 7: curses.A_REVERSE}
+SGR_OFF = {22: curses.A_BOLD | curses.A_DIM, 23: getattr(curses, 'A_ITALIC', 0), 24: curses.A_UNDERLINE, 25: curses.A_BLINK, 27: curses.A_REVERSE}
+
+def _sgr(state, params):
+    """Apply one SGR sequence's parameters (e.g. '1;31', '38;5;208') to a (fg, bg, attrs) state."""
+    fg, bg, attr = state
+    codes, i = [int(p) if p.isdigit() else 0 for p in params.replace(':', ';').split(';')], 0
+    while i < len(codes):
+        c = codes[i]
+        if c == 0: fg, bg, attr = SGR_RESET
+        elif c in SGR_ON: attr |= SGR_ON[c]
+        elif c in SGR_OFF: attr &= ~SGR_OFF[c]
+        elif 30 <= c <= 37 or 90 <= c <= 97: fg = c - 30 if c < 90 else c - 82
+        elif 40 <= c <= 47 or 100 <= c <= 107: bg = c - 40 if c < 100 else c - 92
+        elif c in (39, 49): fg, bg = (None, bg) if c == 39 else (fg, None)
+        elif c in (38, 48):  # 256-colour (5;n) or truecolor (2;r;g;b), the latter snapped to the 6x6x6 cube
+            mode, color = codes[i + 1] if i + 1 < len(codes) else None, None
+            if mode == 5 and i + 2 < len(codes): color, i = codes[i + 2] % 256, i + 2
+            elif mode == 2 and i + 4 < len(codes): color, i = 16 + sum(min(v, 255) * 6 // 256 * k for v, k in zip(codes[i + 2:i + 5], (36, 6, 1))), i + 4
+            fg, bg = (color, bg) if c == 38 else (fg, color)
+        i += 1
+    return fg, bg, attr
+
+@functools.lru_cache(maxsize=HIGHLIGHT_CACHE)
+def _ansi(line):
+    """(visible text, SGR spans ((start, end, (fg, bg, attrs)), ...)) of a line with ANSI escape sequences,
+    memoized per line; sequences other than SGR are dropped."""
+    if '\x1b' not in line: return line, ()
+    text, spans, state, pos, n = [], [], SGR_RESET, 0, 0
+    for m in [*ANSI_ESCAPE.finditer(line), None]:
+        chunk = line[pos:m.start() if m else len(line)]
+        if chunk:
+            text.append(chunk)
+            if state != SGR_RESET: spans.append((n, n + len(chunk), state))
+            n += len(chunk)
+        if m: pos = m.end(); state = _sgr(state, m[1]) if m[2] == 'm' else state
+    return ''.join(text), tuple(spans)
+
+def _fmt_rate(rate):
+    if rate < 1: return ""
+    return f"{rate:.0f}/s" if rate < 1000 else f"{rate / 1000:.1f}k/s" if rate < 1e6 else f"{rate / 1e6:.1f}M/s"
+
+MERGE_TAG, MERGE_PAIR = re.compile(r'\[(\d+)\] '), 10  # merged lines are coloured by tile number from pair 10 on
+MERGE_COLORS = (curses.COLOR_CYAN, curses.COLOR_GREEN, curses.COLOR_YELLOW, curses.COLOR_MAGENTA, curses.COLOR_BLUE, curses.COLOR_RED)
+def _fit_color(n):
+    """An ANSI colour number the terminal can show: bright and 256-colour values fall back to the basic 8."""
+    if n < curses.COLORS: return n
+    if n < 16: return n - 8
+    if n >= 232: return curses.COLOR_WHITE if n >= 244 else curses.COLOR_BLACK  # greyscale ramp
+    r, g, b = (n - 16) // 36, (n - 16) // 6 % 6, (n - 16) % 6
+    return (r >= 3) | (g >= 3) << 1 | (b >= 3) << 2
+
+COLOR_NAMES = {'black': curses.COLOR_BLACK, 'red': curses.COLOR_RED, 'green': curses.COLOR_GREEN, 'yellow': curses.COLOR_YELLOW,
+               'blue': curses.COLOR_BLUE, 'magenta': curses.COLOR_MAGENTA, 'cyan': curses.COLOR_CYAN, 'white': curses.COLOR_WHITE}
+STYLE_ATTRS = {'bold': curses.A_BOLD, 'dim': curses.A_DIM, 'underline': curses.A_UNDERLINE, 'reverse': curses.A_REVERSE,
+               'italic': getattr(curses, 'A_ITALIC', 0), 'blink': curses.A_BLINK}
+PAIR_BASE = 20  # colour pairs for highlight styles are allocated from here on, as they are first used
 
 class TileRenderer:
-    def __init__(self, stdscr, tiles, layout, show_full_path=False, reasons=None):
+    """Draws each tile into its own curses window and repaints only the tiles whose content, focus or mode changed."""
+    def __init__(self, stdscr, tiles, layout, show_full_path=False, reasons=None, highlight=None):
         self.stdscr, self.tiles, self.rows, self.cols = stdscr, tiles, layout[0], layout[1]
-        self.focused, self.show_full_path, self.reasons = 0, show_full_path, reasons or {}
-    def render(self):
-        self.stdscr.clear(); h, w = self.stdscr.getmaxyx()
-        ft = self.tiles[self.focused] if self.focused < len(self.tiles) else None
-        focused_reason = self.reasons.get(ft.filepath) if ft else None
-        footer_lines = 2 if focused_reason else 1
-        tile_h, tile_w = (h - footer_lines) // self.rows, w // self.cols
-        content_h = tile_h - 2
-        for tile in self.tiles:
-            if tile.lines != content_h: tile.lines, tile._last_stat = content_h, (0, 0)
+        self.focused, self.show_full_path, self.reasons, self.notice = 0, show_full_path, reasons or {}, None  # notice: footer line when no reason
+        self.counting = False  # status bar shows a placeholder until the focused tile's count lands
+        self.prompt, self._hl = None, (None, None)  # text being typed after / or f; (pattern, compiled) for highlighting
+        self._geom, self._wins, self._footer, self._drawn, self._status = None, [], None, [], None
+        self._wraps = None  # wrap flags of the shown tiles; a toggle or resize drops the _wrap memo
+        self.hud, self._hud_size = None, None  # lines of the performance overlay ('p'), drawn over the top-right tiles
         curses.init_pair(3, curses.COLOR_CYAN, curses.COLOR_BLACK)
         curses.init_pair(4, curses.COLOR_GREEN, curses.COLOR_BLACK)
         curses.init_pair(5, curses.COLOR_YELLOW, curses.COLOR_BLACK)
         curses.init_pair(6, curses.COLOR_MAGENTA, curses.COLOR_BLACK)
-        for i, tile in enumerate(self.tiles): self._draw_tile(tile, (i // self.cols) * tile_h, (i % self.cols) * tile_w, tile_h, tile_w, i)
-        hscroll_str = f" +{ft.h_scroll}" if ft and ft.h_scroll > 0 else ""
-        if ft and ft.frozen:
-            pos = len(ft._frozen_content) - ft.scroll_offset
-            status = f" SCROLL [{self.focused+1}] line {pos}/{len(ft._frozen_content)}{hscroll_str} │ ↑↓: Scroll │ ←→: Pan │ w: Wrap │ Enter: Exit │ q: Quit "
-        else:
-            total = ft.total_lines() if ft else 0
-            status = f" [{self.focused+1}] {total} lines{hscroll_str} │ w: Wrap │ </>: Pan │ Enter: Scroll │ ←→↑↓: Nav │ q: Quit "
+        for n, color in enumerate(MERGE_COLORS): curses.init_pair(MERGE_PAIR + n, color, curses.COLOR_BLACK)
+        self._pairs, self.highlighter = {}, Highlighter(highlight)
+        self._rule_attrs, self._sgr_attrs = [self._style_attr(style) for style in self.highlighter.styles], {}
+    def _pair(self, fg, bg=curses.COLOR_BLACK):
+        """Colour pair for fg on bg, allocated on first use; 0 (default colours) once the terminal runs out."""
+        if (fg, bg) not in self._pairs:
+            n = PAIR_BASE + len(self._pairs)
+            if n >= curses.COLOR_PAIRS: return 0
+            curses.init_pair(n, fg, bg); self._pairs[fg, bg] = n
+        return curses.color_pair(self._pairs[fg, bg])
+    def _attr(self, style):
+        """Curses attribute for a run's style: a highlight rule index, or an ANSI (fg, bg, attrs) state."""
+        if isinstance(style, int): return self._rule_attrs[style]
+        if style not in self._sgr_attrs:
+            fg, bg, attr = style
+            if fg is not None and 8 <= fg < 16 and curses.COLORS < 16: attr |= curses.A_BOLD  # bright without 16 colours
+            if fg is not None or bg is not None:
+                attr |= self._pair(_fit_color(curses.COLOR_WHITE if fg is None else fg), _fit_color(curses.COLOR_BLACK if bg is None else bg))
+            self._sgr_attrs[style] = attr
+        return self._sgr_attrs[style]
+    def _style_attr(self, style):
+        """Curses attribute for a highlight style such as 'red', 'bold yellow' or 'dim'; unknown words are ignored."""
+        attr = 0
+        for word in str(style).lower().split():
+            if word in COLOR_NAMES: attr |= self._pair(COLOR_NAMES[word])
+            else: attr |= STYLE_ATTRS.get(word, 0)
+        return attr
+    def invalidate(self): self._geom = None  # rebuild the windows and repaint everything on the next render
+    # More tiles than rows x cols are split into pages; only the focused tile's page is on screen
+    @property
+    def page_size(self): return self.rows * self.cols
+    @property
+    def page(self): return self.focused // self.page_size
+    @property
+    def pages(self): return max(1, -(-len(self.tiles) // self.page_size))
+    def visible(self): return range(self.page * self.page_size, min((self.page + 1) * self.page_size, len(self.tiles)))
+    def flip(self, delta):
+        """Move focus to the same grid slot on another page (clamped to the last tile)."""
+        page = (self.page + delta) % self.pages
+        self.focused = min(page * self.page_size + self.focused % self.page_size, len(self.tiles) - 1)
+    def move(self, step):
+        """Move focus by step slots, wrapping within the current page."""
+        start, n = self.page * self.page_size, len(self.visible())
+        self.focused = start + (self.focused - start + step) % n
+    def _layout(self, h, w, footer_lines):
+        geom = (h, w, footer_lines, self.rows, self.cols, len(self.tiles), self.page)
+        if geom == self._geom: return
+        self._geom, tile_h, tile_w = geom, (h - footer_lines) // self.rows, w // self.cols
+        _wrap.cache_clear(); _wrap_runs.cache_clear()
+        self.stdscr.erase(); self.stdscr.noutrefresh()  # blanks the margins no window covers
+        def newwin(*args):
+            try: return curses.newwin(*args)
+            except curses.error: return None  # terminal too small for this tile
+        self._wins = [newwin(tile_h, tile_w, (j // self.cols) * tile_h, (j % self.cols) * tile_w) for j in range(len(self.visible()))]
+        self._footer, self._drawn, self._status = newwin(footer_lines, w, h - footer_lines, 0), [None] * len(self._wins), None
+    def _draw_hud(self, w):
+        if not (size := self._hud_size): return
         try:
-            if focused_reason:
-                reason_line = f" Claude: {focused_reason}"
-                self.stdscr.addstr(h - 2, 0, reason_line[:w-1].ljust(w-1), curses.color_pair(4))
-            self.stdscr.addstr(h - 1, 0, status[:w-1].ljust(w-1), curses.A_REVERSE)
+            win = curses.newwin(*size, 0, w - size[1])
+            win.box()
+            for row, text in enumerate(self.hud): win.addstr(1 + row, 2, text[:size[1] - 4])
+            win.noutrefresh()
         except curses.error: pass
-        self.stdscr.refresh()
-    def _draw_tile(self, tile, y, x, h, w, idx):
+    def _page_bar(self):
+        """' │ pg 2/5 1:+120 4:+8' - the current page plus off-screen pages with lines not yet seen."""
+        if self.pages == 1: return ""
+        unseen = [0] * self.pages
+        for i, tile in enumerate(self.tiles): unseen[i // self.page_size] += getattr(tile, 'unseen', 0)
+        badges = "".join(f" {p+1}:+{n}" for p, n in enumerate(unseen) if n and p != self.page)
+        return f" │ pg {self.page+1}/{self.pages}{badges} [/]"
+    def render(self):
+        h, w = self.stdscr.getmaxyx()
+        ft = self.tiles[self.focused] if self.focused < len(self.tiles) else None
+        reason = self.reasons.get(ft.filepath) if ft else None
+        focused_reason = f" Claude: {reason}" if reason else f" {self.notice}" if self.notice else None
+        footer_lines = 2 if focused_reason else 1
+        hud_size = (len(self.hud) + 2, min(w, max(map(len, self.hud)) + 4)) if self.hud else None
+        if hud_size != self._hud_size:  # the HUD shrank or closed: repaint what it covered
+            if self._hud_size: self.invalidate()
+            self._hud_size = hud_size
+        self._layout(h, w, footer_lines)
+        content_h = (h - footer_lines) // self.rows - 2
+        wraps = tuple(self.tiles[i].wrap for i in self.visible())
+        if wraps != self._wraps: self._wraps = wraps; _wrap.cache_clear(); _wrap_runs.cache_clear()
+        for j, i in enumerate(self.visible()):
+            tile, win = self.tiles[i], self._wins[j]
+            tile.resize(content_h)
+            content, stalled = tile.get_content(), hasattr(tile, 'stalled') and tile.stalled()
+            rate = _fmt_rate(tile.rate()) if hasattr(tile, 'rate') else ""
+            search = tile.search_state() if tile.frozen else None
+            key = (tuple(content), i == self.focused, tile.frozen, tile.wrap, tile.h_scroll, tile.filepath, stalled, rate,
+                   search and search[0], tile.filter)
+            if win is None or key == self._drawn[j]: continue
+            self._drawn[j] = key; win.erase(); self._draw_tile(win, tile, content, i, stalled, rate, self._highlight(search and search[0]))
+            win.noutrefresh()
+        self._draw_hud(w)
+        hscroll_str = f" +{ft.h_scroll}" if ft and ft.h_scroll > 0 else ""
+        if self.prompt is not None:
+            status = f" {self.prompt}█ │ Enter: Apply │ Esc: Cancel "
+        elif ft and ft.frozen:
+            total, search = ft.frozen_total(), ft.search_state()
+            where = f"line {total - ft.scroll_offset}/{total}" if total is not None else f"{ft.scroll_offset} lines above end"
+            if not search: found = ""
+            elif search[1] is not None: found = f" │ /{search[0]} {search[1]:.0%} Esc: Stop"
+            else: found = f" │ /{search[0]}{': not found' if search[2] else ''} n/N"
+            status = f" SCROLL [{self.focused+1}] {where}{hscroll_str}{found} │ ↑↓: Scroll │ /: Find │ ←→: Pan │ w: Wrap │ Enter: Exit │ q: Quit "
+        else:
+            total = ft.total_lines() if ft else 0; self.counting = total is None
+            status = f" [{self.focused+1}] {'counting…' if total is None else f'{total} lines'}{hscroll_str}{self._page_bar()} │ w: Wrap │ </>: Pan │ Enter: Scroll │ /: Find │ f: Filter │ m: Merge │ ←→↑↓: Nav │ q: Quit "
+        if self._footer is not None and (status, focused_reason) != self._status:
+            self._status = (status, focused_reason); self._footer.erase()
+            try:
+                if focused_reason: self._footer.addstr(0, 0, focused_reason[:w-1].ljust(w-1), curses.color_pair(4))
+                self._footer.addstr(footer_lines - 1, 0, status[:w-1].ljust(w-1), curses.A_REVERSE)
+            except curses.error: pass
+            self._footer.noutrefresh()
+        curses.doupdate()
+    def _highlight(self, pattern):
+        """The search pattern compiled for str lines, cached across frames."""
+        if pattern != self._hl[0]:
+            try: self._hl = (pattern, re.compile(pattern, re.MULTILINE) if pattern else None)
+            except re.error: self._hl = (pattern, None)
+        return self._hl[1]
+    def _draw_tile(self, win, tile, content, idx, stalled=False, rate="", hl=None):
+        h, w = win.getmaxyx()
         try:
             is_focused = idx == self.focused
             if tile.frozen:
@@ -181,102 +1562,741 @@ class TileRenderer:
                 border_attr = curses.color_pair(4) | curses.A_BOLD
             else:
                 border_attr = curses.A_DIM
-            frozen_mark = " ❄" if tile.frozen else ""
-            wrap_mark = " ↩" if tile.wrap else ""
-            name = tile.filepath if self.show_full_path else os.path.basename(tile.filepath)
+            frozen_mark = (" ❄" if tile.frozen else "") + (" ⛓" if tile.chain else "")
+            wrap_mark = (" ↩" if tile.wrap else "") + (f" &{tile.filter}" if tile.filter else "") + (" ⏳stalled" if stalled else "") + (f" {rate}" if rate else "")
+            name = tile.filepath if self.show_full_path or tile.filepath.startswith('cmd:') else os.path.basename(tile.filepath)
             max_len = w - 11
             name = "..." + name[-(max_len-3):] if len(name) > max_len else name
-            header = f"┌─ {idx+1}:{name}{frozen_mark}{wrap_mark} " + "─" * (w - len(name) - len(frozen_mark) - len(wrap_mark) - 8) + "┐"
-            self.stdscr.addstr(y, x, header[:w], border_attr)
-            content = tile.get_content()
-            content_w = w - 3  # Width available for content (minus borders and padding)
+            header = f"┌─ {idx+1}:{name}{frozen_mark}{wrap_mark} " + "─" * (w - _width(f"{name}{frozen_mark}{wrap_mark}") - 8) + "┐"
+            win.addstr(0, 0, _wrap(header, w)[0], border_attr)
+            content_w = w - 4  # Columns available for content (minus borders and padding)
             # Build display lines (with wrapping or horizontal scroll)
             display_lines = []
             for line in content:
-                if tile.wrap:
-                    # Wrap long lines
-                    if len(line) <= content_w:
-                        display_lines.append(line)
-                    else:
-                        for i in range(0, len(line), content_w):
-                            display_lines.append(line[i:i+content_w])
-                else:
-                    # Apply horizontal scroll
-                    display_lines.append(line[tile.h_scroll:] if tile.h_scroll < len(line) else "")
+                line, sgr = _ansi(line)  # ANSI colours become runs and take no columns
+                attr = curses.color_pair(5) | curses.A_BOLD if hl and hl.search(line) else 0  # search matches
+                if not attr and tile.merged and (m := MERGE_TAG.match(line)): attr = curses.color_pair(MERGE_PAIR + (int(m[1]) - 1) % len(MERGE_COLORS))
+                # by display width, with highlight rules over ANSI colours as runs; the tile already applied h_scroll. A search match wins.
+                segments = _wrap_runs(line, content_w, () if hl and attr else sgr + self.highlighter.spans(line))
+                if tile.wrap: display_lines.extend((seg, attr) for seg in segments[:h - 2])
+                else: display_lines.append((segments[0], attr))
             # Take last N lines that fit
             display_lines = display_lines[-(h-2):]
             for row in range(h - 2):
-                if y + 1 + row >= y + h - 1: break
-                self.stdscr.addstr(y + 1 + row, x, "│", border_attr)
-                if row < len(display_lines): self.stdscr.addstr(y + 1 + row, x + 1, f" {display_lines[row]}"[:w-3])
-                self.stdscr.addstr(y + 1 + row, x + w - 1, "│", border_attr)
-            self.stdscr.addstr(y + h - 1, x, "└" + "─" * (w - 2) + "┘", border_attr)
+                win.addstr(1 + row, 0, "│", border_attr)
+                if row < len(display_lines):
+                    runs, attr = display_lines[row]; x = 2
+                    win.addstr(1 + row, 1, " ")
+                    for text, style in runs:
+                        win.addstr(1 + row, x, text, attr if style is None else self._attr(style)); x += _width(text)
+                win.addstr(1 + row, w - 1, "│", border_attr)
+            win.addstr(h - 1, 0, "└" + "─" * (w - 2), border_attr)
+            win.insstr(h - 1, w - 1, "┘", border_attr)  # addstr into the last cell would fail moving the cursor past it
         except curses.error: pass
 
-def run_viewer(filepaths, layout, initial_lines, show_full_path=None, reasons=None):
-    save_session(filepaths, layout, initial_lines)
+PERF_TIMED, PERF_HUD_INTERVAL = ('update', 'freeze', 'total_lines', 'render', '_draw_tile'), 1.0  # timed methods; seconds per HUD refresh
+
+def _subclasses(cls): return [c for sub in cls.__subclasses__() for c in (sub, *_subclasses(sub))]
+
+def _thread_io(tid):
+    """(bytes read, read and write syscalls) so far by one of our threads, from /proc; None where there is none."""
+    try: rw = dict(line.split(': ') for line in Path(f'/proc/self/task/{tid}/io').read_text().splitlines())
+    except (OSError, ValueError): return None
+    return int(rw['rchar']), int(rw['syscr']) + int(rw['syscw'])
+
+class Perf:
+    """Hot-path timers behind the HUD ('p') and --profile. install() wraps TailTile.update/freeze/total_lines
+    (and the subclasses' overrides), TileRenderer.render/_draw_tile and curses.doupdate, the terminal output;
+    uninstall() puts the originals back, so while neither is on nothing is timed and nothing costs anything."""
+    def __init__(self, profile=None):
+        self.stats, self.profile, self.next_hud = {}, profile, 0.0  # stats: (id(obj), name) -> [calls, seconds]
+        self._saved, self._depth, self._last, self._frames, self._hud_base = [], threading.local(), ({}, {}), deque(), None
+    def install(self):
+        for cls in (TileRenderer, TailTile, *_subclasses(TailTile)):
+            for name in PERF_TIMED:
+                if name in vars(cls): self._saved.append((cls, name, vars(cls)[name])); setattr(cls, name, self._timed(name, vars(cls)[name]))
+        self._saved.append((curses, 'doupdate', curses.doupdate)); curses.doupdate = self._timed('output', curses.doupdate, method=False)
+    def uninstall(self):
+        for owner, name, fn in reversed(self._saved): setattr(owner, name, fn)
+        self._saved = []
+    def _timed(self, name, fn, method=True):
+        stats, depth = self.stats, self._depth
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            if getattr(depth, name, False): return fn(*args, **kwargs)  # an override calling super(): timed once
+            setattr(depth, name, True); t = time.perf_counter()
+            try: return fn(*args, **kwargs)
+            finally:
+                setattr(depth, name, False)
+                entry = stats.setdefault((id(args[0]) if method else 0, name), [0, 0.0]); entry[0] += 1; entry[1] += time.perf_counter() - t
+        return timed
+    def _sample(self, tiles):
+        return {k: tuple(v) for k, v in list(self.stats.items())}, {id(t): _thread_io(t._thread.native_id) if hasattr(t, '_thread') else None for t in tiles}
+    @staticmethod
+    def _delta(old, new, tiles, renderer):
+        """Counters between two samples, as one record: frame, draw and output ms, then per tile."""
+        def d(key): c, s = new[0].get(key, (0, 0.0)); c0, s0 = old[0].get(key, (0, 0.0)); return c - c0, (s - s0) * 1e3
+        rec = {'frames': d((id(renderer), 'render'))[0], 'frame_ms': d((id(renderer), 'render'))[1],
+                  'draw_ms': d((id(renderer), '_draw_tile'))[1], 'output_ms': d((0, 'output'))[1], 'tiles': []}
+        for i, t in enumerate(tiles):
+            key = id(getattr(t, 'tile', t)); rw, rw0 = new[1].get(id(t)), old[1].get(id(t))
+            rec['tiles'].append({'tile': i + 1, 'path': t.filepath, 'updates': d((key, 'update'))[0], 'update_ms': d((key, 'update'))[1],
+                                 'freeze_ms': d((key, 'freeze'))[1], 'count_ms': d((key, 'total_lines'))[1],
+                                 'read_bytes': rw[0] - rw0[0] if rw and rw0 else None, 'syscalls': rw[1] - rw0[1] if rw and rw0 else None})
+        return rec
+    def frame(self, renderer, hud):
+        """Call after each render: appends that frame's counters to the profile, and returns the HUD
+        lines (refreshed every PERF_HUD_INTERVAL) if hud is on, else None."""
+        now, tiles = time.monotonic(), renderer.tiles
+        sample = self._sample(tiles)
+        self._frames.append(now)
+        while self._frames[0] < now - 1: self._frames.popleft()
+        if self.profile:
+            rec = self._delta(self._last, sample, tiles, renderer)
+            rec = {'t': round(now, 4), **{k: round(v, 3) if isinstance(v, float) else v for k, v in rec.items()}}
+            for tile in rec['tiles']: tile.update((k, round(v, 3)) for k, v in tile.items() if isinstance(v, float))
+            self.profile.write(json.dumps(rec) + "\n")
+        self._last = sample
+        if not hud: self._hud_base = None; return None
+        if self._hud_base is None: self._hud_base, self.next_hud = (now, sample), now + PERF_HUD_INTERVAL
+        if now < self.next_hud: return renderer.hud or ["measuring…"]
+        (t0, base), dt = self._hud_base, max(now - self._hud_base[0], 1e-9)
+        rec, self._hud_base, self.next_hud = self._delta(base, sample, tiles, renderer), (now, sample), now + PERF_HUD_INTERVAL
+        lines = [f"{len(self._frames)} fps  frame {rec['frame_ms'] / max(rec['frames'], 1):.1f}ms  draw {rec['draw_ms'] / max(rec['frames'], 1):.1f}  out {rec['output_ms'] / max(rec['frames'], 1):.1f}",
+                 "tile  upd/s  ms/s  syscalls/s   KB/s"]
+        for i in renderer.visible():
+            t = rec['tiles'][i]
+            rw = f"{t['syscalls'] / dt:10.0f} {t['read_bytes'] / dt / 1024:6.1f}" if t['syscalls'] is not None else f"{'-':>10} {'-':>6}"
+            lines.append(f"{i + 1:<4} {t['updates'] / dt:6.0f} {(t['update_ms'] + t['count_ms']) / dt:5.1f} {rw}")
+        return lines
+
+IN_MODIFY, IN_ATTRIB, IN_CLOSE_WRITE, IN_MOVED_FROM, IN_MOVED_TO, IN_CREATE, IN_DELETE, IN_Q_OVERFLOW = 0x2, 0x4, 0x8, 0x40, 0x80, 0x100, 0x200, 0x4000
+REMOTE_FS = {'nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', 'afs', 'ceph', 'fuse.sshfs', 'lustre', 'gpfs', '9p'}
+POLL_INTERVAL, POLL_MAX = 0.1, 2.0  # stat-polling fallback period in seconds, backed off up to POLL_MAX while idle
+
+def _is_remote_fs(path):
+    """True if path lives on a network filesystem, where inotify never sees writes made by other hosts."""
+    try: mounts = [line.split()[1:3] for line in Path('/proc/self/mounts').read_text().splitlines()]
+    except OSError: return False
+    best = max((m for m in mounts if path == m[0] or path.startswith(m[0].rstrip('/') + '/')), key=lambda m: len(m[0]), default=None)
+    return best is not None and best[1] in REMOTE_FS
+
+class InotifyWatcher:
+    """Directory watches through inotify(7) via ctypes; read() maps events back to the keys of changed files."""
+    MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    _EVENT = struct.Struct('iIII')  # wd, mask, cookie, len; followed by a NUL-padded name
+    def __init__(self):
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0: raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs, self._keys, self._dir_keys = {}, {}, {}  # wd -> directory, (directory, name) -> keys, wd -> keys
+    def add(self, path, key):
+        """Watch path's directory so rotation and creation are seen too; False means poll this path instead."""
+        d, name = os.path.split(os.path.realpath(path))
+        if _is_remote_fs(d): return False
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(d), self.MASK)
+        if wd < 0: return False
+        self._dirs[wd] = d; self._keys.setdefault((d, os.fsencode(name)), set()).add(key)
+        return True
+    def discard(self, path, key):
+        d, name = os.path.split(os.path.realpath(path))
+        self._keys.get((d, os.fsencode(name)), set()).discard(key)
+    def add_dir(self, directory, key):
+        """Watch every entry of directory: read() then reports (key, name) per changed name, (key, None) on overflow."""
+        d = os.path.realpath(directory)
+        if _is_remote_fs(d): return False
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(d), self.MASK)
+        if wd < 0: return False
+        self._dirs[wd] = d; self._dir_keys.setdefault(wd, set()).add(key)
+        return True
+    def read(self):
+        changed = set()
+        while True:
+            try: buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError: return changed
+            pos = 0
+            while pos < len(buf):
+                wd, mask, _, n = self._EVENT.unpack_from(buf, pos)
+                name, pos = buf[pos + 16:pos + 16 + n].rstrip(b'\0'), pos + 16 + n
+                if mask & IN_Q_OVERFLOW:
+                    changed.update(*self._keys.values()); changed.update((k, None) for keys in self._dir_keys.values() for k in keys)
+                else:
+                    changed.update(self._keys.get((self._dirs.get(wd), name), ()))
+                    changed.update((k, os.fsdecode(name)) for k in self._dir_keys.get(wd, ()))
+    def close(self): os.close(self.fd)
+
+def make_watcher():
+    """An InotifyWatcher where the kernel supports it, else None (callers fall back to stat polling)."""
+    try: return InotifyWatcher()
+    except (OSError, AttributeError): return None
+
+def _fit_slots(slots, wanted):
+    """Give the names in `wanted` tile slots: names already shown keep theirs, a slot whose name dropped out
+    takes the next newcomer (or keeps its old name), and further newcomers get new slots. Returns the new
+    slots and the indexes that changed."""
+    fresh, kept = [n for n in wanted if n not in slots], [n if n in wanted else None for n in slots]
+    changes = []
+    for i, name in enumerate(kept):
+        if name is None and fresh: kept[i] = fresh.pop(0); changes.append(i)
+        elif name is None: kept[i] = slots[i]
+    for name in fresh: kept.append(name); changes.append(len(kept) - 1)
+    return kept, changes
+
+FOLLOW_RESTAT = 2.0  # seconds between re-stats of a polled --follow-dir's known files
+
+class DirFollower:
+    """Keeps the `count` most recently modified files in a directory whose names end in one of `extensions`.
+
+    It remembers the mtime of every matching entry, so an inotify event only re-stats the names it
+    mentions, and the selection is only recomputed when a file outside it becomes newer than the
+    oldest inside it or a selected file disappears. Full rescans (startup, inotify overflow, or the
+    directory's own mtime moving when it is polled) use os.scandir, stat only matching names, and run
+    on a thread after startup. When polled, the known names are also re-stat'ed on that thread every
+    FOLLOW_RESTAT seconds, since appending to a file doesn't move the directory's mtime. Files that
+    stay selected keep their tile slot."""
+    def __init__(self, directory, extensions, count):
+        self.directory, self.extensions, self.count = directory, tuple(extensions), count
+        self.selected, self.on_done, self._scanned, self._scanning = [], None, None, False
+        self._dir_mtime, self._mtimes, self._next_restat = self._dir_stamp(), self._scan(), time.monotonic() + FOLLOW_RESTAT
+        self._select()
+    def _dir_stamp(self):
+        try: return os.stat(self.directory).st_mtime_ns
+        except OSError: return None
+    def _scan(self):
+        mtimes = {}
+        try:
+            with os.scandir(self.directory) as entries:
+                for e in entries:
+                    if not e.name.endswith(self.extensions): continue
+                    try:
+                        if e.is_file(): mtimes[e.name] = e.stat().st_mtime  # d_type answers is_file without a stat
+                    except OSError: pass
+        except OSError: pass
+        return mtimes
+    def _restat(self, names):
+        mtimes = {}
+        for name in names:
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+                if stat.S_ISREG(st.st_mode): mtimes[name] = st.st_mtime
+            except OSError: pass
+        return mtimes
+    def _select(self):
+        """Recompute the newest `count`; returns the (slot, path) assignments that changed."""
+        self.selected, changes = _fit_slots(self.selected, heapq.nlargest(self.count, self._mtimes, key=lambda n: (self._mtimes[n], n)))
+        return [(i, os.path.join(self.directory, self.selected[i])) for i in changes]
+    @property
+    def paths(self): return [os.path.join(self.directory, n) for n in self.selected]
+    def changed(self, names):
+        """Apply inotify events for names (None in names = overflow: rescan)."""
+        if None in names: self.rescan(); return []
+        selected = set(self.selected)
+        floor = min(self._mtimes.get(n, float('-inf')) for n in self.selected) if len(selected) >= self.count else float('-inf')
+        dirty = False
+        for name in names:
+            if not name.endswith(self.extensions): continue
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+                if not stat.S_ISREG(st.st_mode): raise OSError
+                self._mtimes[name] = st.st_mtime
+            except OSError: self._mtimes.pop(name, None)
+            dirty |= name not in self._mtimes if name in selected else self._mtimes.get(name, float('-inf')) > floor
+        return self._select() if dirty else []
+    def check(self):
+        """Polling fallback: rescan when the directory's own mtime moved (an entry came, went or was renamed),
+        else re-stat the known files now and then, so one that becomes the newest by being appended to is seen."""
+        stamp, now = self._dir_stamp(), time.monotonic()
+        if stamp != self._dir_mtime: self._dir_mtime = stamp; self.rescan()
+        elif now >= self._next_restat and not self._scanning: self._next_restat = now + FOLLOW_RESTAT; self.rescan(list(self._mtimes))
+    def rescan(self, names=None):
+        """Scan the directory on a thread (or re-stat just `names`); take() adopts the result."""
+        if self._scanning: return
+        self._scanning = True
+        def scan():
+            self._scanned, self._scanning = self._scan() if names is None else self._restat(names), False
+            if self.on_done: self.on_done()
+        threading.Thread(target=scan, daemon=True).start()
+    def take(self):
+        """Adopt a finished background rescan; returns the changed assignments."""
+        if self._scanned is None: return []
+        self._mtimes, self._scanned = self._scanned, None
+        return self._select()
+
+FRAME_HEADER, FRAME_MAX, SERVE_MAX_BUFFER = struct.Struct('>I'), 64 << 20, 8 << 20  # frame length prefix; largest frame; unsent bytes per viewer
+
+def _frame(msg) -> bytes:
+    """One protocol frame: a 4-byte big-endian length, then the message as compact JSON."""
+    body = json.dumps(msg, separators=(',', ':')).encode()
+    return FRAME_HEADER.pack(len(body)) + body
+
+class FrameReader:
+    """Splits a socket's byte stream back into messages."""
+    def __init__(self): self._buf = bytearray()
+    def feed(self, data):
+        self._buf += data; out = []
+        while len(self._buf) >= FRAME_HEADER.size:
+            n = FRAME_HEADER.unpack_from(self._buf)[0]
+            if n > FRAME_MAX: raise ValueError(f"frame of {n} bytes")
+            if len(self._buf) < FRAME_HEADER.size + n: break
+            out.append(json.loads(self._buf[FRAME_HEADER.size:FRAME_HEADER.size + n])); del self._buf[:FRAME_HEADER.size + n]
+        return out
+
+def _data_frame(path, reset, data, total, binary):
+    """Bytes a tile pushed (reset: its whole tail, replacing what the viewer had), its line count and binary flag."""
+    return _frame({'op': 'data', 'path': path, 'reset': reset, 'data': base64.b64encode(data).decode(), 'total': total, 'binary': binary})
+
+class SharedTile(TailTile):
+    """The daemon's tile for one path: records the bytes each update pushes, so viewers are sent only those."""
+    def __init__(self, filepath, lines=10):
+        super().__init__(filepath, lines); self._delta, self._reset, self.sent_total = [], False, None
+    def _reopen(self, *args, **kwargs): self._delta, self._reset = [], True; return super()._reopen(*args, **kwargs)
+    def _push(self, data): self._delta.append(bytes(data)); return super()._push(data)
+    def update(self):
+        changed = super().update()
+        if changed and not self._delta: self._reset = True  # the file vanished and the tile was cleared
+        return changed
+    def take(self):
+        """(reset, bytes) pushed since the last take."""
+        out = self._reset, b''.join(self._delta); self._delta, self._reset = [], False
+        return out
+    def state(self): return bytes(self._content.data()) + self._partial  # where a new viewer starts
+
+class TailServer:
+    """tailgrid --serve: one process follows each file for every viewer on the machine.
+
+    Viewers (--attach) connect to a Unix socket and subscribe to paths. Each path gets one SharedTile,
+    watched or polled once however many viewers show it, and after an update every subscriber is sent
+    just the bytes it pushed. A viewer that stops reading has its backlog replaced by a fresh tail."""
+    def __init__(self, path=SERVE_SOCKET):
+        self.path, self.tiles, self.subs, self.clients = str(path), {}, {}, {}
+        # tiles: spec -> SharedTile; subs: spec -> {conn: lines}; clients: conn -> [FrameReader, frames, bytes of the first sent, bytes queued]
+        self.sel, self.watcher, self.polled = selectors.DefaultSelector(), make_watcher(), set()
+        self.wake_r, self.wake_w = os.pipe()
+        for fd in (self.wake_r, self.wake_w): os.set_blocking(fd, False)
+    def listen(self):
+        """Bind the socket, replacing a stale one; raises OSError if another daemon is serving it."""
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        if os.path.exists(self.path):
+            probe = socket.socket(socket.AF_UNIX)
+            try: probe.connect(self.path); probe.close(); raise OSError(f"already serving on {self.path}")
+            except (ConnectionRefusedError, FileNotFoundError): os.unlink(self.path)
+        self.sock = socket.socket(socket.AF_UNIX); self.sock.bind(self.path); os.chmod(self.path, 0o600); self.sock.listen()
+        self.sock.setblocking(False); self.sel.register(self.sock, selectors.EVENT_READ)
+        self.sel.register(self.wake_r, selectors.EVENT_READ)
+        if self.watcher: self.sel.register(self.watcher.fd, selectors.EVENT_READ)
+    def serve(self, stop=lambda: False):
+        poll_interval, next_poll = POLL_INTERVAL, 0.0
+        try:
+            while not stop():
+                now = time.monotonic()
+                timeout = min(next_poll - now, 0.5) if self.polled else 0.5  # wakes now and then so stop() is noticed
+                dirty = set()
+                for key, events in self.sel.select(max(0, timeout)):
+                    if key.fileobj is self.sock: self._accept()
+                    elif key.fileobj == self.wake_r:  # a background line count finished
+                        try: os.read(self.wake_r, 512)
+                        except BlockingIOError: pass
+                        dirty |= self.tiles.keys()
+                    elif self.watcher and key.fileobj == self.watcher.fd: dirty |= {k for k in self.watcher.read() if k in self.tiles}
+                    else:
+                        if events & selectors.EVENT_WRITE: self._send(key.fileobj)
+                        if events & selectors.EVENT_READ: self._receive(key.fileobj)
+                if self.polled and time.monotonic() >= next_poll:
+                    dirty |= self.polled; next_poll = time.monotonic() + poll_interval; poll_interval = min(poll_interval * 2, POLL_MAX)
+                for spec in dirty:
+                    if spec in self.tiles and self.tiles[spec].update() and spec in self.polled: poll_interval = POLL_INTERVAL
+                    self._flush(spec)
+        finally: self.close()
+    def close(self):
+        for conn in list(self.clients): self._drop(conn)
+        self.sel.close(); self.sock.close(); os.close(self.wake_r); os.close(self.wake_w)
+        if self.watcher: self.watcher.close()
+        try: os.unlink(self.path)
+        except OSError: pass
+    def _accept(self):
+        try: conn, _ = self.sock.accept()
+        except BlockingIOError: return
+        conn.setblocking(False); self.clients[conn] = [FrameReader(), deque(), 0, 0]; self.sel.register(conn, selectors.EVENT_READ)
+    def _drop(self, conn):
+        self.sel.unregister(conn); conn.close(); del self.clients[conn]
+        for spec in [spec for spec, subs in self.subs.items() if conn in subs]: self._unsubscribe(conn, spec)
+    def _receive(self, conn):
+        if conn not in self.clients: return  # dropped while sending
+        try:
+            data = conn.recv(1 << 16)
+            msgs = self.clients[conn][0].feed(data) if data else None
+        except BlockingIOError: return
+        except (OSError, ValueError): msgs = None  # reset, or not speaking the protocol
+        if msgs is None or not all(map(self._valid, msgs)): return self._drop(conn)  # one bad client never takes the daemon down
+        for msg in msgs:
+            if msg['op'] == 'sub': self._subscribe(conn, msg['path'], msg.get('lines', 10))
+            else: self._unsubscribe(conn, msg['path'])
+    @staticmethod
+    def _valid(msg):
+        """A {'op': 'sub'|'unsub', 'path': str, 'lines': positive int} request."""
+        if not isinstance(msg, dict) or msg.get('op') not in ('sub', 'unsub') or not isinstance(msg.get('path'), str): return False
+        lines = msg.get('lines', 10)
+        return isinstance(lines, int) and not isinstance(lines, bool) and lines > 0
+    def _subscribe(self, conn, spec, lines):
+        tile = self.tiles.get(spec)
+        if tile is None:
+            tile = self.tiles[spec] = SharedTile(spec, lines)
+            tile.on_done = lambda: os.write(self.wake_w, b'\0')
+            if self.watcher is None or not self.watcher.add(tile.filepath, spec): self.polled.add(spec)
+        subs = self.subs.setdefault(spec, {}); subs[conn] = lines
+        if tile._ident is None or max(subs.values()) > tile.lines: tile.resize(max(subs.values())); tile.update()
+        self._flush(spec, skip=conn)
+        total = tile.total_lines(); tile.sent_total = total
+        self._queue(conn, _data_frame(spec, True, tile.state(), total, tile.binary))
+    def _unsubscribe(self, conn, spec):
+        if spec not in self.subs or conn not in self.subs[spec]: return  # never subscribed: nothing to undo
+        subs = self.subs[spec]; del subs[conn]
+        if subs: return
+        self.subs.pop(spec, None); self.polled.discard(spec); tile = self.tiles.pop(spec, None)
+        if self.watcher and tile is not None: self.watcher.discard(tile.filepath, spec)
+    def _flush(self, spec, skip=None):
+        """Send a tile's pushed bytes (or its new line count) to every subscriber."""
+        tile = self.tiles.get(spec)
+        if tile is None: return
+        (reset, data), total = tile.take(), tile.total_lines()
+        if not (reset or data) and total == tile.sent_total: return
+        frame, tile.sent_total = _data_frame(spec, reset, data, total, tile.binary), total
+        for conn in list(self.subs.get(spec, ())):
+            if conn is not skip and conn in self.clients: self._queue(conn, frame)
+    def _queue(self, conn, frame):
+        client = self.clients[conn]
+        client[1].append(frame); client[3] += len(frame)
+        if client[3] - client[2] > SERVE_MAX_BUFFER: self._resync(conn)
+        self._send(conn)
+    def _resync(self, conn):
+        """Drop the frames a slow viewer has not started on and send it each tile's current tail instead."""
+        client = self.clients[conn]; frames = client[1]
+        while len(frames) > (1 if client[2] else 0): client[3] -= len(frames.pop())
+        for spec, subs in self.subs.items():
+            if conn in subs:
+                tile = self.tiles[spec]; frames.append(frame := _data_frame(spec, True, tile.state(), tile.sent_total, tile.binary)); client[3] += len(frame)
+    def _send(self, conn):
+        client = self.clients.get(conn)
+        if client is None: return
+        frames = client[1]
+        try:
+            while frames:
+                n = conn.send(frames[0][client[2]:])
+                client[2] += n
+                if client[2] < len(frames[0]): break
+                client[3] -= len(frames.popleft()); client[2] = 0
+        except BlockingIOError: pass
+        except OSError: return self._drop(conn)
+        self.sel.modify(conn, selectors.EVENT_READ | (selectors.EVENT_WRITE if frames else 0))
+
+class ServerLink:
+    """A viewer's connection to a --serve daemon: subscriptions go out, data frames come back."""
+    def __init__(self, path=SERVE_SOCKET):
+        self.sock, self._frames, self._lock = socket.socket(socket.AF_UNIX), FrameReader(), threading.Lock()
+        self.sock.connect(str(path))
+    def send(self, msg):  # from the UI and reader threads
+        with self._lock: self.sock.sendall(_frame(msg))
+    def subscribe(self, spec, lines):
+        try: self.send({'op': 'sub', 'path': spec, 'lines': lines})
+        except OSError: pass  # the daemon is gone; the tile keeps what it has
+    def read(self):
+        """Messages that have arrived (call once the socket is readable); None once the daemon has gone."""
+        try: data = self.sock.recv(1 << 16)
+        except OSError: data = b''
+        if not data: return None
+        try: return self._frames.feed(data)
+        except ValueError: return None
+    def close(self): self.sock.close()
+
+class RemoteTile(TailTile):
+    """A file tile fed by a --serve daemon: the bytes arrive through apply() and go through the same
+    _push a local tile uses. Scroll mode still indexes the file itself, locally and on demand."""
+    def __init__(self, spec, lines, link):
+        super().__init__(spec, lines)
+        self.spec, self.link, self._total = spec, link, None
+        link.subscribe(spec, lines)
+    def apply(self, reset, data, total, binary):
+        """Take one data frame (reader thread)."""
+        if reset: self._content, self._partial, self._cut = LineStore(max(self.lines, 0)), b'', False
+        else: self.appended += data.count(b'\n')
+        self._push(data); self._total, self.binary = total, binary
+    def update(self): return self._update_frozen() if self.frozen else False
+    def reset(self): self.link.subscribe(self.spec, self.lines)  # the daemon answers with a fresh tail
+    def resize(self, lines):
+        if lines == self.lines: return
+        grow, self.lines = lines > self.lines, lines
+        self._content.resize(max(lines, 0))
+        if grow: self.reset()
+    def set_filter(self, pattern): super().set_filter(pattern); self._stale = False; self.reset()
+    def set_visible(self, visible): self.visible, self.unseen = visible, 0  # frames keep arriving either way
+    def total_lines(self): return self._total
+    def session_state(self): return None
+
+def run_viewer(filepaths, layout, initial_lines, show_full_path=None, reasons=None, follow=None, attach=None, profile=None, discover=None, restore=False):
+    # Files seen by an earlier session reopen warm (no recount, no reindexing); a resumed session (restore)
+    # also gets its scroll mode, position, wrap and pan back
+    saved = session_states(filepaths if restore else None)
+    if filepaths: save_session(filepaths, layout, initial_lines)
     config = load_config()
     full_path = show_full_path if show_full_path is not None else config.get('show_full_path', False)
+    link = None  # --attach: file tiles are fed by a --serve daemon instead of reading the files
+    if attach:
+        try: link = ServerLink(attach)
+        except OSError as e: print(f"  No tailgrid --serve on {attach} ({e.strerror or e}), reading the files directly"); time.sleep(1)
+    trace = None  # --profile: one JSON line of counters per frame
+    if profile:
+        try: trace = open(profile, 'w')
+        except OSError as e: print(f"  Cannot write profile {profile}: {e.strerror}"); time.sleep(1)
     def viewer(stdscr):
-        curses.curs_set(0); stdscr.timeout(100)
-        tiles = [TailTile(fp, initial_lines) for fp in filepaths]
-        renderer, redraw, last_size = TileRenderer(stdscr, tiles, layout, full_path, reasons), True, os.get_terminal_size()
+        curses.curs_set(0); stdscr.nodelay(True); curses.set_escdelay(25)
+        sel, (wake_r, wake_w) = selectors.DefaultSelector(), os.pipe()
+        for fd in (wake_r, wake_w): os.set_blocking(fd, False)
+        # All file I/O happens on per-tile reader threads; this loop only handles keys and draws snapshots
+        results = queue.Queue(maxsize=4 * max(len(filepaths), follow.count if follow else CLAUDE_MAX_PATHS if discover else 1))
+        frame_interval = 1.0 / max(1, config.get('max_fps', 30))
+        # The scrollback budget is split evenly between cmd: tiles; file tiles scroll through the file itself
+        scrollback = int(config.get('scrollback_mb', 64) * (1 << 20)) // max(1, sum(fp.startswith('cmd:') for fp in filepaths))
+        def make_tile(fp):
+            if fp.startswith('cmd:'): return CommandTile(fp, initial_lines, scrollback)
+            if link: return RemoteTile(fp, initial_lines, link)
+            tile = TailTile(fp, initial_lines)
+            if saved.get(fp, {}).get('ident'): tile.warm(saved[fp], restore)
+            return tile
+        tiles = [TileReader(make_tile(fp), i, results, wake_w, config.get('io_timeout', 2.0), frame_interval) for i, fp in enumerate(filepaths)]
+        for fp, tile in zip(filepaths, tiles) if restore else ():
+            pan = saved.get(fp, {}).get('h_scroll')
+            tile.wrap, tile.h_scroll = bool(saved.get(fp, {}).get('wrap')), pan if isinstance(pan, int) and pan > 0 else 0
+        session = (filepaths, layout)  # what exit saves the tile states under; --claude moves it to the fresh answer
+        remote = {}  # subscribed path -> indexes of the tiles showing it
+        for i, t in enumerate(tiles):
+            if isinstance(t.tile, RemoteTile): remote.setdefault(t.tile.spec, []).append(i)
+        renderer, redraw, last_size = TileRenderer(stdscr, tiles, layout, full_path, reasons, config.get('highlight')), True, os.get_terminal_size()
         last_key, last_key_time = None, 0
-        for tile in tiles: tile.update()
-        while True:
-            try:
-                sz = os.get_terminal_size()
-                if sz != last_size: last_size = sz; curses.resizeterm(sz.lines, sz.columns); stdscr.clear(); redraw = True
-            except OSError: pass
+        # Sleep in select() until a watched file changes, a key arrives or the terminal is resized;
+        # tiles inotify can't cover (no inotify, network filesystems) are stat-polled, backing off while idle.
+        watcher, polled, poll_interval, next_poll = make_watcher(), [], POLL_INTERVAL, 0.0
+        last_frame, urgent = 0.0, False
+        perf, hud = None, False  # Perf is installed while the HUD ('p') or --profile is on
+        if trace: perf = Perf(trace); perf.install()
+        # cmd: tiles: their pipes sit in the selector; a tile whose reader falls behind has its pipe paused,
+        # so the command blocks on a full pipe instead of growing our memory
+        pipes, paused, restarts, restart_delay = {}, {}, {}, config.get('cmd_restart')
+        reaping = {}  # tile index -> CommandTile whose output closed, polled until the command exits
+        def start(i): fd = tiles[i].tile.spawn(); pipes[fd] = i; sel.register(fd, selectors.EVENT_READ)
+        # 'm': one merged timeline of every file tile; the grid's layout and focus are put back when it closes
+        merged, grid = None, None
+        def toggle_merge():
+            nonlocal merged, grid
+            if merged:
+                merged.stop(); merged = None
+                renderer.tiles, renderer.rows, renderer.cols, renderer.focused = grid
+            else:
+                sources = [(i + 1, t.tile.filepath) for i, t in enumerate(tiles) if not isinstance(t.tile, CommandTile)]
+                try: tile = MergeTile(sources, initial_lines, config.get('merge_timestamp', DEFAULT_TIMESTAMP))
+                except re.error as e:
+                    renderer.notice = f"merge_timestamp in config.json is not a valid regex ({e})"; curses.beep(); return
+                merged = TileReader(tile, MERGE_IDX, results, wake_w, config.get('io_timeout', 2.0), frame_interval)
+                grid = renderer.tiles, renderer.rows, renderer.cols, renderer.focused
+                renderer.tiles, renderer.rows, renderer.cols, renderer.focused = [merged], 1, 1, 0
+                merged.update()
+            renderer.invalidate()
+        shown = set(renderer.visible())
+        for i, tile in enumerate(tiles):
+            if i not in shown: tile.set_visible(False)
+            tile.update()
+            if isinstance(tile.tile, CommandTile): start(i)
+            elif isinstance(tile.tile, RemoteTile): continue  # the daemon watches it
+            elif watcher is None or not watcher.add(tile.filepath, i): polled.append(i)
+        # --follow-dir: the directory's own events (or its polled mtime) reassign tiles to the newest files
+        if follow: follow.on_done = lambda: os.write(wake_w, b'\0')
+        poll_dir = follow is not None and (watcher is None or not watcher.add_dir(follow.directory, 'dir'))
+        # --claude: the viewer opened on the cached answer; Claude's fresh one swaps or adds tiles when it arrives
+        if discover: discover.on_done = lambda: os.write(wake_w, b'\0'); discover.start(); renderer.notice = "Claude: asking for fresh log paths…"
+        def reassign(changes):
+            for i, path in changes:
+                if i < len(tiles):
+                    if watcher and i not in polled: watcher.discard(tiles[i].filepath, i)
+                    tiles[i].retarget(path)
+                else:
+                    tiles.append(TileReader(TailTile(path, initial_lines), i, results, wake_w, config.get('io_timeout', 2.0), frame_interval))
+                    if i not in renderer.visible(): tiles[i].set_visible(False)
+                    tiles[i].update()
+                if (watcher is None or not watcher.add(path, i)) and i not in polled: polled.append(i)
+            return bool(changes)
+        sel.register(sys.stdin, selectors.EVENT_READ); sel.register(wake_r, selectors.EVENT_READ)
+        if watcher: sel.register(watcher.fd, selectors.EVENT_READ)
+        if link: sel.register(link.sock, selectors.EVENT_READ)
+        old_winch = signal.signal(signal.SIGWINCH, lambda *_: None); old_wakeup = signal.set_wakeup_fd(wake_w)
+        try:
+            while True:
+                # Keypresses draw at once; file updates are coalesced into at most max_fps frames per second
+                now = time.monotonic()
+                if redraw and (urgent or now - last_frame >= frame_interval):
+                    renderer.render(); redraw = urgent = False; last_frame = now
+                    if perf: renderer.hud = perf.frame(renderer, hud)
+                busy = any(t.busy_since is not None for t in tiles)  # keep waking to flag tiles that stall
+                active = any(t.rate(now) >= 1 for t in tiles)  # keep waking so lines/s decays on screen
+                timeouts = [last_frame + frame_interval - now] if redraw else []
+                if polled or poll_dir: timeouts.append(next_poll - now)
+                if renderer.counting or busy: timeouts.append(0.25)
+                if active: timeouts.append(RATE_WINDOW / 2)
+                if restarts: timeouts.append(min(restarts.values()) - now)
+                if paused: timeouts.append(0.05)
+                if reaping: timeouts.append(CMD_REAP_TICK)
+                if hud: timeouts.append(perf.next_hud - now)
+                ready = {key.fd for key, _ in sel.select(max(0, min(timeouts)) if timeouts else None)}
+                now, dirty = time.monotonic(), set()
+                if (polled or poll_dir) and now >= next_poll:
+                    dirty.update(polled); next_poll = now + poll_interval; poll_interval = min(poll_interval * 2, POLL_MAX)
+                    if poll_dir: follow.check()
+                if watcher and watcher.fd in ready: dirty |= watcher.read()
+                for fd in ready & pipes.keys():
+                    i = pipes[fd]; cmd = tiles[i].tile
+                    for _ in range(4):  # bounded per wakeup, so a chatty command can't starve keys and other tiles
+                        if not (data := cmd.read()): break
+                        tiles[i].feed(data)
+                    if data == b'': sel.unregister(fd); del pipes[fd]; reaping[i] = cmd
+                    elif tiles[i].pending > CMD_MAX_PENDING: sel.unregister(fd); paused[fd] = pipes.pop(fd)
+                for i, cmd in list(reaping.items()):  # polled, so a command that lingers after closing its output never stalls the UI
+                    if (status := cmd.reap(now)) is None: continue
+                    del reaping[i]; tiles[i].exited(status, restart_delay)
+                    if restart_delay is not None: restarts[i] = now + restart_delay
+                for fd, i in list(paused.items()):
+                    if tiles[i].pending <= CMD_MAX_PENDING // 2: del paused[fd]; pipes[fd] = i; sel.register(fd, selectors.EVENT_READ)
+                for i, due in list(restarts.items()):
+                    if now >= due: del restarts[i]; start(i)
+                if link and link.sock.fileno() in ready:
+                    if (msgs := link.read()) is None: sel.unregister(link.sock); link.close()  # daemon gone: tiles keep their last lines
+                    for msg in msgs or ():
+                        for i in remote.get(msg.get('path'), ()):
+                            tiles[i].apply(msg['reset'], base64.b64decode(msg['data']), msg.get('total'), msg.get('binary', False))
+                if follow:
+                    names = {k[1] for k in dirty if isinstance(k, tuple)}; dirty -= {k for k in dirty if isinstance(k, tuple)}
+                    if reassign(follow.take() + (follow.changed(names) if names else [])): redraw = True
+                if discover and (changes := discover.take()) is not None:
+                    renderer.notice = None if tiles or changes else "Claude: no log files found (q: Quit)"
+                    if reassign(changes):
+                        renderer.reasons.update(discover.reasons)
+                        if discover.layout is None: renderer.rows, renderer.cols = auto_layout(len(tiles)) or (2, 1)
+                        session = ([t.filepath for t in tiles], (renderer.rows, renderer.cols)); save_session(*session, initial_lines)
+                    renderer.invalidate(); redraw = True
+                if wake_r in ready:
+                    try: os.read(wake_r, 512)
+                    except BlockingIOError: pass
+                try:
+                    sz = os.get_terminal_size()
+                    if sz != last_size: last_size = sz; curses.resizeterm(sz.lines, sz.columns); stdscr.clear(); redraw = True
+                except OSError: pass
+                for i in dirty: tiles[i].update()
+                if merged and dirty: merged.update()
+                while True:
+                    try: i, snap = results.get_nowait()
+                    except queue.Empty: break
+                    if i != MERGE_IDX: tiles[i].receive(snap, now)
+                    elif merged: merged.receive(snap, now)
+                    redraw = True
+                    if i in polled: poll_interval, next_poll = POLL_INTERVAL, min(next_poll, now + POLL_INTERVAL)
+                if hud and now >= perf.next_hud: redraw = True
+                if busy or active: redraw = True  # cheap: only tiles whose header text changed get repainted
+                if renderer.counting and renderer.tiles[renderer.focused].total_lines() is not None: redraw = True
+                while (key := stdscr.getch()) != -1:
+                    urgent, poll_interval = True, POLL_INTERVAL
+                    if not tiles:  # --follow-dir before the first matching file exists
+                        if key == ord('q'): return
+                        continue
+                    ft = renderer.tiles[renderer.focused]
+                    if renderer.notice and renderer.notice.startswith('merge_timestamp'): renderer.notice = None; renderer.invalidate()
+                    if renderer.prompt is not None:  # typing a /search or &filter pattern
+                        if key == 27: renderer.prompt = None
+                        elif key in (ord('\n'), curses.KEY_ENTER):
+                            kind, pattern = renderer.prompt[0], renderer.prompt[1:]
+                            try: re.compile(pattern.encode())
+                            except re.error: curses.beep(); continue
+                            renderer.prompt = None
+                            if kind == '&': ft.set_filter(pattern or None)
+                            elif pattern: ft.find(pattern)
+                        elif key in (curses.KEY_BACKSPACE, 127, 8): renderer.prompt = renderer.prompt[:-1] if len(renderer.prompt) > 1 else None
+                        elif 32 <= key < 127: renderer.prompt += chr(key)
+                        redraw = True; continue
+                    if key == ord('q'): return
+                    elif key == ord('r'):
+                        for tile in tiles: tile.reset(); tile.update()
+                        renderer.invalidate(); redraw = True
+                    elif key in (ord('\n'), curses.KEY_ENTER, 10):
+                        if ft.frozen: ft.unfreeze()
+                        else: ft.freeze()
+                        redraw = True
+                    elif key == ord('\t'):
+                        renderer.focused = (renderer.focused + 1) % len(renderer.tiles); redraw = True
+                    elif key == curses.KEY_UP:
+                        if ft.frozen: ft.scroll(1)
+                        else: renderer.move(-renderer.cols)
+                        redraw = True
+                    elif key == curses.KEY_DOWN:
+                        if ft.frozen: ft.scroll(-1)
+                        else: renderer.move(renderer.cols)
+                        redraw = True
+                    elif key == curses.KEY_LEFT:
+                        if ft.frozen: ft.h_scroll = max(0, ft.h_scroll - 10)
+                        else: renderer.move(-1)
+                        redraw = True
+                    elif key == curses.KEY_RIGHT:
+                        if ft.frozen: ft.h_scroll += 10
+                        else: renderer.move(1)
+                        redraw = True
+                    elif key in (ord(']'), ord('[')): renderer.flip(1 if key == ord(']') else -1); redraw = True
+                    elif key == ord('j'): ft.scroll(-1); redraw = True
+                    elif key == ord('k'): ft.scroll(1); redraw = True
+                    elif key in (ord('u'), curses.KEY_PPAGE): ft.scroll(10); redraw = True
+                    elif key in (ord('d'), curses.KEY_NPAGE): ft.scroll(-10); redraw = True
+                    elif key == ord('g'):
+                        now = time.time()
+                        if last_key == ord('g') and now - last_key_time < 0.5: ft.scroll_top(); redraw = True
+                        last_key, last_key_time = key, now
+                    elif key == ord('G'): ft.scroll_bottom(); redraw = True
+                    elif key == ord('/'): renderer.prompt = '/'; redraw = True
+                    elif key in (ord('f'), ord('&')): renderer.prompt = '&' + (ft.filter or ''); redraw = True
+                    elif key in (ord('n'), ord('N')): ft.find_next(key == ord('n')); redraw = True
+                    elif key == 27: ft.cancel_find(); redraw = True
+                    elif key == ord('m'): toggle_merge(); redraw = True
+                    elif key == ord('p'):
+                        hud = not hud
+                        if hud and not perf: perf = Perf(); perf.install()
+                        if not hud: renderer.hud = None
+                        if not hud and not trace: perf.uninstall(); perf = None
+                        redraw = True
+                    elif key == ord('w'): ft.wrap = not ft.wrap; ft.h_scroll = 0; redraw = True
+                    elif key in (ord('<'), ord(',')): ft.h_scroll = max(0, ft.h_scroll - 10); redraw = True
+                    elif key in (ord('>'), ord('.')): ft.h_scroll += 10; redraw = True
+                    elif key in range(ord('1'), ord('1') + len(renderer.visible())):
+                        renderer.focused = renderer.visible()[key - ord('1')]; redraw = True
+                    elif key == curses.KEY_RESIZE: curses.update_lines_cols(); stdscr.erase(); redraw = True
+                    last_key, last_key_time = key, time.time()
+                if not merged and set(renderer.visible()) != shown:  # page flipped: only the new page reads and renders
+                    for i in shown - set(renderer.visible()): tiles[i].set_visible(False)
+                    for i in set(renderer.visible()) - shown: tiles[i].set_visible(True)
+                    shown = set(renderer.visible())
+        finally:
+            if session[0] and tiles:  # each tile's offset, line count, checkpoints and view, for a warm restart
+                boxes, deadline, states = [(t, t.save()) for t in tiles], time.monotonic() + SESSION_SAVE_TIMEOUT, {}
+                for t, box in boxes:
+                    try: state = box.get(timeout=max(0, deadline - time.monotonic()))
+                    except queue.Empty: state = None  # a reader stuck on a dead mount: that tile starts cold next time
+                    states[('chain:' if t.chain else '') + t.filepath] = {**(state or {}), 'wrap': t.wrap, 'h_scroll': t.h_scroll}
+                save_session(*session, initial_lines, states)
+            if merged: merged.stop()
+            if discover: discover.on_done = None; discover.stop()
             for tile in tiles:
-                if tile.update(): redraw = True
-            key = stdscr.getch()
-            ft = tiles[renderer.focused]
-            if key == ord('q'): break
-            elif key == ord('r'):
-                for tile in tiles: tile._last_stat = (0, 0); tile.update()
-                redraw = True
-            elif key in (ord('\n'), curses.KEY_ENTER, 10):
-                if ft.frozen: ft.unfreeze()
-                else: ft.freeze()
-                redraw = True
-            elif key == ord('\t'):
-                renderer.focused = (renderer.focused + 1) % len(tiles); redraw = True
-            elif key == curses.KEY_UP:
-                if ft.frozen: ft.scroll(1)
-                else: renderer.focused = (renderer.focused - renderer.cols) % len(tiles)
-                redraw = True
-            elif key == curses.KEY_DOWN:
-                if ft.frozen: ft.scroll(-1)
-                else: renderer.focused = (renderer.focused + renderer.cols) % len(tiles)
-                redraw = True
-            elif key == curses.KEY_LEFT:
-                if ft.frozen: ft.h_scroll = max(0, ft.h_scroll - 10)
-                else: renderer.focused = (renderer.focused - 1) % len(tiles)
-                redraw = True
-            elif key == curses.KEY_RIGHT:
-                if ft.frozen: ft.h_scroll += 10
-                else: renderer.focused = (renderer.focused + 1) % len(tiles)
-                redraw = True
-            elif key == ord('j'): ft.scroll(-1); redraw = True
-            elif key == ord('k'): ft.scroll(1); redraw = True
-            elif key in (ord('u'), curses.KEY_PPAGE): ft.scroll(10); redraw = True
-            elif key in (ord('d'), curses.KEY_NPAGE): ft.scroll(-10); redraw = True
-            elif key == ord('g'):
-                now = time.time()
-                if last_key == ord('g') and now - last_key_time < 0.5: ft.scroll_top(); redraw = True
-                last_key, last_key_time = key, now
-            elif key == ord('G'): ft.scroll_bottom(); redraw = True
-            elif key == ord('w'): ft.wrap = not ft.wrap; ft.h_scroll = 0; redraw = True
-            elif key in (ord('<'), ord(',')): ft.h_scroll = max(0, ft.h_scroll - 10); redraw = True
-            elif key in (ord('>'), ord('.')): ft.h_scroll += 10; redraw = True
-            elif key in range(ord('1'), ord('1') + len(tiles)):
-                renderer.focused = key - ord('1'); redraw = True
-            elif key == curses.KEY_RESIZE: curses.update_lines_cols(); stdscr.erase(); redraw = True
-            if key != -1: last_key, last_key_time = key, time.time()
-            if redraw: renderer.render(); redraw = False
+                if isinstance(tile.tile, CommandTile): tile.tile.kill()
+            signal.set_wakeup_fd(old_wakeup); signal.signal(signal.SIGWINCH, old_winch)
+            sel.close(); os.close(wake_r); os.close(wake_w)
+            if watcher: watcher.close()
+            if link: link.close()
+            if perf: perf.uninstall()
     try: curses.wrapper(viewer)
     except KeyboardInterrupt: pass
+    finally:
+        if trace: trace.close()
 
 def _input(prompt):
     _setup_readline()
@@ -293,7 +2313,6 @@ def _browse_directory():
             if not directory: return "back"
             paths = file_picker(directory.strip())
             if not paths: continue
-            if len(paths) > 9: print(f"\n  Selected {len(paths)} files, using first 9."); paths = paths[:9]
             layout = auto_layout(len(paths))
             if layout is None:
                 print("\n  2 files: v=vertical, h=horizontal (b=back, q=quit): ", end='', flush=True)
@@ -301,7 +2320,7 @@ def _browse_directory():
                 if ch == 'q': return None
                 if ch == 'b': continue
                 layout = (1, 2) if ch == 'h' else (2, 1)
-            print(f"\n  {len(paths)} file(s) → {['Single','Vertical','Horizontal','2x2 Grid','3x3 Grid'][[1,2,2,4,9].index(layout[0]*layout[1])]}")
+            print(f"\n  {len(paths)} file(s) → {layout_name(layout, len(paths))}")
             for p in paths: print(f"    • {p}")
             print("\n  Starting..."); time.sleep(0.3); return paths, layout, 10
         except (EOFError, KeyboardInterrupt): print(); return None
@@ -366,6 +2385,7 @@ LOGO = """
 """
 
 def prompt_setup():
+    """The interactive menu: ((paths, layout, lines), resumed) or None."""
     first = True
     while True:
         if first: print(LOGO); first = False
@@ -375,87 +2395,166 @@ def prompt_setup():
             choice = _getch(); print(choice)
             result = _browse_directory() if choice == '1' else _add_paths_manually() if choice == '2' else _resume_session() if choice == '3' else None if choice.lower() == 'q' else "back"
             if result is None: return None
-            if result != "back": return result
+            if result != "back": return result, choice == '3'  # a resumed session gets its tiles' view state back
         except (EOFError, KeyboardInterrupt): print(); return None
 
-def quick_start(directory, count=9):
-    """Auto-select log files from directory (newest first). Extensions from config.json."""
+def quick_start(directory, count=9, grid=None, follower=None):
+    """Auto-select log files from directory (newest first). Extensions from config.json.
+    With a DirFollower (--follow-dir) the grid is sized for `count` so files that appear later have a slot."""
     directory = os.path.expanduser(directory)
     if not os.path.isdir(directory): print(f"  Not a directory: {directory}"); return None
     extensions = tuple(load_config().get('extensions', DEFAULT_EXTENSIONS))
-    files = [os.path.join(directory, f) for f in os.listdir(directory)
-             if f.endswith(extensions) and os.path.isfile(os.path.join(directory, f))]
-    if not files: print(f"  No {'/'.join(extensions)} files in: {directory}"); return None
-    files.sort(key=lambda f: os.path.getmtime(f), reverse=True)
-    paths = files[:min(count, 9)]
-    layout = auto_layout(len(paths)) or (2, 1)
+    paths = (follower or DirFollower(directory, extensions, count)).paths
+    if not paths and not follower: print(f"  No {'/'.join(extensions)} files in: {directory}"); return None
+    layout = grid or auto_layout(count if follower else len(paths)) or (2, 1)
     print(LOGO)
-    print(f"  Found {len(paths)} file(s) in {directory}\n")
+    print(f"  Found {len(paths)} file(s) in {directory}{' (following new files)' if follower else ''}\n")
     for p in paths: print(f"    • {os.path.basename(p)}")
     print("\n  Starting..."); time.sleep(0.3)
     return paths, layout, 10
 
-def claude_discover_paths():
-    """Ask Claude CLI to return relevant session log paths with per-file reasoning."""
-    import subprocess
-    config = load_config()
-    prompt = config.get('claude_prompt', DEFAULT_CLAUDE_PROMPT)
+def _parse_claude(output):
+    """'path | reason' lines -> (existing paths, {path: reason}), at most CLAUDE_MAX_PATHS."""
+    paths, reasons = [], {}
+    for line in output.split('\n'):
+        line = line.strip()
+        if not line or line.startswith('<') or line.startswith('#'):
+            continue
+        if '|' in line:
+            path, reason = line.split('|', 1)
+            path, reason = path.strip(), reason.strip()
+        else:
+            path, reason = line, None
+        if path and os.path.isfile(path):
+            paths.append(path)
+            if reason:
+                reasons[path] = reason
+    return paths[:CLAUDE_MAX_PATHS], reasons
+
+def _claude_cache_file(cwd, prompt):
+    return CLAUDE_CACHE_DIR / (hashlib.sha1(os.fsencode(cwd) + b'\0' + prompt.encode()).hexdigest() + ".json")
+
+def load_claude_cache(cwd, prompt, ttl=CLAUDE_CACHE_TTL):
+    """The last answer for this cwd and prompt if younger than ttl seconds, minus paths that no longer exist;
+    None if there is nothing usable."""
     try:
-        result = subprocess.run(['claude', '-p', prompt], capture_output=True, text=True, timeout=60)
-        output = result.stdout.strip()
-        paths, reasons = [], {}
-        for line in output.split('\n'):
-            line = line.strip()
-            if not line or line.startswith('<') or line.startswith('#'):
-                continue
-            if '|' in line:
-                path, reason = line.split('|', 1)
-                path, reason = path.strip(), reason.strip()
-            else:
-                path, reason = line, None
-            if path and os.path.isfile(path):
-                paths.append(path)
-                if reason:
-                    reasons[path] = reason
-        return paths[:9], reasons
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        return [], {}
+        cached = json.loads(_claude_cache_file(cwd, prompt).read_text())
+        if cached['cwd'] != cwd or time.time() - cached['time'] > ttl: return None
+        paths = [p for p in cached['paths'] if os.path.isfile(p)]
+        return (paths, {p: r for p, r in cached['reasons'].items() if p in paths}) if paths else None
+    except (OSError, ValueError, KeyError, TypeError, AttributeError): return None
+
+def save_claude_cache(cwd, prompt, paths, reasons):
+    path = _claude_cache_file(cwd, prompt); tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        CLAUDE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps({'cwd': cwd, 'time': time.time(), 'paths': paths, 'reasons': reasons}))
+        os.replace(tmp, path)  # readers never see half a file
+    except OSError: pass
+
+def claude_discover_paths(prompt=None, proc=None):
+    """Ask Claude CLI to return relevant session log paths with per-file reasoning; a useful answer is cached.
+    proc, if given, is called with the Popen so another thread can kill it."""
+    prompt = prompt or load_config().get('claude_prompt', DEFAULT_CLAUDE_PROMPT)
+    try:
+        child = subprocess.Popen(['claude', '-p', prompt], stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    except OSError: return [], {}
+    if proc: proc(child)
+    try: output = child.communicate(timeout=CLAUDE_TIMEOUT)[0] or ''
+    except subprocess.TimeoutExpired: child.kill(); child.wait(); return [], {}
+    paths, reasons = _parse_claude(output.strip())
+    if paths: save_claude_cache(os.getcwd(), prompt, paths, reasons)
+    return paths, reasons
+
+class ClaudeDiscovery:
+    """--claude without the wait: `paths`/`reasons` start as the cached answer for the current directory,
+    start() asks Claude on a thread, and take() hands the viewer the tile changes once it has answered
+    (the same (slot, path) pairs DirFollower produces). `layout` is a --grid to keep, else None."""
+    def __init__(self, prompt, ttl=CLAUDE_CACHE_TTL, layout=None):
+        self.prompt, self.layout, self.on_done, self.done, self._answer, self._child = prompt, layout, None, False, None, None
+        self.paths, self.reasons = load_claude_cache(os.getcwd(), prompt, ttl) or ([], {})
+    def start(self):
+        def ask():
+            self._answer = claude_discover_paths(self.prompt, lambda child: setattr(self, '_child', child))
+            if self.on_done: self.on_done()
+        threading.Thread(target=ask, daemon=True).start()
+    def take(self):
+        """None until Claude has answered, then the changed (slot, path) assignments, once."""
+        if self._answer is None or self.done: return None
+        paths, reasons = self._answer; self.done = True
+        if not paths: return []  # no answer: keep showing the cached files
+        self.reasons.update(reasons)
+        self.paths, changes = _fit_slots(self.paths, paths)
+        return [(i, self.paths[i]) for i in changes]
+    def stop(self):
+        if self._child and self._child.poll() is None: self._child.kill()
+
+def _tile_arg(arg):
+    """Expand ~ in a file argument, keeping a chain: prefix; None if the file does not exist. cmd: passes as is."""
+    if arg.startswith('cmd:'): return arg if arg[4:].strip() else None
+    prefix = 'chain:' if arg.startswith('chain:') else ''
+    path = os.path.expanduser(arg.removeprefix(prefix))
+    return prefix + path if os.path.exists(path) else None
 
 def main():
-    if '--claude' in sys.argv:
-        print("  Asking Claude for recent & relevant log paths to show with tailgrid...")
-        paths, reasons = claude_discover_paths()
-        if not paths:
-            print("  No relevant log files found")
-            return 1
-        layout = auto_layout(len(paths)) or (2, 1)
+    argv, grid, follower, sock, restore = sys.argv[1:], None, None, SERVE_SOCKET, False
+    follow, serve, attach = ('--follow-dir' in argv), ('--serve' in argv), ('--attach' in argv)
+    for flag in ('--follow-dir', '--serve', '--attach'):
+        if flag in argv: argv.remove(flag)
+    profile = None
+    if '--profile' in argv:
+        i = argv.index('--profile'); profile = argv[i + 1] if i + 1 < len(argv) else None
+        if profile is None: print("  --profile expects a file"); return 1
+        del argv[i:i + 2]
+    if '--socket' in argv:
+        i = argv.index('--socket'); sock = os.path.expanduser(argv[i + 1]) if i + 1 < len(argv) else None
+        if sock is None: print("  --socket expects a path"); return 1
+        del argv[i:i + 2]
+    if serve:
+        server = TailServer(sock)
+        try: server.listen()
+        except OSError as e: print(f"  Cannot serve on {sock}: {e.strerror or e}"); return 1
+        print(f"  Serving tails on {sock} (Ctrl-C to stop)")
+        try: server.serve()
+        except KeyboardInterrupt: pass
+        return 0
+    if '--grid' in argv:
+        i = argv.index('--grid'); grid = parse_grid(argv[i + 1]) if i + 1 < len(argv) else None
+        if grid is None: print("  --grid expects ROWSxCOLS, e.g. --grid 4x6"); return 1
+        del argv[i:i + 2]
+    if '--claude' in argv:
+        config = load_config()
+        discovery = ClaudeDiscovery(config.get('claude_prompt', DEFAULT_CLAUDE_PROMPT), config.get('claude_cache_ttl', CLAUDE_CACHE_TTL), grid)
+        paths = list(discovery.paths)
         print(LOGO)
-        print(f"  Found {len(paths)} log file(s):\n")
-        for p in paths: print(f"    • {p}")
-        print("\n  Starting..."); time.sleep(0.3)
-        run_viewer(paths, layout, 10, show_full_path=True, reasons=reasons)
+        if paths:
+            print(f"  {len(paths)} log file(s) from the last answer for this directory:\n")
+            for p in paths: print(f"    • {p}")
+        print("\n  Asking Claude for recent & relevant log paths in the background..."); time.sleep(0.3)
+        run_viewer(paths, grid or auto_layout(len(paths)) or (2, 1), 10, show_full_path=True, reasons=dict(discovery.reasons), discover=discovery)
         return 0
-    elif len(sys.argv) > 1:
-        first_arg = os.path.expanduser(sys.argv[1])
+    elif argv:
+        first_arg = os.path.expanduser(argv[0])
         if os.path.isdir(first_arg):
             # Directory mode - existing behavior
-            count = int(sys.argv[2]) if len(sys.argv) > 2 and sys.argv[2].isdigit() else 9
-            result = quick_start(sys.argv[1], count)
+            count = int(argv[1]) if len(argv) > 1 and argv[1].isdigit() else grid[0] * grid[1] if grid else 9
+            if follow: follower = DirFollower(first_arg, load_config().get('extensions', DEFAULT_EXTENSIONS), count)
+            result = quick_start(argv[0], count, grid, follower)
         else:
             # Multiple file paths mode
-            paths = [os.path.expanduser(arg) for arg in sys.argv[1:] if os.path.exists(os.path.expanduser(arg))][:9]
+            paths = [p for p in map(_tile_arg, argv) if p]
             if not paths:
                 print("  No valid files provided")
                 return 1
-            layout = auto_layout(len(paths)) or (2, 1)
+            layout = grid or auto_layout(len(paths)) or (2, 1)
             print(LOGO)
             print(f"  Opening {len(paths)} file(s):\n")
             for p in paths: print(f"    • {p}")
             print("\n  Starting..."); time.sleep(0.3)
             result = (paths, layout, 10)
     else:
-        result = prompt_setup()
-    if result: run_viewer(*result); return 0
+        result, restore = prompt_setup() or (None, False)
+    if result: run_viewer(*result, follow=follower, attach=sock if attach else None, profile=profile, restore=restore); return 0
     return 1
 
 if __name__ == "__main__": sys.exit(main())
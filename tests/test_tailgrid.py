@@ -41,6 +41,27 @@ class TestReadLastNLines:
         f.write_text("line1\nline2\nline3")
         assert read_last_n_lines(str(f), 2) == ["line2", "line3"]
 
+    def test_spans_multiple_blocks(self, tmp_path, monkeypatch):
+        import tailgrid.__main__ as tg
+        monkeypatch.setattr(tg, "TAIL_BLOCK", 8)
+        f = tmp_path / "test.txt"
+        f.write_text("".join(f"line{i}\n" for i in range(100)))
+        assert tg.read_last_n_lines(str(f), 3) == ["line97", "line98", "line99"]
+
+    def test_mixed_line_endings(self, tmp_path, monkeypatch):
+        import tailgrid.__main__ as tg
+        monkeypatch.setattr(tg, "TAIL_BLOCK", 3)
+        f = tmp_path / "test.txt"
+        f.write_bytes("a\r\nb\rc\né\r\n".encode())
+        assert tg.read_last_n_lines(str(f), 3) == ["b", "c", "é"]
+
+    def test_long_lines_still_give_n_lines(self, tmp_path):
+        from tailgrid import read_last_n_lines
+        f = tmp_path / "test.txt"
+        f.write_bytes(b"".join(b"%d" % i + b"x" * (1 << 20) + b"\n" for i in range(12)))
+        lines = read_last_n_lines(str(f), 10)
+        assert len(lines) == 10 and lines[0].startswith("2x") and len(lines[-1]) == (1 << 20) + 2
+
 
 class TestTailTile:
     """Tests for TailTile class."""
@@ -79,6 +100,315 @@ class TestTailTile:
         tile.update()
         assert tile.update() is False
 
+    def test_update_reads_only_appended_bytes(self, tmp_path):
+        from tailgrid import TailTile
+        f = tmp_path / "test.txt"
+        f.write_text("line1\nline2\n")
+        tile = TailTile(str(f), lines=3)
+        tile.update()
+        with open(f, "a") as fh: fh.write("line3\nline4\n")
+        assert tile.update() is True
+        assert tile._offset == f.stat().st_size
+        assert tile.get_content() == ["line2", "line3", "line4"]
+
+    def test_partial_line_completed_later(self, tmp_path):
+        from tailgrid import TailTile
+        f = tmp_path / "test.txt"
+        f.write_text("line1\npart")
+        tile = TailTile(str(f), lines=5)
+        tile.update()
+        assert tile.get_content() == ["line1", "part"]
+        with open(f, "a") as fh: fh.write("ial\r\nline3\n")
+        tile.update()
+        assert tile.get_content() == ["line1", "partial", "line3"]
+
+    def test_truncation_reopens(self, tmp_path):
+        from tailgrid import TailTile
+        f = tmp_path / "test.txt"
+        f.write_text("old1\nold2\nold3\n")
+        tile = TailTile(str(f), lines=5)
+        tile.update()
+        f.write_text("new\n")
+        assert tile.update() is True
+        assert tile.get_content() == ["new"]
+
+    def test_rotation_reopens(self, tmp_path):
+        from tailgrid import TailTile
+        f = tmp_path / "app.log"
+        f.write_text("old1\nold2\n")
+        tile = TailTile(str(f), lines=5)
+        tile.update()
+        f.rename(tmp_path / "app.log.1")
+        f.write_text("fresh1\nfresh2\nfresh3\n")
+        assert tile.update() is True
+        assert tile.get_content() == ["fresh1", "fresh2", "fresh3"]
+
+    def test_total_lines_counted_then_incremental(self, tmp_path):
+        from tailgrid import TailTile
+        f = tmp_path / "test.txt"
+        f.write_text("".join(f"line{i}\n" for i in range(100)))
+        tile = TailTile(str(f), lines=5)
+        tile.update()
+        assert tile.total_lines() is None  # counting in the background
+        tile._count_thread.join()
+        assert tile.total_lines() == 100
+        with open(f, "a") as fh: fh.write("x\ny\npartial")
+        tile.update()
+        assert tile.total_lines() == 103
+
+    def test_total_lines_invalidated_by_truncation(self, tmp_path):
+        from tailgrid import TailTile
+        f = tmp_path / "test.txt"
+        f.write_text("a\nb\nc\n")
+        tile = TailTile(str(f), lines=5)
+        tile.update(); tile.total_lines(); tile._count_thread.join()
+        assert tile.total_lines() == 3
+        f.write_text("z\n")
+        tile.update()
+        assert tile.total_lines() is None
+        tile._count_thread.join()
+        assert tile.total_lines() == 1
+
+
+class TestOffscreenTiles:
+    """Tests for tiles on pages that are not currently shown."""
+
+    def test_hidden_tile_counts_without_reading_content(self, tmp_path):
+        from tailgrid import TailTile
+        f = tmp_path / "test.txt"
+        f.write_text("a\nb\n")
+        tile = TailTile(str(f), lines=5)
+        tile.set_visible(False)
+        tile.update()
+        assert tile.get_content() == []
+        with open(f, "a") as fh: fh.write("c\nd\ne\n")
+        assert tile.update() is True
+        assert tile.unseen == 3 and tile.get_content() == []
+        tile.set_visible(True)
+        assert tile.unseen == 0
+        assert tile.get_content() == ["a", "b", "c", "d", "e"]
+
+    def test_page_switch_keeps_following(self, tmp_path):
+        from tailgrid import TailTile
+        f = tmp_path / "test.txt"
+        f.write_text("a\n")
+        tile = TailTile(str(f), lines=2)
+        tile.update()
+        tile.set_visible(False)
+        with open(f, "a") as fh: fh.write("b\nc\n")
+        tile.update()
+        tile.set_visible(True)
+        with open(f, "a") as fh: fh.write("d\n")
+        tile.update()
+        assert tile.get_content() == ["c", "d"]
+
+
+class TestDamageTracking:
+    """Tests for TileRenderer repainting only the tiles that changed, on fake curses windows."""
+
+    def _renderer(self, tmp_path, monkeypatch, n=3):
+        import tailgrid.__main__ as tg
+        class Win:
+            def __init__(self, h, w, y=0, x=0): self.size, self.refreshes = (h, w), 0
+            def getmaxyx(self): return self.size
+            def noutrefresh(self): self.refreshes += 1
+            def addstr(self, *args): pass
+            insstr = erase = box = addstr
+        wins = []
+        monkeypatch.setattr(tg.curses, "newwin", lambda *a: wins.append(Win(*a)) or wins[-1])
+        for name in ("init_pair", "doupdate"): monkeypatch.setattr(tg.curses, name, lambda *a: None)
+        monkeypatch.setattr(tg.curses, "color_pair", lambda n: 0)
+        monkeypatch.setattr(tg.curses, "COLOR_PAIRS", 256, raising=False)
+        paths = [tmp_path / f"{i}.log" for i in range(n)]
+        for p in paths: p.write_text("first\n")
+        tiles = [tg.TailTile(str(p), 5) for p in paths]
+        for t in tiles: t.update()
+        return tg.TileRenderer(Win(30, 120), tiles, (1, n)), tiles, paths, wins
+
+    def test_updating_one_tile_repaints_only_that_tile(self, tmp_path, monkeypatch):
+        renderer, tiles, paths, wins = self._renderer(tmp_path, monkeypatch)
+        renderer.render()
+        tile_wins = wins[:3]
+        assert [w.refreshes for w in tile_wins] == [1, 1, 1]
+        renderer.render()  # nothing changed: no tile is repainted
+        assert [w.refreshes for w in tile_wins] == [1, 1, 1]
+        with open(paths[1], "a") as f: f.write("second\n")
+        tiles[1].update(); renderer.render()
+        assert [w.refreshes for w in tile_wins] == [1, 2, 1]
+        renderer.focused = 2; renderer.render()  # focus moves from tile 0: both borders change, tile 1 is left alone
+        assert [w.refreshes for w in tile_wins] == [2, 2, 2]
+
+    def test_invalidate_repaints_every_tile(self, tmp_path, monkeypatch):
+        renderer, tiles, paths, wins = self._renderer(tmp_path, monkeypatch)
+        renderer.render(); before = len(wins)
+        renderer.invalidate(); renderer.render()
+        assert len(wins) == 2 * before  # the tile windows and the footer are rebuilt
+        assert [w.refreshes for w in wins[before:]] == [1, 1, 1, 1]
+
+
+class TestLineStore:
+    """Tests for the byte-backed ring buffer behind each tile."""
+
+    def test_keeps_last_maxlen_lines(self):
+        from tailgrid.__main__ import LineStore
+        store = LineStore(3)
+        for i in range(10): store.extend(b"a%d\nb%d\n" % (i, i))
+        assert len(store) == 3 and store.tail(5) == ["b8", "a9", "b9"]
+        store.extend(b"".join(b"x%d\n" % i for i in range(1000)))
+        assert store.tail(2) == ["x998", "x999"] and store.nbytes() < 100
+
+    def test_universal_newlines_and_bad_utf8(self):
+        from tailgrid.__main__ import LineStore
+        store = LineStore(10)
+        store.extend(b"dos\r\nmac\r\xff\n\r\n")
+        assert store.tail(10) == ["dos", "mac", "\ufffd", ""]
+
+    def test_budget_drops_whole_old_lines(self):
+        from tailgrid.__main__ import LineStore
+        store = LineStore(budget=200)
+        for i in range(100): store.extend(b"line%03d\n" % i)
+        assert store.nbytes() <= 200
+        assert store.data().startswith(b"line") and store.tail(1) == ["line099"]
+        store.extend(b"y" * 500 + b"\n")  # a line over budget clears the store
+        assert len(store) == 0
+
+    def test_tail_releases_its_view_of_the_buffer(self):
+        from tailgrid.__main__ import LineStore
+        store = LineStore(4)
+        store.extend(b"a\nb\n" + b"x" * 70000 + b"\n")  # a short tail and a clipped long line both slice a view
+        assert store.tail(2)[0] == "b" and store.tail(1, pan=5)[0].endswith("bytes]")
+        for i in range(8): store.extend(b"c%d\n" % i)  # growing and cutting the bytearray would fail while exported
+        assert store.tail(2) == ["c6", "c7"]
+
+
+class TestScrollMode:
+    """Tests for scroll mode over the whole file via LineIndex."""
+
+    def test_scroll_reaches_start_of_file(self, tmp_path, monkeypatch):
+        import tailgrid.__main__ as tg
+        from tailgrid import TailTile
+        monkeypatch.setattr(tg, "INDEX_BLOCK", 16)
+        f = tmp_path / "test.txt"
+        f.write_text("".join(f"line{i}\n" for i in range(5000)))
+        tile = TailTile(str(f), lines=3)
+        tile.freeze()
+        assert tile.get_content() == ["line4997", "line4998", "line4999"]
+        assert tile.frozen_total() is None  # only the tail has been indexed
+        tile.scroll(10)
+        assert tile.get_content() == ["line4987", "line4988", "line4989"]
+        tile.scroll_top()
+        assert tile.get_content() == ["line0", "line1", "line2"]
+        assert tile.frozen_total() == 5000
+        tile.scroll(-1)
+        assert tile.get_content() == ["line1", "line2", "line3"]
+        tile.scroll_bottom()
+        assert tile.get_content() == ["line4997", "line4998", "line4999"]
+
+    def test_windows_keep_trailing_blank_lines(self, tmp_path, monkeypatch):
+        import gzip, re
+        import tailgrid.__main__ as tg
+        monkeypatch.setattr(tg, "INDEX_CACHE_DIR", tmp_path / "index")
+        data = b"2024-01-01 00:00:01 a\n\n2024-01-01 00:00:02 b\n\n\n"
+        (tmp_path / "p.log").write_bytes(data); (tmp_path / "z.log.gz").write_bytes(gzip.compress(data))
+        for name in ("p.log", "z.log.gz"):
+            index = tg._open_index(str(tmp_path / name))
+            assert index.window(0, 2) == ["", ""] and index.window(2, 2) == ["", "2024-01-01 00:00:02 b"]
+            assert index.window(1, 4) == ["2024-01-01 00:00:01 a", "", "2024-01-01 00:00:02 b", ""]
+            tile = tg.TailTile(str(tmp_path / name), lines=3)
+            tile.update(); tile.freeze()
+            assert tile.get_content() == ["2024-01-01 00:00:02 b", "", ""]
+        monkeypatch.setattr(tg, "MERGE_BATCH", 2)  # batch edges on blank lines must not repeat lines
+        merged = [line for _, _, line in tg.MergeIndex._backward(1, tg._open_index(str(tmp_path / "p.log")), re.compile(tg.DEFAULT_TIMESTAMP))]
+        assert merged == data.decode().split("\n")[-2::-1]
+
+    def test_growth_while_frozen_keeps_view(self, tmp_path):
+        from tailgrid import TailTile
+        f = tmp_path / "test.txt"
+        f.write_text("a\nb\nc\n")
+        tile = TailTile(str(f), lines=2)
+        tile.freeze()
+        with open(f, "a") as fh: fh.write("d\ne\n")
+        assert tile.update() is True
+        assert tile.get_content() == ["b", "c"]
+        tile.scroll_bottom()
+        assert tile.get_content() == ["d", "e"]
+
+    def test_freeze_empty_file(self, tmp_path):
+        from tailgrid import TailTile
+        f = tmp_path / "empty.txt"
+        f.write_text("")
+        tile = TailTile(str(f), lines=5)
+        tile.freeze()
+        tile.scroll(5)
+        assert tile.get_content() == []
+        assert tile.frozen_total() == 0
+
+
+class TestSearch:
+    """Tests for regex search in scroll mode and the live filter."""
+
+    def _settle(self, tile):
+        import time
+        for _ in range(500):
+            tile.update()
+            if tile.search_state()[1] is None: return tile.search_state()
+            time.sleep(0.01)
+        raise AssertionError("search did not finish")
+
+    def test_find_and_navigate(self, tmp_path, monkeypatch):
+        import tailgrid.__main__ as tg
+        from tailgrid import TailTile
+        monkeypatch.setattr(tg, "INDEX_BLOCK", 64)
+        monkeypatch.setattr(tg, "SEARCH_BLOCK", 100)
+        f = tmp_path / "test.txt"
+        f.write_text("".join(f"ERROR {i}\n" if i in (100, 2500, 4990) else f"line{i}\n" for i in range(5000)))
+        tile = TailTile(str(f), lines=5)
+        tile.update()
+        tile.find("ERR(OR)? \\d+")
+        assert tile.frozen
+        assert self._settle(tile) == ("ERR(OR)? \\d+", None, False)
+        assert tile.get_content()[2] == "ERROR 4990"
+        tile.find_next()
+        self._settle(tile)
+        assert tile.get_content()[2] == "ERROR 2500"
+        tile.find_next()
+        self._settle(tile)
+        assert tile.get_content()[:3] == ["line98", "line99", "ERROR 100"]
+        tile.find_next()
+        assert self._settle(tile)[2] is True  # nothing older: the view stays put
+        assert "ERROR 100" in tile.get_content()
+        tile.find_next(backward=False)
+        self._settle(tile)
+        assert tile.get_content()[2] == "ERROR 2500"
+
+    def test_find_from_scrolled_view(self, tmp_path):
+        from tailgrid import TailTile
+        f = tmp_path / "test.txt"
+        f.write_text("".join(f"x{i}\n" for i in range(100)))
+        tile = TailTile(str(f), lines=3)
+        tile.freeze()
+        tile.scroll(50)  # bottom line is now x49
+        tile.find("x[0-9]5$")
+        self._settle(tile)
+        assert tile.get_content() == ["x44", "x45", "x46"]
+
+    def test_filter_tail_and_appends(self, tmp_path):
+        from tailgrid import TailTile
+        f = tmp_path / "test.txt"
+        f.write_text("".join(f"{'err' if i % 3 == 0 else 'ok'} {i}\n" for i in range(30)))
+        tile = TailTile(str(f), lines=3)
+        tile.update()
+        tile.set_filter("^err")
+        assert tile.get_content() == ["err 21", "err 24", "err 27"]
+        with open(f, "a") as fh: fh.write("ok 30\nerr 31\nok 32\nerr 3")
+        tile.update()
+        assert tile.get_content() == ["err 27", "err 31", "err 3"]
+        with open(f, "a") as fh: fh.write("3\nok 34\n")
+        tile.update()
+        assert tile.get_content() == ["err 27", "err 31", "err 33"]
+        tile.set_filter(None)
+        assert tile.get_content() == ["ok 32", "err 33", "ok 34"]
+
 
 class TestClamp:
     """Tests for clamp function."""
@@ -97,6 +427,17 @@ class TestClamp:
         assert clamp(50, 1, 100) == 50
 
 
+class TestConfig:
+    """Tests for the shipped config.json template."""
+
+    def test_template_lists_every_default(self):
+        import json
+        from pathlib import Path
+        import tailgrid.__main__ as tg
+        template = json.loads((Path(tg.__file__).parent / "config.json").read_text())
+        assert template == tg.DEFAULT_CONFIG
+
+
 class TestLayouts:
     """Tests for layout configurations."""
 
@@ -143,4 +484,930 @@ class TestAutoLayout:
         from tailgrid import auto_layout
         assert auto_layout(10) == (3, 3)
 
+    def test_parse_grid(self):
+        from tailgrid.__main__ import parse_grid
+        assert parse_grid("4x6") == (4, 6)
+        assert parse_grid("0x3") is None
+        assert parse_grid("big") is None
+
+    def test_layout_name_counts_pages(self):
+        from tailgrid.__main__ import layout_name
+        assert layout_name((3, 3), 9) == "3x3 Grid"
+        assert layout_name((3, 3), 30) == "3x3 Grid, 4 pages"
+        assert layout_name((2, 1), 2) == "Vertical"
+
+
+class TestWatcher:
+    """Tests for the inotify watcher backend."""
+
+    def test_reports_changed_file(self, tmp_path):
+        from tailgrid.__main__ import make_watcher
+        watcher = make_watcher()
+        if watcher is None: pytest.skip("inotify not available")
+        a, b = tmp_path / "a.log", tmp_path / "b.log"
+        a.write_text(""); b.write_text("")
+        try:
+            assert watcher.add(str(a), 0) and watcher.add(str(b), 1)
+            assert watcher.read() == set()
+            with open(b, "a") as fh: fh.write("x\n")
+            assert watcher.read() == {1}
+        finally: watcher.close()
+
+    def test_sees_file_created_after_start(self, tmp_path):
+        from tailgrid.__main__ import make_watcher
+        watcher = make_watcher()
+        if watcher is None: pytest.skip("inotify not available")
+        try:
+            assert watcher.add(str(tmp_path / "later.log"), 7)
+            (tmp_path / "later.log").write_text("hello\n")
+            assert watcher.read() == {7}
+        finally: watcher.close()
+
+
+class TestDirFollower:
+    """Tests for --follow-dir tile reassignment."""
+
+    def _dir(self, tmp_path, n):
+        import os
+        for i in range(n):
+            f = tmp_path / f"job{i}.log"
+            f.write_text(f"job {i}\n"); os.utime(f, (1000 + i, 1000 + i))
+        (tmp_path / "notes.md").write_text("skip me\n")
+
+    def test_selects_newest_matching(self, tmp_path):
+        from tailgrid.__main__ import DirFollower
+        self._dir(tmp_path, 5)
+        follower = DirFollower(str(tmp_path), [".log"], 3)
+        assert follower.selected == ["job4.log", "job3.log", "job2.log"]
+
+    def test_newer_file_takes_the_oldest_slot(self, tmp_path):
+        import os
+        from tailgrid.__main__ import DirFollower
+        self._dir(tmp_path, 5)
+        follower = DirFollower(str(tmp_path), [".log"], 3)
+        os.utime(tmp_path / "job3.log", (2000, 2000))
+        assert follower.changed({"job3.log"}) == []  # already on screen: nothing to recompute
+        os.utime(tmp_path / "job0.log", (3000, 3000))
+        assert follower.changed({"job0.log", "notes.md"}) == [(2, str(tmp_path / "job0.log"))]
+        (tmp_path / "job4.log").unlink()
+        assert follower.changed({"job4.log"}) == [(0, str(tmp_path / "job2.log"))]
+        assert follower.selected == ["job2.log", "job3.log", "job0.log"]
+
+    def test_polled_rescan_adds_new_files(self, tmp_path):
+        import os, threading
+        from tailgrid.__main__ import DirFollower
+        follower, done = DirFollower(str(tmp_path), [".log"], 3), threading.Event()
+        assert follower.paths == []
+        follower.on_done = done.set
+        follower.check()
+        assert not done.wait(0.1)  # directory unchanged: no rescan
+        (tmp_path / "new.log").write_text("x\n"); os.utime(tmp_path, (5000, 5000))
+        follower.check()
+        assert done.wait(2)
+        assert follower.take() == [(0, str(tmp_path / "new.log"))]
+
+    def test_polled_restat_sees_an_appended_file(self, tmp_path, monkeypatch):
+        import os, threading
+        import tailgrid.__main__ as tg
+        self._dir(tmp_path, 5); os.utime(tmp_path, (5000, 5000))
+        follower, done = tg.DirFollower(str(tmp_path), [".log"], 3), threading.Event()
+        follower.on_done = done.set
+        monkeypatch.setattr(tg, "FOLLOW_RESTAT", 0)
+        follower._next_restat = 0
+        os.utime(tmp_path / "job0.log", (9000, 9000))  # appended to: the directory's mtime stays put
+        follower.check()
+        assert done.wait(2)
+        assert follower.take() == [(2, str(tmp_path / "job0.log"))]
+
+    def test_inotify_reports_directory_entries(self, tmp_path):
+        from tailgrid.__main__ import make_watcher
+        watcher = make_watcher()
+        if watcher is None: pytest.skip("inotify not available")
+        try:
+            assert watcher.add_dir(str(tmp_path), "dir")
+            (tmp_path / "fresh.log").write_text("x\n")
+            assert ("dir", "fresh.log") in watcher.read()
+        finally: watcher.close()
+
+
+class TestTileReader:
+    """Tests for the background per-tile reader."""
+
+    def _reader(self, tile):
+        import os, queue
+        from tailgrid.__main__ import TileReader
+        results, (r, w) = queue.Queue(), os.pipe()
+        return TileReader(tile, 0, results, w, timeout=0.05), results
+
+    def test_publishes_snapshots(self, tmp_path):
+        from tailgrid import TailTile
+        f = tmp_path / "test.txt"
+        f.write_text("line1\nline2\n")
+        reader, results = self._reader(TailTile(str(f), lines=5))
+        reader.update()
+        idx, snap = results.get(timeout=2)
+        assert idx == 0 and snap.lines == ("line1", "line2")
+        reader.snap = snap
+        assert reader.get_content() == ("line1", "line2")  # the snapshot's own tuple, not a copy
+
+    def test_blocked_tile_reports_stalled(self, tmp_path):
+        import threading
+        from tailgrid import TailTile
+        f = tmp_path / "test.txt"
+        f.write_text("line1\n")
+        tile, release = TailTile(str(f), lines=5), threading.Event()
+        tile.update = lambda: release.wait()
+        reader, results = self._reader(tile)
+        reader.update()
+        time.sleep(0.1)
+        assert reader.stalled()
+        reader.freeze()  # queued behind the blocked read; the caller returns immediately
+        assert reader.frozen
+        release.set()
+        results.get(timeout=2)
+        assert not reader.stalled()
+
+    def test_rate_tracks_appended_lines_and_decays(self, tmp_path):
+        from tailgrid import TailTile
+        from tailgrid.__main__ import TileSnapshot
+        f = tmp_path / "test.txt"
+        f.write_text("")
+        reader, _ = self._reader(TailTile(str(f), lines=5))
+        snap = lambda n: TileSnapshot((), total=n, appended=n)
+        reader.receive(snap(0), now=100.0)
+        reader.receive(snap(500), now=100.5)
+        reader.receive(snap(2000), now=101.0)
+        assert reader.rate(now=101.0) == 2000
+        assert reader.rate(now=103.0) == 0
+
+    def test_floods_are_read_once_per_interval(self, tmp_path):
+        from tailgrid import TailTile
+        f = tmp_path / "test.txt"
+        f.write_text("")
+        tile, calls = TailTile(str(f), lines=5), []
+        tile.update = lambda: calls.append(time.monotonic())
+        reader, _ = self._reader(tile)
+        reader.min_interval = 0.05
+        for _ in range(20):
+            reader.update(); time.sleep(0.005)
+        time.sleep(0.1)
+        assert 2 <= len(calls) <= 5
+
+
+class TestCompressed:
+    """Tests for gzip/bz2/xz tiles and rotation chains."""
+
+    def _log(self, lo, hi): return "".join(f"line{i}\n" for i in range(lo, hi)).encode()
+
+    def test_gzip_tail_scroll_and_search(self, tmp_path, monkeypatch):
+        import gzip, time
+        import tailgrid.__main__ as tg
+        from tailgrid import TailTile
+        monkeypatch.setattr(tg, "INDEX_CACHE_DIR", tmp_path / "index")
+        monkeypatch.setattr(tg, "CHECKPOINT_STEP", 4096)
+        monkeypatch.setattr(tg, "INDEX_BLOCK", 512)  # compressed bytes read per step, so checkpoints land often
+        f = tmp_path / "app.log.1.gz"
+        f.write_bytes(gzip.compress(self._log(0, 5000)))
+        tile = TailTile(str(f), lines=3)
+        tile.update()
+        assert tile.get_content() == ["line4997", "line4998", "line4999"]
+        assert tile.total_lines() == 5000
+        tile.freeze()
+        assert len(tile._index._ckpts) > 5
+        tile.scroll(2500)
+        assert tile.get_content() == ["line2497", "line2498", "line2499"]
+        tile.scroll_top()
+        assert tile.get_content() == ["line0", "line1", "line2"]
+        tile.scroll_bottom()
+        tile.find("line1234$")
+        for _ in range(500):
+            tile.update()
+            if tile.search_state()[1] is None: break
+            time.sleep(0.01)
+        assert "line1234" in tile.get_content()
+
+    def test_bz2_and_xz_by_magic(self, tmp_path, monkeypatch):
+        import bz2, lzma
+        import tailgrid.__main__ as tg
+        from tailgrid import TailTile, read_last_n_lines
+        monkeypatch.setattr(tg, "INDEX_CACHE_DIR", tmp_path / "index")
+        for name, data in (("a.log.2", bz2.compress(self._log(0, 100))), ("b.log.3", lzma.compress(self._log(0, 100)))):
+            (tmp_path / name).write_bytes(data)
+            tile = TailTile(str(tmp_path / name), lines=2)
+            tile.update()
+            assert tile.get_content() == ["line98", "line99"]
+            tile.freeze()
+            tile.scroll_top()
+            assert tile.get_content() == ["line0", "line1"]
+
+    def test_index_cache_skips_inflating(self, tmp_path, monkeypatch):
+        import gzip
+        import tailgrid.__main__ as tg
+        monkeypatch.setattr(tg, "INDEX_CACHE_DIR", tmp_path / "index")
+        f = tmp_path / "app.log.1.gz"
+        f.write_bytes(gzip.compress(self._log(0, 1000)))
+        tg.CompressedIndex(str(f), "gzip")
+        assert len(list((tmp_path / "index").iterdir())) == 1
+        cached = tg.CompressedIndex(str(f), "gzip")
+        assert cached._ckpts is None  # tail and line count came from the cache
+        assert cached.window(0, 2) == ["line998", "line999"] and cached.total() == 1000
+        assert cached._ckpts is None
+        assert cached.window(990, 2) == ["line8", "line9"]  # older lines build the checkpoints on demand
+
+    def test_rotation_chain(self, tmp_path, monkeypatch):
+        import gzip, os
+        import tailgrid.__main__ as tg
+        from tailgrid import TailTile
+        monkeypatch.setattr(tg, "INDEX_CACHE_DIR", tmp_path / "index")
+        log = tmp_path / "app.log"
+        (tmp_path / "app.log.2.gz").write_bytes(gzip.compress(self._log(0, 10)))
+        (tmp_path / "app.log.1").write_bytes(self._log(10, 20))
+        log.write_bytes(self._log(20, 30))
+        os.utime(tmp_path / "app.log.2.gz", (1, 1)); os.utime(tmp_path / "app.log.1", (2, 2))
+        tile = TailTile(f"chain:{log}", lines=4)
+        assert tile.chain and tile.filepath == str(log)
+        tile.update()
+        assert tile.get_content() == ["line26", "line27", "line28", "line29"]
+        tile.freeze()
+        tile.scroll(8)
+        assert tile.get_content() == ["line18", "line19", "line20", "line21"]
+        tile.scroll_top()
+        assert tile.get_content() == ["line0", "line1", "line2", "line3"]
+        assert tile.frozen_total() == 30
+
+
+class TestCommandTile:
+    """Tests for cmd: tiles fed from a command's pipe."""
+
+    def _drain(self, tile):
+        import select, time
+        fd = tile.spawn()
+        while select.select([fd], [], [], 5)[0]:
+            data = tile.read()
+            if data == b'':
+                while (status := tile.reap(time.monotonic())) is None: time.sleep(0.01)
+                return status
+            if data: tile.feed(data)
+        raise AssertionError("command did not finish")
+
+    def test_reap_never_blocks_and_escalates_to_sigkill(self, monkeypatch):
+        import select, signal, time
+        import tailgrid.__main__ as tg
+        monkeypatch.setattr(tg, "CMD_REAP_GRACE", 0.2)
+        tile = tg.CommandTile("cmd:trap '' TERM; exec >&- 2>&-; sleep 30", lines=5)
+        fd = tile.spawn()
+        assert select.select([fd], [], [], 5)[0] and tile.read() == b''
+        start, status, slowest = time.monotonic(), None, 0.0
+        while status is None and time.monotonic() - start < 5:
+            t = time.monotonic(); status = tile.reap(t); slowest = max(slowest, time.monotonic() - t)
+            time.sleep(0.01)
+        assert status == -signal.SIGKILL and tile._signalled == signal.SIGKILL
+        assert slowest < 0.1 and time.monotonic() - start < 2
+
+    def test_reads_stdout_and_stderr(self):
+        from tailgrid import CommandTile
+        tile = CommandTile("cmd:echo out; echo err >&2; printf partial; exit 3", lines=5)
+        status = self._drain(tile)
+        assert status == 3
+        assert tile.get_content() == ["out", "err", "partial"]
+        tile.exited(status)
+        assert tile.get_content() == ["out", "err", "partial", "[exited with status 3]"]
+        assert tile.total_lines() == 4 and tile.filepath == "cmd:echo out; echo err >&2; printf partial; exit 3"
+
+    def test_scrollback_is_bounded_and_scrollable(self):
+        from tailgrid import CommandTile
+        tile = CommandTile("cmd:true", lines=3, scrollback=100)
+        for i in range(100): tile.feed(f"line{i:03d}\n".encode())
+        assert tile._history.nbytes() <= 100
+        assert tile.get_content() == ["line097", "line098", "line099"]
+        tile.freeze()
+        tile.scroll_top()
+        top = tile.get_content()[0]
+        assert top.startswith("line0") and top > "line080"  # older output was dropped at a line boundary
+        tile.scroll_bottom()
+        assert tile.get_content() == ["line097", "line098", "line099"]
+
+    def test_search_filter_and_resize(self):
+        from tailgrid import CommandTile
+        tile = CommandTile("cmd:true", lines=2)
+        tile.feed(b"".join(b"ok %d\n" % i if i % 10 else b"ERROR %d\n" % i for i in range(50)))
+        tile.set_filter("ERROR")
+        assert tile.get_content() == ["ERROR 30", "ERROR 40"]
+        tile.feed(b"ok 50\nERROR 51\n")
+        assert tile.get_content() == ["ERROR 40", "ERROR 51"]
+        tile.set_filter(None); tile.resize(3)
+        assert tile.get_content() == ["ok 49", "ok 50", "ERROR 51"]
+        tile.find("ERROR 2")
+        for _ in range(500):
+            tile.update()
+            if tile.search_state()[1] is None: break
+            time.sleep(0.01)
+        assert "ERROR 20" in tile.get_content()
+
+    def test_reader_tracks_pending_bytes(self):
+        import os, queue
+        from tailgrid import CommandTile, TileReader
+        r, w = os.pipe()
+        reader = TileReader(CommandTile("cmd:true", lines=2), 0, queue.Queue(), w)
+        reader.feed(b"a\nb\n"); reader.feed(b"c\n")
+        assert reader.fed == 6
+        for _ in range(200):
+            if not reader.pending: break
+            time.sleep(0.01)
+        assert reader.pending == 0 and reader.tile.get_content() == ["b", "c"]
+
+    def test_cmd_argument_skips_existence_check(self):
+        from tailgrid.__main__ import _tile_arg
+        assert _tile_arg("cmd:journalctl -f") == "cmd:journalctl -f"
+        assert _tile_arg("cmd:  ") is None
+
+
+class TestLongLines:
+    """Tests for bounded decoding of huge lines and the hexdump view of binary files."""
+
+    def test_huge_line_is_clipped_and_panned_by_bytes(self, tmp_path, monkeypatch):
+        import tailgrid.__main__ as tg
+        from tailgrid import TailTile
+        monkeypatch.setattr(tg, "LINE_WINDOW", 100)
+        f = tmp_path / "min.json"
+        f.write_bytes(b"head\n" + b"".join(b"%06d," % i for i in range(10000)) + b"\ntail\n")
+        tile = TailTile(str(f), lines=3)
+        tile.update()
+        head, big, tail = tile.get_content()
+        assert (head, tail) == ("head", "tail")
+        assert big.startswith("000000,") and big.endswith(" …[+69900 bytes]") and len(big) < 150
+        tile.pan(7 * 5000)
+        assert tile.get_content()[1].startswith("005000,") and tile.get_content()[2] == ""
+        tile.freeze()
+        assert tile.get_content()[1].startswith("005000,")
+
+    def test_runaway_partial_line_is_cut(self, tmp_path, monkeypatch):
+        import tailgrid.__main__ as tg
+        from tailgrid import TailTile
+        monkeypatch.setattr(tg, "MAX_LINE", 1000)
+        f = tmp_path / "test.txt"
+        f.write_text("a\n")
+        tile = TailTile(str(f), lines=3)
+        tile.update()
+        for _ in range(5):
+            with open(f, "a") as fh: fh.write("x" * 800)
+            tile.update()
+        assert len(tile._partial) == 1000
+        with open(f, "a") as fh: fh.write("x" * 10 + "\nb\n")
+        tile.update()
+        assert tile.get_content() == ["a", "x" * 1000, "b"]
+
+    def test_binary_file_shows_hexdump(self, tmp_path):
+        from tailgrid import TailTile
+        f = tmp_path / "blob.bin"
+        f.write_bytes(b"\x7fELF" + bytes(256) * 8 + b"MAGIC" + bytes(23))
+        tile = TailTile(str(f), lines=2)
+        tile.update()
+        assert tile.binary
+        assert tile.get_content() == ["00000800  00 00 00 00 4d 41 47 49 43 00 00 00 00 00 00 00  |....MAGIC.......|",
+                                      "00000810  00 00 00 00 00 00 00 00 00 00 00 00 00 00 00 00  |................|"]
+        tile.freeze()
+        tile.scroll_top()
+        assert tile.get_content()[0].startswith("00000000  7f 45 4c 46")
+        tile.scroll_bottom(); tile.scroll(10)
+        tile.find("MAGIC", backward=False)
+        for _ in range(500):
+            tile.update()
+            if tile.search_state()[1] is None: break
+            time.sleep(0.01)
+        assert "MAGIC" in tile.get_content()[0] + tile.get_content()[1]
+
+
+class TestWrap:
+    """Tests for display-width wrapping of wide characters and tabs."""
+
+    def test_ascii_wraps_by_length(self):
+        from tailgrid.__main__ import _wrap
+        assert _wrap("abcdefg", 3) == ("abc", "def", "g")
+        assert _wrap("", 3) == ("",)
+
+    def test_wide_and_combining_characters(self):
+        from tailgrid.__main__ import _wrap, _width
+        assert _width("日本語") == 6 and _width("é") == 1 and _width("🙂x") == 3
+        assert _wrap("日本語テキスト", 5) == ("日本", "語テ", "キス", "ト")
+        assert _wrap("ab日c", 3) == ("ab", "日c")
+        assert _wrap("ééé", 2) == ("éé", "é")
+
+    def test_tabs_expand_to_stops_and_layouts_are_memoized(self):
+        from tailgrid.__main__ import _wrap
+        _wrap.cache_clear()
+        assert _wrap("a\tb", 20) == ("a       b",)
+        assert _wrap("日\tx", 20) == ("日      x",)
+        _wrap("a\tb", 20)
+        assert _wrap.cache_info().hits == 1
+
+
+class TestMerge:
+    """Tests for the merged timeline view."""
+
+    def test_interleaves_by_timestamp_with_tile_tags(self, tmp_path):
+        from tailgrid.__main__ import MergeTile
+        a, b = tmp_path / "a.log", tmp_path / "b.log"
+        a.write_text("2024-01-01 00:00:01 a1\n2024-01-01 00:00:03 a3\n  at frame\n")
+        b.write_text("2024-01-01 00:00:02 b2\n2024-01-01T00:00:04,5 b4\n")
+        tile = MergeTile([(1, str(a)), (2, str(b))], lines=10)
+        tile.update()
+        assert tile.get_content() == ["[1] 2024-01-01 00:00:01 a1", "[2] 2024-01-01 00:00:02 b2",
+                                      "[1] 2024-01-01 00:00:03 a3", "[1]   at frame", "[2] 2024-01-01T00:00:04,5 b4"]
+
+    def test_appends_are_merged_without_resorting_history(self, tmp_path):
+        from tailgrid.__main__ import MergeTile
+        a, b = tmp_path / "a.log", tmp_path / "b.log"
+        a.write_text("2024-01-01 00:00:05 a5\n")
+        b.write_text("2024-01-01 00:00:06 b6\n")
+        tile = MergeTile([(1, str(a)), (2, str(b))], lines=10)
+        tile.update()
+        with open(b, "a") as f: f.write("2024-01-01 00:00:09 b9\n")
+        with open(a, "a") as f: f.write("2024-01-01 00:00:07 a7\n2024-01-01 00:00:08 a")
+        assert tile.update()
+        assert tile.get_content()[2:] == ["[1] 2024-01-01 00:00:07 a7", "[2] 2024-01-01 00:00:09 b9"]
+        with open(a, "a") as f: f.write("8\n")
+        tile.update()
+        assert tile.get_content()[-1] == "[1] 2024-01-01 00:00:08 a8"
+        assert not tile.update()
+
+    def test_scroll_mode_merges_history_and_searches_it(self, tmp_path):
+        import time
+        from tailgrid.__main__ import MergeTile
+        a, b = tmp_path / "a.log", tmp_path / "b.log"
+        a.write_text("".join(f"2024-01-01 00:00:00.{i:05d} a{i}\n  detail {i}\n" for i in range(0, 6000, 2)))
+        b.write_text("".join(f"2024-01-01 00:00:00.{i:05d} b{i}\n" for i in range(1, 6000, 2)))
+        tile = MergeTile([(1, str(a)), (2, str(b))], lines=4)
+        tile.update()
+        tile.freeze()
+        assert tile.get_content() == ["[2] 2024-01-01 00:00:00.05997 b5997", "[1] 2024-01-01 00:00:00.05998 a5998",
+                                      "[1]   detail 5998", "[2] 2024-01-01 00:00:00.05999 b5999"]
+        tile.scroll_top()
+        assert tile.frozen_total() == 9000
+        assert tile.get_content() == ["[1] 2024-01-01 00:00:00.00000 a0", "[1]   detail 0",
+                                      "[2] 2024-01-01 00:00:00.00001 b1", "[1] 2024-01-01 00:00:00.00002 a2"]
+        tile.scroll_bottom()
+        tile.find("b101$")
+        for _ in range(500):
+            tile.update()
+            if tile.search_state()[1] is None: break
+            time.sleep(0.01)
+        content = tile.get_content()
+        assert "[2] 2024-01-01 00:00:00.00101 b101" in content
+        assert content.index("[2] 2024-01-01 00:00:00.00101 b101") > content.index("[1]   detail 100")
+
+    def test_sources_are_sniffed_on_first_update_not_at_construction(self, tmp_path, monkeypatch):
+        import gzip, re
+        import pytest
+        import tailgrid.__main__ as tg
+        a, z = tmp_path / "a.log", tmp_path / "z.log.gz"
+        a.write_text("2024-01-01 00:00:01 a1\n")
+        with gzip.open(z, "wt") as f: f.write("2024-01-01 00:00:02 z2\n")
+        sniffed, real = [], tg._compression
+        monkeypatch.setattr(tg, "_compression", lambda p: sniffed.append(p) or real(p))
+        tile = tg.MergeTile([(1, str(a)), (2, str(z))], lines=10)
+        assert sniffed == []
+        tile.update()
+        assert sorted(sniffed) == [str(a), str(z)]
+        assert tile.get_content() == ["[1] 2024-01-01 00:00:01 a1"]  # the gzip source can't be followed
+        with pytest.raises(re.error): tg.MergeTile([(1, str(a))], pattern="(")
+
+
+class TestHighlight:
+    """Tests for config highlight rules."""
+
+    def test_rules_scan_in_one_pass_and_earlier_rules_win(self):
+        from tailgrid.__main__ import Highlighter
+        hl = Highlighter({r"\bERROR\b": "red bold", "ERR": "blue", "(": "green", r"[0-9a-f]{8}-[0-9a-f]{4}": "dim"})
+        assert hl.styles == ["red bold", "blue", "dim"]  # the invalid rule is skipped
+        assert hl.spans("x ERROR y ERRNO 1234abcd-ffff") == ((2, 7, 0), (10, 13, 1), (16, 29, 2))
+        assert Highlighter({}).spans("ERROR") == ()
+
+    def test_global_flags_are_scoped_and_backrefs_skipped(self):
+        from tailgrid.__main__ import Highlighter
+        hl = Highlighter({"(?i)error": "red", r"(a)\1": "blue", r"\\1": "dim", "ok": "green"})
+        assert hl.styles == ["red", "dim", "green"]
+        assert hl.spans("x ERROR aa \\1 ok") == ((2, 7, 0), (11, 13, 1), (14, 16, 2))
+
+    def test_rules_that_cannot_be_joined_are_scanned_one_by_one(self):
+        from tailgrid.__main__ import Highlighter
+        hl = Highlighter({"(?P<lvl>WARN)": "yellow", "(?P<lvl>WARNING|ERROR)": "red", "x": "dim"})
+        assert hl.styles == ["yellow", "red", "dim"]
+        assert hl.spans("WARNING ERROR x") == ((0, 4, 0), (8, 13, 1), (14, 15, 2))
+
+    def test_spans_are_memoized_per_line(self):
+        from tailgrid.__main__ import Highlighter
+        hl = Highlighter({"WARN": "yellow"})
+        for _ in range(3): hl.spans("a WARN b")
+        hl.spans("another line")
+        assert (hl.spans.cache_info().hits, hl.spans.cache_info().misses) == (2, 2)
+
+    def test_runs_follow_wrapping_and_tabs(self):
+        from tailgrid.__main__ import _wrap_runs
+        assert _wrap_runs("ab ERROR cd", 4, ((3, 8, 0),)) == ((("ab ", None), ("E", 0)), (("RROR", 0),), ((" cd", None),))
+        assert _wrap_runs("a\tWARN", 20, ((1, 6, 1),)) == ((("a", None), ("       WARN", 1)),)
+        assert _wrap_runs("plain", 20, ()) == ((("plain", None),),)
+
+
+class TestAnsi:
+    """Tests for ANSI SGR colour passthrough."""
+
+    def test_sgr_codes_become_spans_and_other_sequences_are_dropped(self):
+        import curses
+        from tailgrid.__main__ import _ansi
+        line = "\x1b[1;31mERROR\x1b[0m ok \x1b]0;title\x07\x1b[2Kdone\x1b(B\x1b"
+        assert _ansi(line) == ("ERROR ok done", ((0, 5, (1, None, curses.A_BOLD)),))
+        assert _ansi("plain") == ("plain", ())
+
+    def test_sgr_colour_forms(self):
+        from tailgrid.__main__ import _sgr, SGR_RESET
+        assert _sgr(SGR_RESET, "38;5;208;48;5;17") == (208, 17, 0)
+        assert _sgr(SGR_RESET, "38;2;255;0;0") == (196, None, 0)
+        assert _sgr(SGR_RESET, "97;104") == (15, 12, 0)
+        assert _sgr((1, 2, 0), "") == SGR_RESET
+        assert _sgr((1, 2, 0), "39") == (None, 2, 0)
+
+    def test_pan_skips_visible_characters_only(self, tmp_path):
+        from tailgrid.__main__ import TailTile, _ansi
+        f = tmp_path / "color.log"
+        f.write_bytes(b"\x1b[32mgreen\x1b[0m and plain\n")
+        tile = TailTile(str(f), lines=1)
+        tile.update()
+        tile.pan(3)
+        assert _ansi(tile.get_content()[0])[0] == "en and plain"
+        assert _ansi(tile.get_content()[0])[1] == ((0, 2, (2, None, 0)),)
+
+
+class TestServe:
+    """Tests for the --serve daemon and --attach viewers."""
+
+    def test_frames_round_trip_in_pieces(self):
+        import pytest
+        from tailgrid.__main__ import FrameReader, _frame, FRAME_HEADER
+        data = _frame({"op": "sub", "path": "a.log", "lines": 3}) + _frame({"op": "unsub", "path": "a.log"})
+        reader = FrameReader()
+        assert reader.feed(data[:5]) == []
+        assert reader.feed(data[5:]) == [{"op": "sub", "path": "a.log", "lines": 3}, {"op": "unsub", "path": "a.log"}]
+        with pytest.raises(ValueError): FrameReader().feed(FRAME_HEADER.pack(1 << 30))
+
+    def test_shared_tile_hands_out_deltas(self, tmp_path):
+        from tailgrid.__main__ import SharedTile
+        f = tmp_path / "a.log"
+        f.write_text("one\ntwo\n")
+        tile = SharedTile(str(f), lines=5)
+        tile.update()
+        assert tile.take() == (True, b"one\ntwo\n")
+        with open(f, "a") as fh: fh.write("three\nfo")
+        tile.update()
+        assert tile.take() == (False, b"three\nfo")
+        assert tile.state() == b"one\ntwo\nthree\nfo"
+        assert tile.take() == (False, b"")
+
+    def test_viewers_share_one_tile_and_get_appends(self, tmp_path):
+        import base64, select, threading, time
+        from tailgrid.__main__ import TailServer, ServerLink, RemoteTile
+        f, sock = tmp_path / "a.log", str(tmp_path / "serve.sock")
+        f.write_text("one\ntwo\n")
+        server, stop = TailServer(sock), threading.Event()
+        server.listen()
+        thread = threading.Thread(target=server.serve, args=(stop.is_set,), daemon=True)
+        thread.start()
+        links = [ServerLink(sock) for _ in range(2)]
+        tiles = [RemoteTile(str(f), 5, link) for link in links]
+        def pump(until):
+            for _ in range(100):
+                for link, tile in zip(links, tiles):
+                    if select.select([link.sock], [], [], 0.01)[0]:
+                        for m in link.read() or (): tile.apply(m["reset"], base64.b64decode(m["data"]), m["total"], m["binary"])
+                if until(): return
+        try:
+            pump(lambda: all(t.get_content() == ["one", "two"] for t in tiles))
+            assert len(server.tiles) == 1
+            with open(f, "a") as fh: fh.write("three\n")
+            pump(lambda: all(t.get_content()[-1:] == ["three"] for t in tiles))
+            assert [t.get_content() for t in tiles] == [["one", "two", "three"]] * 2
+            links[0].close(); links[1].close()
+            for _ in range(100):
+                if not server.tiles: break
+                time.sleep(0.01)
+            assert not server.tiles
+        finally:
+            stop.set(); thread.join()
+        assert not (tmp_path / "serve.sock").exists()
+
+    def test_malformed_request_drops_only_that_client(self, tmp_path):
+        import json, socket, threading
+        from tailgrid.__main__ import TailServer, ServerLink, FRAME_HEADER
+        f, sock = tmp_path / "a.log", str(tmp_path / "serve.sock")
+        f.write_text("one\n")
+        server, stop = TailServer(sock), threading.Event()
+        server.listen()
+        thread = threading.Thread(target=server.serve, args=(stop.is_set,), daemon=True)
+        thread.start()
+        try:
+            for bad in ([1, 2], "sub", {"op": "sub", "path": str(f), "lines": "x"}, {"op": "sub", "path": str(f), "lines": 0}):
+                raw = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                raw.connect(sock)
+                data = json.dumps(bad).encode()
+                raw.sendall(FRAME_HEADER.pack(len(data)) + data)
+                raw.settimeout(5)
+                assert raw.recv(1) == b""  # the daemon hung up on it
+                raw.close()
+            link = ServerLink(sock)
+            link.subscribe(str(f), 2)
+            link.sock.settimeout(5)
+            msgs = []
+            while not msgs: msgs = link.read()
+            assert msgs[0]["path"] == str(f) and thread.is_alive()
+            link.close()
+        finally:
+            stop.set(); thread.join()
+
+    def test_unsub_without_sub_keeps_serving(self, tmp_path):
+        import base64, threading
+        from tailgrid.__main__ import TailServer, ServerLink
+        f, sock = tmp_path / "a.log", str(tmp_path / "serve.sock")
+        f.write_text("one\n")
+        server, stop = TailServer(sock), threading.Event()
+        server.listen()
+        thread = threading.Thread(target=server.serve, args=(stop.is_set,), daemon=True)
+        thread.start()
+        try:
+            stray, link = ServerLink(sock), ServerLink(sock)
+            link.subscribe(str(f), 2)
+            stray.send({"op": "unsub", "path": str(tmp_path / "nope.log")}); stray.send({"op": "unsub", "path": str(f)})  # neither was ever subscribed by it
+            stray.subscribe(str(f), 2); stray.sock.settimeout(5)
+            while (got := stray.read()) == []: pass
+            assert got  # answered after both unsubs, so the daemon got through them
+            link.sock.settimeout(5)
+            msgs = []
+            with open(f, "a") as fh: fh.write("two\n")
+            while not any(b"two" in base64.b64decode(m["data"]) for m in msgs): msgs += link.read()
+            assert thread.is_alive()
+            stray.close(); link.close()
+        finally:
+            stop.set(); thread.join()
+
+
+class TestPerf:
+    """Tests for the HUD / --profile instrumentation."""
+
+    def test_install_wraps_and_uninstall_restores(self):
+        import curses
+        from tailgrid.__main__ import Perf, TailTile, SharedTile, TileRenderer
+        originals = (TailTile.update, SharedTile.update, TileRenderer.render, curses.doupdate)
+        perf = Perf()
+        perf.install()
+        try: assert TailTile.update is not originals[0] and SharedTile.update is not originals[1]
+        finally: perf.uninstall()
+        assert (TailTile.update, SharedTile.update, TileRenderer.render, curses.doupdate) == originals
+
+    def test_counts_calls_once_through_super(self, tmp_path):
+        from tailgrid.__main__ import Perf, SharedTile
+        f = tmp_path / "a.log"
+        f.write_text("one\n")
+        tile, perf = SharedTile(str(f), lines=2), Perf()
+        perf.install()
+        try:
+            tile.update(); tile.update()
+        finally: perf.uninstall()
+        assert perf.stats[id(tile), "update"][0] == 2
+        tile.update()
+        assert perf.stats[id(tile), "update"][0] == 2  # uninstalled: no longer counted
+
+    def test_profile_writes_one_json_line_per_frame(self, tmp_path):
+        import io, json
+        from types import SimpleNamespace
+        from tailgrid.__main__ import Perf, TailTile
+        f = tmp_path / "a.log"
+        f.write_text("one\n")
+        tile, out = TailTile(str(f), lines=2), io.StringIO()
+        renderer = SimpleNamespace(tiles=[tile], visible=lambda: range(1), hud=None)
+        perf = Perf(out)
+        perf.install()
+        try:
+            perf.frame(renderer, hud=False)
+            tile.update()
+            assert perf.frame(renderer, hud=False) is None
+        finally: perf.uninstall()
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert len(records) == 2
+        assert records[1]["tiles"][0]["updates"] == 1 and records[1]["tiles"][0]["path"] == str(f)
+
+
+class TestFilePicker:
+    """The picker's listing streams entries from scandir and filters/sorts them without curses."""
+
+    def _listing(self, path):
+        import time
+        from tailgrid.__main__ import DirListing
+        listing = DirListing(str(path))
+        while not listing.done: listing.refresh(); time.sleep(0.01)
+        return listing
+
+    def test_lists_only_files_sorted_by_name(self, tmp_path):
+        for name in ("b.log", "a.log", "c.txt"): (tmp_path / name).write_text("x")
+        (tmp_path / "sub").mkdir()
+        listing = self._listing(tmp_path)
+        assert [listing.names[i] for i in listing.matches] == ["a.log", "b.log", "c.txt"]
+        assert listing.path(listing.matches[0]) == str(tmp_path / "a.log")
+
+    def test_fuzzy_query_narrows_and_widens(self, tmp_path):
+        for name in ("train.log", "eval.log", "trainer.txt", "Tr_old.LOG"): (tmp_path / name).write_text("x")
+        listing = self._listing(tmp_path)
+        listing.set_query("tr")
+        listing.set_query("trlog")
+        assert [listing.names[i] for i in listing.matches] == ["Tr_old.LOG", "train.log"]
+        narrowed = listing.matches
+        listing.set_query("trlo")
+        listing.set_query("trlog")
+        assert listing.matches == narrowed
+        listing.set_query("")
+        assert len(listing.matches) == 4
+        listing.set_query("eval")
+        assert [listing.names[i] for i in listing.matches] == ["eval.log"]
+
+    def test_sorts_by_mtime_and_size(self, tmp_path):
+        import os
+        for i, (name, size) in enumerate((("old.log", 30), ("mid.log", 10), ("new.log", 20))):
+            (tmp_path / name).write_text("x" * size)
+            os.utime(tmp_path / name, (1000 + i, 1000 + i))
+        listing = self._listing(tmp_path)
+        for name in ("old.log", "mid.log", "new.log"): (tmp_path / name).unlink()  # sorting uses what the scan thread stat'ed
+        listing.set_order("mtime")
+        assert [listing.names[i] for i in listing.matches] == ["new.log", "mid.log", "old.log"]
+        listing.set_order("size")
+        assert [listing.names[i] for i in listing.matches] == ["old.log", "new.log", "mid.log"]
+
+
+class TestClaudeDiscovery:
+    """--claude opens on the cached answer and applies Claude's fresh one when a stub `claude` replies."""
+
+    def _setup(self, tmp_path, monkeypatch, answer):
+        import os
+        import tailgrid.__main__ as tg
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        stub = bin_dir / "claude"
+        stub.write_text(f"#!/bin/sh\ncat <<'EOF'\n{answer}\nEOF\n")
+        stub.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+        monkeypatch.setattr(tg, "CLAUDE_CACHE_DIR", tmp_path / "cache")
+        monkeypatch.chdir(tmp_path)
+        return tg
+
+    def _wait(self, discovery):
+        import time
+        deadline = time.monotonic() + 10
+        while (changes := discovery.take()) is None and time.monotonic() < deadline: time.sleep(0.01)
+        return changes
+
+    def test_stub_answer_is_parsed_and_cached(self, tmp_path, monkeypatch):
+        import os
+        a, b = tmp_path / "a.log", tmp_path / "b.log"
+        a.write_text("x\n"); b.write_text("y\n")
+        tg = self._setup(tmp_path, monkeypatch, f"{a} | training run\n/missing.log | gone\n{b}")
+        assert tg.claude_discover_paths("prompt") == ([str(a), str(b)], {str(a): "training run"})
+        assert tg.load_claude_cache(os.getcwd(), "prompt") == ([str(a), str(b)], {str(a): "training run"})
+        assert tg.load_claude_cache(os.getcwd(), "other prompt") is None
+        assert tg.load_claude_cache(os.getcwd(), "prompt", ttl=-1) is None
+        b.unlink()
+        assert tg.load_claude_cache(os.getcwd(), "prompt") == ([str(a)], {str(a): "training run"})
+
+    def test_starts_from_cache_then_swaps_in_fresh_answer(self, tmp_path, monkeypatch):
+        import os
+        old, kept, new = tmp_path / "old.log", tmp_path / "kept.log", tmp_path / "new.log"
+        for f in (old, kept, new): f.write_text("x\n")
+        tg = self._setup(tmp_path, monkeypatch, f"{kept}\n{new} | fresh")
+        tg.save_claude_cache(os.getcwd(), "prompt", [str(old), str(kept)], {})
+        discovery = tg.ClaudeDiscovery("prompt")
+        assert discovery.paths == [str(old), str(kept)] and discovery.take() is None
+        discovery.start()
+        assert self._wait(discovery) == [(0, str(new))]
+        assert discovery.paths == [str(new), str(kept)] and discovery.reasons == {str(new): "fresh"}
+        assert discovery.take() is None
+
+    def test_empty_answer_keeps_cached_files(self, tmp_path, monkeypatch):
+        import os
+        a = tmp_path / "a.log"
+        a.write_text("x\n")
+        tg = self._setup(tmp_path, monkeypatch, "no logs here")
+        tg.save_claude_cache(os.getcwd(), "prompt", [str(a)], {})
+        discovery = tg.ClaudeDiscovery("prompt")
+        discovery.start()
+        assert self._wait(discovery) == []
+        assert discovery.paths == [str(a)]
+        assert tg.load_claude_cache(os.getcwd(), "prompt") == ([str(a)], {})
+
+
+class TestWarmRestore:
+    """Sessions keep each tile's offset, line count, checkpoints and view, and reuse them only if the file was just appended to."""
+
+    def _wait_count(self, tile):
+        import time
+        deadline = time.monotonic() + 5
+        while tile.total_lines() is None and time.monotonic() < deadline: time.sleep(0.01)
+        return tile.total_lines()
+
+    def test_sessions_file_keeps_tile_states(self, tmp_path, monkeypatch):
+        import tailgrid.__main__ as tg
+        monkeypatch.setattr(tg, "CONFIG_DIR", tmp_path)
+        monkeypatch.setattr(tg, "SESSIONS_FILE", tmp_path / "sessions.json")
+        tg.save_session(["/a.log", "/b.log"], (2, 1), 10, {"/a.log": {"offset": 5}})
+        tg.save_session(["/a.log", "/b.log"], (2, 1), 10)  # startup save: the states stay
+        tg.save_session(["/c.log"], (1, 1), 10, {"/a.log": {"offset": 9}, "/c.log": {"offset": 1}})
+        assert tg.session_states() == {"/a.log": {"offset": 9}, "/c.log": {"offset": 1}}
+        assert tg.load_sessions()[1]["tiles"] == {"/a.log": {"offset": 5}}
+        assert [p.name for p in tmp_path.iterdir()] == ["sessions.json"]
+
+    def test_save_survives_a_sessions_file_of_the_wrong_shape(self, tmp_path, monkeypatch):
+        import json
+        import tailgrid.__main__ as tg
+        monkeypatch.setattr(tg, "CONFIG_DIR", tmp_path)
+        monkeypatch.setattr(tg, "SESSIONS_FILE", tmp_path / "sessions.json")
+        for junk in ({"paths": ["/a.log"]}, 7, ["junk", {"paths": ["/b.log"], "layout": [1, 1], "lines": 10}]):
+            (tmp_path / "sessions.json").write_text(json.dumps(junk))
+            tg.save_session(["/a.log"], (1, 1), 10, {"/a.log": {"offset": 1}})
+            assert tg.load_sessions()[0]["tiles"] == {"/a.log": {"offset": 1}}
+        assert [s["paths"] for s in tg.load_sessions()] == [["/a.log"], ["/b.log"]]
+
+    def test_appended_file_resumes_count_and_scroll(self, tmp_path, monkeypatch):
+        import json
+        import tailgrid.__main__ as tg
+        monkeypatch.setattr(tg, "INDEX_BLOCK", 64)
+        f = tmp_path / "a.log"
+        f.write_text("".join(f"line {i}\n" for i in range(1000)))
+        tile = tg.TailTile(str(f), lines=5)
+        tile.update()
+        assert self._wait_count(tile) == 1000
+        tile.freeze(); tile.scroll(300)
+        view, state = tile.get_content(), json.loads(json.dumps(tile.session_state()))
+        with open(f, "a") as fh: fh.write("new 1\nnew 2\n")
+        warm = tg.TailTile(str(f), lines=5)
+        warm.warm(state, view=True)
+        assert warm.frozen
+        warm.update()
+        assert warm._count_base == (state["offset"], 1000)
+        assert warm.get_content() == view and warm.scroll_offset == 302
+        assert self._wait_count(warm) == 1002
+
+    def test_fresh_launch_follows_and_only_reuses_the_count(self, tmp_path):
+        import os, queue
+        import tailgrid.__main__ as tg
+        f = tmp_path / "a.log"
+        f.write_text("".join(f"line {i}\n" for i in range(100)))
+        tile = tg.TailTile(str(f), lines=5)
+        tile.update(); self._wait_count(tile); tile.freeze(); tile.scroll(50)
+        state = tile.session_state()
+        warm = tg.TailTile(str(f), lines=5)
+        warm.warm(state)  # the same file opened again, not a resumed session
+        r, w = os.pipe()
+        try:
+            reader = tg.TileReader(warm, 0, queue.Queue(), w)
+            assert not reader.frozen
+            reader.stop(); reader._thread.join(2)
+        finally: os.close(r); os.close(w)
+        warm.update()
+        assert not warm.frozen and warm.get_content()[-1] == "line 99"
+        assert warm._count_base == (state["offset"], 100)
+
+    def test_resumed_session_states_come_first(self, tmp_path, monkeypatch):
+        import tailgrid.__main__ as tg
+        monkeypatch.setattr(tg, "CONFIG_DIR", tmp_path)
+        monkeypatch.setattr(tg, "SESSIONS_FILE", tmp_path / "sessions.json")
+        tg.save_session(["/a.log"], (1, 1), 10, {"/a.log": {"offset": 1}})
+        tg.save_session(["/a.log", "/b.log"], (2, 1), 10, {"/a.log": {"offset": 2}})
+        assert tg.session_states()["/a.log"] == {"offset": 2}
+        assert tg.session_states(["/a.log"])["/a.log"] == {"offset": 1}
+
+    def test_rewritten_file_starts_cold(self, tmp_path):
+        import tailgrid.__main__ as tg
+        f = tmp_path / "a.log"
+        f.write_text("".join(f"line {i}\n" for i in range(100)))
+        tile = tg.TailTile(str(f), lines=5)
+        tile.update(); self._wait_count(tile); tile.freeze(); tile.scroll(50)
+        state = tile.session_state()
+        f.write_text("".join(f"LINE {i}\n" for i in range(100)))  # same size, same inode, new content
+        warm = tg.TailTile(str(f), lines=5)
+        warm.warm(state, view=True); warm.update()
+        assert warm._count_base == (0, 0) and warm.frozen and warm.scroll_offset == 0
+        assert warm.get_content()[-1] == "LINE 99"
 
+    def test_restored_thinned_checkpoints_match_a_cold_index(self, tmp_path, monkeypatch):
+        import tailgrid.__main__ as tg
+        monkeypatch.setattr(tg, "INDEX_BLOCK", 64)
+        monkeypatch.setattr(tg, "SESSION_CHECKPOINTS", 4)
+        f = tmp_path / "a.log"
+        f.write_text("".join(f"line {i}\n" for i in range(500)))
+        index = tg.LineIndex(str(f))
+        index.total()
+        saved = index.checkpoints()
+        assert len(saved["offs"]) <= 5 and saved["offs"][-1] == 0
+        with open(f, "a") as fh: fh.write("tail a\ntail b\n")
+        warm, cold = tg.LineIndex(str(f), saved), tg.LineIndex(str(f))
+        assert warm.complete and warm.total_known() == 502
+        for skip in (0, 1, 7, 123, 400, 497):
+            assert warm.window(skip, 5) == cold.window(skip, 5)
+        assert warm.line_of(saved["offs"][1] + 3) == cold.line_of(saved["offs"][1] + 3)
+        stale = dict(saved, check=saved["check"] + 1)
+        assert not tg.LineIndex(str(f), stale).complete